@@ -1,14 +1,42 @@
+import base64
+import io
+import re
 from itertools import product
 
+
+def apply_bits(op, full, a, b=0):
+    # Побитовые аналоги операций: каждый бит — отдельная строка таблицы
+    if op == '!':
+        return full ^ a
+    if op == '&':
+        return a & b
+    if op == '|':
+        return a | b
+    if op == '->':
+        return (full ^ a) | b
+    return full ^ (a ^ b)
+
+
+def column_mask(position, width):
+    # Столбец переменной с весом 2^position в блоке из width строк
+    full = (1 << width) - 1
+    step = 1 << position
+    pattern = ((1 << step) - 1) << step
+    return pattern * (full // ((1 << (2 * step)) - 1))
+
+
 class LogicalExpressionEvaluator:
     OPERATORS = {'!': 3, '&': 2, '|': 2, '->': 1, '~>': 1}
     VARIABLES = ['a', 'b', 'c', 'd', 'e']
+    COMMUTATIVE = {'&', '|', '~>'}
 
     def __init__(self, expr):
         self.original_expr = expr.replace(' ', '')
         self.tokens = self.tokenize(self.original_expr)
         self.rpn = self.to_rpn(self.tokens)
         self.used_vars = sorted(set(t for t in self.tokens if t in self.VARIABLES))
+        self.dag_nodes, self.dag_root = self.build_dag(self.rpn)
+        self.dag_order = self.dag_program(self.dag_nodes, self.dag_root)
 
     def tokenize(self, expr):
         tokens, i = [], 0
@@ -73,31 +101,180 @@ class LogicalExpressionEvaluator:
                 stack.append((a and b) or (not a and not b))
         return stack[0]
 
+    @staticmethod
+    def apply_op(op, a, b=None):
+        if op == '!':
+            return not a
+        if op == '&':
+            return a and b
+        if op == '|':
+            return a or b
+        if op == '->':
+            return (not a) or b
+        return a == b
+
+    def build_dag(self, rpn):
+        # Хэш-консинг: одинаковые подвыражения хранятся один раз.
+        # Лабораторные независимы друг от друга, поэтому граф свой, а не из lab3/expression_dag.py;
+        # констант в выражениях lab2 нет, и сворачивать их не нужно
+        nodes, ids, stack = [], {}, []
+
+        def intern(key):
+            if key not in ids:
+                ids[key] = len(nodes)
+                nodes.append(key)
+            return ids[key]
+
+        def make(op, *args):
+            if op in self.COMMUTATIVE and args[1] < args[0]:
+                args = (args[1], args[0])
+            return intern((op,) + tuple(args))
+
+        for token in rpn:
+            if token in self.VARIABLES:
+                stack.append(intern(('var', token)))
+            elif token == '!':
+                if not stack:
+                    raise ValueError("Недостаточно операндов для '!'")
+                stack.append(make('!', stack.pop()))
+            else:
+                if len(stack) < 2:
+                    raise ValueError(f"Недостаточно операндов для '{token}'")
+                b, a = stack.pop(), stack.pop()
+                stack.append(make(token, a, b))
+        if len(stack) != 1:
+            raise ValueError("Некорректное выражение")
+        return nodes, stack[0]
+
+    @staticmethod
+    def dag_program(nodes, root):
+        reachable, pending = set(), [root]
+        while pending:
+            idx = pending.pop()
+            if idx not in reachable:
+                reachable.add(idx)
+                if nodes[idx][0] != 'var':
+                    pending.extend(nodes[idx][1:])
+        return sorted(reachable)
+
+    def eval_dag(self, var_values):
+        values = [False] * len(self.dag_nodes)
+        for idx in self.dag_order:
+            node = self.dag_nodes[idx]
+            if node[0] == 'var':
+                values[idx] = var_values[node[1]]
+            else:
+                values[idx] = self.apply_op(node[0], *(values[a] for a in node[1:]))
+        return values[self.dag_root]
+
     def generate_truth_table(self):
         table = []
         for values in product([False, True], repeat=len(self.used_vars)):
             var_values = dict(zip(self.used_vars, values))
-            result = self.eval_rpn(self.rpn, var_values)
+            result = self.eval_dag(var_values)
             table.append((var_values, result))
         return table
 
+    def generate_packed_table(self):
+        # Таблица сразу в упакованном виде: значения узлов DAG — битовые столбцы всех строк
+        n = len(self.used_vars)
+        width = 1 << n
+        full = (1 << width) - 1
+        values = [0] * len(self.dag_nodes)
+        for idx in self.dag_order:
+            node = self.dag_nodes[idx]
+            if node[0] == 'var':
+                values[idx] = column_mask(n - 1 - self.used_vars.index(node[1]), width)
+            else:
+                values[idx] = apply_bits(node[0], full, *(values[a] for a in node[1:]))
+        return values[self.dag_root]
+
+    def pack_table(self, table):
+        # Упакованный результат: бит i равен значению функции в строке i
+        digits = ''.join('1' if res else '0' for _, res in table)
+        return int(digits[::-1], 2) if digits else 0
+
+    def index_bits(self, bits):
+        # Индексная форма '0101...' (строка 0 слева)
+        rows = 1 << len(self.used_vars)
+        return format(bits, f'0{rows}b')[::-1]
+
+    def export_index_form(self, bits, encoding='hex'):
+        rows = 1 << len(self.used_vars)
+        width = self._encoding_width(encoding)
+        padded = -(-rows // width) * width
+        value = int(self.index_bits(bits), 2) << (padded - rows)
+        if encoding == 'hex':
+            return format(value, f'0{padded // 4}x')
+        return base64.b64encode(value.to_bytes(padded // 8, 'big')).decode('ascii')
+
+    def import_index_form(self, data, encoding='hex'):
+        rows = 1 << len(self.used_vars)
+        width = self._encoding_width(encoding)
+        padded = -(-rows // width) * width
+        try:
+            if encoding == 'hex':
+                if len(data) != padded // 4:
+                    raise ValueError
+                value = int(data, 16)
+            else:
+                raw = base64.b64decode(data, validate=True)
+                if len(raw) != padded // 8:
+                    raise ValueError
+                value = int.from_bytes(raw, 'big')
+        except ValueError:
+            raise ValueError(f"Некорректная индексная форма для {rows} строк") from None
+        if value & ((1 << (padded - rows)) - 1):
+            raise ValueError("Ненулевые биты выравнивания в индексной форме")
+        value >>= padded - rows
+        return int(format(value, f'0{rows}b')[::-1], 2)
+
+    @staticmethod
+    def _encoding_width(encoding):
+        if encoding == 'hex':
+            return 4
+        if encoding == 'base64':
+            return 8
+        raise ValueError(f"Неизвестная кодировка: {encoding}")
+
+    def iter_ranges(self, bits, value=True):
+        # Числовая форма в виде отрезков подряд идущих строк (start, end) включительно
+        for match in re.finditer('1+' if value else '0+', self.index_bits(bits)):
+            yield match.start(), match.end() - 1
+
+    def iter_indices(self, bits, value=True):
+        for start, end in self.iter_ranges(bits, value):
+            yield from range(start, end + 1)
+
+    def write_sdnf(self, bits, stream):
+        return self._write_form(bits, stream, True)
+
+    def write_sknf(self, bits, stream):
+        return self._write_form(bits, stream, False)
+
+    def _write_form(self, bits, stream, value):
+        # Термы пишутся по одному, полная строка формы в памяти не собирается
+        n = len(self.used_vars)
+        inner, outer = (' & ', ' | ') if value else (' | ', ' & ')
+        count = 0
+        for idx in self.iter_indices(bits, value):
+            literals = [v if ((idx >> (n - 1 - pos)) & 1) == value else f'!{v}'
+                        for pos, v in enumerate(self.used_vars)]
+            if count:
+                stream.write(outer)
+            stream.write(f"({inner.join(literals)})")
+            count += 1
+        return count
+
     def build_sdnf(self, table):
-        terms, indices = [], []
-        for idx, (vals, res) in enumerate(table):
-            if res:
-                indices.append(idx)
-                term = [(v if vals[v] else f'!{v}') for v in self.used_vars]
-                terms.append(' & '.join(term))
-        return ' | '.join(f'({t})' for t in terms), indices
+        bits, buffer = self.pack_table(table), io.StringIO()
+        self.write_sdnf(bits, buffer)
+        return buffer.getvalue(), list(self.iter_indices(bits, True))
 
     def build_sknf(self, table):
-        terms, indices = [], []
-        for idx, (vals, res) in enumerate(table):
-            if not res:
-                indices.append(idx)
-                term = [(v if not vals[v] else f'!{v}') for v in self.used_vars]
-                terms.append(' | '.join(term))
-        return ' & '.join(f'({t})' for t in terms), indices
+        bits, buffer = self.pack_table(table), io.StringIO()
+        self.write_sknf(bits, buffer)
+        return buffer.getvalue(), list(self.iter_indices(bits, False))
 
     def print_table(self, table):
         headers = self.used_vars + ['f']
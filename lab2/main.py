@@ -1,21 +1,27 @@
+import sys
+
 from logic_engine import LogicalExpressionEvaluator
 
+
+def print_form(title, write, bits, ranges):
+    print(f"\n{title}:")
+    if not write(bits, sys.stdout):
+        print("Отсутствует", end='')
+    print()
+    print("Числовая форма: " + ', '.join(str(s) if s == e else f'{s}-{e}' for s, e in ranges))
+
+
 if __name__ == "__main__":
     expr = input("Введите логическое выражение (например, (a & !b) -> c): ")
     evaluator = LogicalExpressionEvaluator(expr)
     table = evaluator.generate_truth_table()
     evaluator.print_table(table)
+    bits = evaluator.pack_table(table)
 
-    sdnf, sdnf_idx = evaluator.build_sdnf(table)
-    print("\nСДНФ:")
-    print(sdnf if sdnf else "Отсутствует")
-    print(f"Числовая форма: {sdnf_idx}")
-
-    sknf, sknf_idx = evaluator.build_sknf(table)
-    print("\nСКНФ:")
-    print(sknf if sknf else "Отсутствует")
-    print(f"Числовая форма: {sknf_idx}")
+    print_form("СДНФ", evaluator.write_sdnf, bits, evaluator.iter_ranges(bits, True))
+    print_form("СКНФ", evaluator.write_sknf, bits, evaluator.iter_ranges(bits, False))
 
-    idx_form = [int(res) for _, res in table]
     print("\nИндексная форма функции:")
-    print(f"F = ({''.join(map(str, idx_form))})")
+    print(f"F = ({evaluator.index_bits(bits)})")
+    print(f"hex: {evaluator.export_index_form(bits, 'hex')}")
+    print(f"base64: {evaluator.export_index_form(bits, 'base64')}")
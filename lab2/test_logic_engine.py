@@ -45,5 +45,44 @@ class TestLogicalExpressionEvaluator(unittest.TestCase):
         for _, result in table:
             self.assertTrue(result)
 
+    def test_dag_shares_subexpressions(self):
+        evaluator = LogicalExpressionEvaluator("(a & b) | (b & a) -> (a & b)")
+        and_nodes = [n for n in evaluator.dag_nodes if n[0] == '&']
+        self.assertEqual(len(and_nodes), 1)
+
+    def test_dag_matches_rpn(self):
+        evaluator = LogicalExpressionEvaluator("(a -> !b) ~> (c | !a) & b")
+        for vals, res in evaluator.generate_truth_table():
+            self.assertEqual(res, evaluator.eval_rpn(evaluator.rpn, vals))
+
+    def test_index_form_roundtrip(self):
+        evaluator = LogicalExpressionEvaluator("(a & !b) -> c")
+        bits = evaluator.pack_table(evaluator.generate_truth_table())
+        self.assertEqual(evaluator.index_bits(bits), '11110111')
+        self.assertEqual(evaluator.export_index_form(bits, 'hex'), 'f7')
+        for encoding in ('hex', 'base64'):
+            data = evaluator.export_index_form(bits, encoding)
+            self.assertEqual(evaluator.import_index_form(data, encoding), bits)
+
+    def test_index_form_padding(self):
+        evaluator = LogicalExpressionEvaluator("!a")
+        bits = evaluator.pack_table(evaluator.generate_truth_table())
+        self.assertEqual(evaluator.export_index_form(bits, 'hex'), '8')
+        self.assertEqual(evaluator.import_index_form('8'), bits)
+        with self.assertRaises(ValueError):
+            evaluator.import_index_form('9')
+
+    def test_numeric_ranges(self):
+        evaluator = LogicalExpressionEvaluator("(a & !b) -> c")
+        bits = evaluator.pack_table(evaluator.generate_truth_table())
+        self.assertEqual(list(evaluator.iter_ranges(bits, True)), [(0, 3), (5, 7)])
+        self.assertEqual(list(evaluator.iter_ranges(bits, False)), [(4, 4)])
+
+    def test_packed_table_matches_rows(self):
+        for expr in ("!a", "a ~> b", "(a -> !b) ~> (c | !a) & (d -> e)"):
+            evaluator = LogicalExpressionEvaluator(expr)
+            expected = evaluator.pack_table(evaluator.generate_truth_table())
+            self.assertEqual(evaluator.generate_packed_table(), expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from logic_minimization_system import LogicMinimizationSystem
+from minimization_cache import MinimizationCache
+
+# Элемент пакета: (id, выражение, безразличные наборы, ошибка разбора строки)
+BatchItem = Tuple[Any, Optional[str], Any, Optional[str]]
+
+
+class ItemTimeout(BaseException):
+    """Превышено время обработки одного выражения.
+
+    Наследуется от BaseException, чтобы не перехватываться обработчиком
+    «except Exception» внутри пайплайна.
+    """
+
+
+def run_with_timeout(function, timeout: Optional[float]):
+    """Вызов с ограничением времени через SIGALRM (только POSIX, главный поток)"""
+    if not timeout or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        return function()
+
+    def interrupt(signum, frame):
+        raise ItemTimeout()
+
+    previous = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return function()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+_worker_system: Optional[LogicMinimizationSystem] = None
+
+
+def parse_batch_line(line: str, line_number: int) -> Optional[BatchItem]:
+    """Разбор строки входа: объект JSON или само выражение.
+
+    Объект: {"id": ..., "expression": "...", "dont_cares": [...] | "..."};
+    id по умолчанию — номер строки. Пустые строки и строки, начинающиеся
+    с '#', пропускаются.
+    """
+    text = line.strip()
+    if not text or text.startswith('#'):
+        return None
+    if not text.startswith('{'):
+        return line_number, text, None, None
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        return line_number, None, None, f"Некорректный JSON: {e.msg}"
+    if not isinstance(data, dict):
+        return line_number, None, None, "Ожидается объект JSON"
+    if not isinstance(data.get("expression"), str):
+        return data.get("id", line_number), None, None, "Не задано поле expression"
+    return data.get("id", line_number), data["expression"], data.get("dont_cares"), None
+
+
+def read_batch(lines: Iterable[str]) -> Iterator[BatchItem]:
+    for line_number, line in enumerate(lines, 1):
+        item = parse_batch_line(line, line_number)
+        if item is not None:
+            yield item
+
+
+def process_item(item: BatchItem, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Минимизация одного выражения в процессе-исполнителе"""
+    global _worker_system
+    if _worker_system is None:
+        _worker_system = LogicMinimizationSystem(MinimizationCache())
+
+    item_id, expression, dont_cares, parse_error = item
+    record: Dict[str, Any] = {"id": item_id, "expression": expression}
+    if parse_error is not None:
+        record.update(status="error", error=parse_error)
+        return record
+
+    started = time.perf_counter()
+    try:
+        results = run_with_timeout(
+            lambda: _worker_system.analyze_expression(expression, dont_cares, with_display=False,
+                                                      trace_mode="none"), timeout)
+    except ItemTimeout:
+        record.update(status="timeout", error=f"Превышено время обработки ({timeout} с)")
+        return record
+    finally:
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    if "error" in results:
+        record.update(status="error", error=results["error"])
+        return record
+
+    minterm_info = results["minterm_info"]
+    record.update(
+        status="ok",
+        variables=results["variables"],
+        sdnf_numeric=minterm_info["sdnf_numeric"],
+        sknf_numeric=minterm_info["sknf_numeric"],
+        dont_care_numeric=minterm_info["dont_care_numeric"]
+    )
+    for form_type in ('sdnf', 'sknf'):
+        record[form_type] = {method: {"expression": data["expression"], "cover": data["cover"]}
+                             for method, data in results[f"{form_type}_results"].items()}
+    return record
+
+
+def run_batch(items: Iterable[BatchItem], workers: Optional[int] = None, ordered: bool = True,
+              timeout: Optional[float] = None, cache_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Обработка пакета пулом процессов; результаты выдаются по мере готовности.
+
+    ordered=False выдает результаты в порядке завершения. Одновременно в
+    работе не более 4 * workers элементов, поэтому вход читается потоково.
+    workers=0 — обработка в текущем процессе.
+    """
+    if workers == 0:
+        _init_worker(cache_path)
+        for item in items:
+            yield process_item(item, timeout)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path,)) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(process_item, item, timeout))
+            if len(pending) >= window:
+                yield from _drain(pending, ordered, keep=window - 1)
+        yield from _drain(pending, ordered, keep=0)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], output: TextIO) -> Dict[str, int]:
+    """Потоковая запись результатов; возвращает число записей по статусам"""
+    counts: Dict[str, int] = {}
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+    output.flush()
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетная минимизация логических выражений (JSONL)")
+    parser.add_argument("input", nargs="?", default="-", help="файл с выражениями ('-' — stdin)")
+    parser.add_argument("-o", "--output", default="-", help="файл результатов ('-' — stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов (0 — без пула)")
+    parser.add_argument("--unordered", action="store_true", help="выводить результаты по мере готовности")
+    parser.add_argument("--timeout", type=float, default=None, help="ограничение времени на выражение, с")
+    parser.add_argument("--cache", default=None, help="файл SQLite для кэша минимизации")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        records = run_batch(read_batch(source), args.workers, not args.unordered, args.timeout, args.cache)
+        counts = write_jsonl(records, target)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(", ".join(f"{status}: {count}" for status, count in sorted(counts.items())) or "Пустой пакет",
+          file=sys.stderr)
+    return 0 if set(counts) <= {"ok"} else 1
+
+
+def _init_worker(cache_path: Optional[str]) -> None:
+    global _worker_system
+    _worker_system = LogicMinimizationSystem(MinimizationCache(path=cache_path))
+
+
+def _drain(pending: deque, ordered: bool, keep: int) -> Iterator[Dict[str, Any]]:
+    """Выдача готовых результатов, пока в работе больше keep элементов"""
+    while len(pending) > keep:
+        if ordered:
+            yield pending.popleft().result()
+            continue
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+from typing import Dict, List, Tuple
+
+from expression_dag import ExpressionDAG
+
+# Куб: (value, mask), как в EspressoMinimizer; переменная уровня i — разряд n-1-i
+Cube = Tuple[int, int]
+
+
+class BDD:
+    """Сокращенная упорядоченная диаграмма решений (ROBDD) над num_vars переменными.
+
+    Узел — номер в списке nodes, хранящем тройки (уровень, low, high);
+    0 и 1 — терминальные узлы. Уровень i соответствует i-й переменной
+    (первая переменная — старший разряд номера набора, как в таблице
+    истинности). Одинаковые узлы создаются один раз, результаты операций
+    кэшируются, поэтому размер функций ограничен числом узлов, а не 2^n.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, num_vars: int):
+        self.num_vars = num_vars
+        self.nodes: List[Tuple[int, int, int]] = [(num_vars, 0, 0), (num_vars, 1, 1)]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._cache: Dict[Tuple, int] = {}
+        self._isop_cache: Dict[Tuple[int, int], Tuple[List[Cube], int]] = {}
+
+    def variable(self, level: int) -> int:
+        return self.node(level, self.FALSE, self.TRUE)
+
+    def node(self, level: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        node_id = self._unique.get(key)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.nodes.append(key)
+            self._unique[key] = node_id
+        return node_id
+
+    def negate(self, u: int) -> int:
+        if u <= 1:
+            return 1 - u
+        key = ('!', u)
+        result = self._cache.get(key)
+        if result is None:
+            level, low, high = self.nodes[u]
+            result = self.node(level, self.negate(low), self.negate(high))
+            self._cache[key] = result
+        return result
+
+    def apply(self, operator: str, u: int, v: int) -> int:
+        """Бинарная операция: '&', '|', '^', а также '->' и '~' через них"""
+        if operator == '->':
+            return self.apply('|', self.negate(u), v)
+        if operator == '~':
+            return self.negate(self.apply('^', u, v))
+
+        terminal = self._terminal_case(operator, u, v)
+        if terminal is not None:
+            return terminal
+        if u > v:
+            u, v = v, u
+        key = (operator, u, v)
+        result = self._cache.get(key)
+        if result is None:
+            (u_level, u_low, u_high), (v_level, v_low, v_high) = self.nodes[u], self.nodes[v]
+            level = min(u_level, v_level)
+            if u_level != level:
+                u_low = u_high = u
+            if v_level != level:
+                v_low = v_high = v
+            result = self.node(level, self.apply(operator, u_low, v_low), self.apply(operator, u_high, v_high))
+            self._cache[key] = result
+        return result
+
+    def from_postfix(self, postfix_tokens: List[str], variables: List[str]) -> int:
+        """Функция выражения; общие подвыражения строятся один раз (ExpressionDAG)"""
+        dag = ExpressionDAG(postfix_tokens)
+        unknown = set(dag.variables) - set(variables)
+        if unknown:
+            raise ValueError(f"Неизвестный токен: {sorted(unknown)[0]}")
+        levels = {variable: level for level, variable in enumerate(variables)}
+        values = {}
+        for node_id in dag.program:
+            node = dag.nodes[node_id]
+            kind = node[0]
+            if kind == 'var':
+                values[node_id] = self.variable(levels[node[1]])
+            elif kind == 'const':
+                values[node_id] = self.TRUE if node[1] else self.FALSE
+            elif kind == '!':
+                values[node_id] = self.negate(values[node[1]])
+            else:
+                values[node_id] = self.apply(kind, values[node[1]], values[node[2]])
+        return values[dag.root]
+
+    def from_bits(self, bits: int) -> int:
+        """Функция по столбцу таблицы истинности (бит i — значение на наборе i)"""
+        memo: Dict[Tuple[int, int], int] = {}
+
+        def build(level: int, column: int) -> int:
+            if level == self.num_vars:
+                return column & 1
+            key = (level, column)
+            if key not in memo:
+                half = 1 << (self.num_vars - 1 - level)
+                memo[key] = self.node(level, build(level + 1, column & ((1 << half) - 1)),
+                                      build(level + 1, column >> half))
+            return memo[key]
+
+        return build(0, bits)
+
+    def count(self, u: int) -> int:
+        """Число наборов, на которых функция истинна"""
+        memo = {self.FALSE: 0, self.TRUE: 1 << self.num_vars}
+
+        def visit(node_id: int) -> int:
+            # Для каждого узла — доля наборов в единицах 2^n
+            if node_id not in memo:
+                _, low, high = self.nodes[node_id]
+                memo[node_id] = (visit(low) + visit(high)) // 2
+            return memo[node_id]
+
+        return visit(u)
+
+    def size(self, u: int) -> int:
+        """Число внутренних узлов, достижимых из u"""
+        seen = set()
+        pending = [u]
+        while pending:
+            node_id = pending.pop()
+            if node_id <= 1 or node_id in seen:
+                continue
+            seen.add(node_id)
+            pending.extend(self.nodes[node_id][1:])
+        return len(seen)
+
+    def isop(self, lower: int, upper: int) -> Tuple[List[Cube], int]:
+        """Неприводимая ДНФ функции f, lower <= f <= upper (Минато–Морреале).
+
+        Возвращает кубы покрытия и саму функцию покрытия. Кубы, найденные в
+        ветвях x = 0 и x = 1, получают литерал x, только если не покрывают
+        общую часть; оставшиеся наборы покрываются кубами без x.
+        """
+        if lower == self.FALSE:
+            return [], self.FALSE
+        if upper == self.TRUE:
+            return [(0, (1 << self.num_vars) - 1)], self.TRUE
+        key = (lower, upper)
+        cached = self._isop_cache.get(key)
+        if cached is not None:
+            return cached
+
+        level = min(self.nodes[lower][0], self.nodes[upper][0])
+        lower_0, lower_1 = self._cofactors(lower, level)
+        upper_0, upper_1 = self._cofactors(upper, level)
+
+        cubes_0, cover_0 = self.isop(self.apply('&', lower_0, self.negate(upper_1)), upper_0)
+        cubes_1, cover_1 = self.isop(self.apply('&', lower_1, self.negate(upper_0)), upper_1)
+        rest = self.apply('|', self.apply('&', lower_0, self.negate(cover_0)),
+                          self.apply('&', lower_1, self.negate(cover_1)))
+        cubes_both, cover_both = self.isop(rest, self.apply('&', upper_0, upper_1))
+
+        bit = 1 << (self.num_vars - 1 - level)
+        cubes = ([(value, mask & ~bit) for value, mask in cubes_0]
+                 + [(value | bit, mask & ~bit) for value, mask in cubes_1]
+                 + cubes_both)
+        cover = self.node(level, self.apply('|', cover_0, cover_both), self.apply('|', cover_1, cover_both))
+        self._isop_cache[key] = cubes, cover
+        return cubes, cover
+
+    def _cofactors(self, u: int, level: int) -> Tuple[int, int]:
+        node_level, low, high = self.nodes[u]
+        if node_level != level:
+            return u, u
+        return low, high
+
+    @staticmethod
+    def _terminal_case(operator: str, u: int, v: int):
+        if operator == '&':
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif operator == '|':
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        elif operator == '^':
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+        else:
+            raise ValueError(f"Неизвестная операция: {operator}")
+        return None
@@ -0,0 +1,77 @@
+from typing import Dict, List, Tuple
+
+# Куб: (value, mask), как в EspressoMinimizer
+Cube = Tuple[int, int]
+
+COST_METRICS = ("literals", "products", "gates")
+
+
+class CostModel:
+    """Стоимость двухуровневой реализации покрытия.
+
+    Метрики: "literals" — число литералов, при равенстве — число термов;
+    "products" — число термов, затем литералов; "gates" — оценка числа
+    2-входовых элементов. Терм из k литералов дает k - 1 элементов первого
+    уровня (И для ДНФ, ИЛИ для КНФ), m термов объединяются m - 1 элементами
+    второго уровня, каждой переменной, входящей с инверсией, нужен инвертор.
+    На долю терма в первых двух слагаемых приходится k элементов, поэтому
+    при выборе покрытия термы сравниваются по k, а при равенстве — по числу
+    инверсных литералов: инверторы общие для всей схемы и точно считаются
+    только в итоговой стоимости (evaluate).
+    """
+
+    def __init__(self, metric: str = "literals"):
+        if metric not in COST_METRICS:
+            raise ValueError(f"Неизвестная метрика стоимости: {metric}")
+        self.metric = metric
+
+    def cube_key(self, cube: Cube, num_vars: int, form_type: str = 'sdnf') -> Tuple[int, int]:
+        """Доля терма в стоимости: (основная метрика, метрика для равных)"""
+        value, mask = cube
+        literals = num_vars - mask.bit_count()
+        if self.metric == "products":
+            return 1, literals
+        if self.metric == "gates":
+            return literals, self._inverted_bits(cube, num_vars, form_type).bit_count()
+        return literals, 1
+
+    def weights(self, cubes: List[Cube], num_vars: int, form_type: str = 'sdnf') -> List[int]:
+        """Целые стоимости строк для CoverSolver: лексикографический порядок cube_key.
+
+        Второе слагаемое умножается на число, большее его суммы по всем
+        кубам, поэтому оно влияет только на выбор между покрытиями с равной
+        основной стоимостью.
+        """
+        keys = [self.cube_key(cube, num_vars, form_type) for cube in cubes]
+        scale = sum(secondary for _, secondary in keys) + 1
+        return [primary * scale + secondary for primary, secondary in keys]
+
+    def key(self, cover: List[Cube], num_vars: int, form_type: str = 'sdnf') -> Tuple[int, int]:
+        """Сравнимая стоимость всего покрытия (для эвристик вроде Espresso)"""
+        keys = [self.cube_key(cube, num_vars, form_type) for cube in cover]
+        return sum(primary for primary, _ in keys), sum(secondary for _, secondary in keys)
+
+    def evaluate(self, cover: List[Cube], num_vars: int, form_type: str = 'sdnf') -> Dict:
+        """Достигнутая стоимость: термы, литералы, инверторы, 2-входовые элементы
+        и значение выбранной метрики"""
+        literal_counts = [num_vars - mask.bit_count() for _, mask in cover]
+        inverted = 0
+        for cube in cover:
+            inverted |= self._inverted_bits(cube, num_vars, form_type)
+        cost = {
+            "metric": self.metric,
+            "products": len(cover),
+            "literals": sum(literal_counts),
+            "inverters": inverted.bit_count(),
+            "gates": (sum(max(count - 1, 0) for count in literal_counts) + max(len(cover) - 1, 0)
+                      + inverted.bit_count())
+        }
+        cost["value"] = cost[self.metric]
+        return cost
+
+    @staticmethod
+    def _inverted_bits(cube: Cube, num_vars: int, form_type: str) -> int:
+        """Переменные терма, входящие с инверсией: нули куба в ДНФ, единицы — в КНФ"""
+        value, mask = cube
+        present = ((1 << num_vars) - 1) & ~mask
+        return present & ~value if form_type == 'sdnf' else value
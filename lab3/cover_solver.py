@@ -0,0 +1,219 @@
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class CoverSolver:
+    """Поиск покрытия минимальной стоимости (задача о покрытии множества).
+
+    Строки — битовые множества покрываемых наборов, у каждой строки своя
+    стоимость (например, число литералов импликанты). Сначала выполняются
+    редукции: выбор существенных строк и удаление доминируемых строк, затем
+    точный перебор методом ветвей и границ. Если перебор не укладывается
+    в time_budget секунд, возвращается лучшее найденное решение, которое
+    не хуже жадного.
+    """
+
+    def __init__(self, time_budget: float = 1.0, dominance_limit: int = 2000):
+        self.time_budget = time_budget
+        self.dominance_limit = dominance_limit
+        self.last_solution_exact = False
+        # Число узлов перебора при последнем вызове solve
+        self.last_nodes = 0
+        self._deadline = 0.0
+        self._nodes = 0
+        self._best: List[int] = []
+        self._best_cost = 0
+        self._column_rows: Dict[int, List[int]] = {}
+
+    def solve(self, rows: List[int], target: int, costs: List[int] = None) -> List[int]:
+        """Номера строк, покрывающих target, в порядке возрастания"""
+        if costs is None:
+            costs = [1] * len(rows)
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+
+        active = [i for i, bits in enumerate(rows) if bits & target]
+        coverable = 0
+        for i in active:
+            coverable |= rows[i]
+        # Наборы, которые не покрывает ни одна строка, исключаются из задачи
+        chosen, remaining, active = self._reduce(rows, costs, target & coverable, [], active,
+                                                 use_dominance=True)
+        self._column_rows = self._index_columns(rows, remaining, active)
+
+        self._best = chosen + self._greedy(rows, costs, remaining, active)
+        self._best_cost = sum(costs[i] for i in self._best)
+        self.last_solution_exact = True
+        if remaining:
+            try:
+                if self.time_budget <= 0:
+                    raise _BudgetExceeded()
+                self._branch(rows, costs, remaining, active, chosen, sum(costs[i] for i in chosen))
+            except _BudgetExceeded:
+                self.last_solution_exact = False
+        self.last_nodes = self._nodes
+
+        return sorted(self._make_irredundant(rows, costs, target & coverable, self._best))
+
+    @staticmethod
+    def _index_columns(rows: List[int], remaining: int, active: List[int]) -> Dict[int, List[int]]:
+        """Для каждого непокрытого набора — строки, которые его покрывают"""
+        column_rows = {}
+        for i in active:
+            for column in CoverSolver._columns(rows[i] & remaining):
+                column_rows.setdefault(column, []).append(i)
+        return column_rows
+
+    def _covering_rows(self, column: int, active_set: set) -> List[int]:
+        return [i for i in self._column_rows[column.bit_length() - 1] if i in active_set]
+
+    def _reduce(self, rows: List[int], costs: List[int], remaining: int, chosen: List[int],
+                active: List[int], use_dominance: bool) -> Optional[Tuple[List[int], int, List[int]]]:
+        """Выбор существенных строк и удаление доминируемых, пока это что-то меняет"""
+        chosen = list(chosen)
+        while remaining:
+            active = [i for i in active if rows[i] & remaining]
+            covered_once = 0
+            covered_twice = 0
+            for i in active:
+                bits = rows[i] & remaining
+                covered_twice |= covered_once & bits
+                covered_once |= bits
+            if remaining & ~covered_once:
+                return None
+
+            unique = remaining & ~covered_twice
+            if unique:
+                for i in active:
+                    if rows[i] & unique:
+                        chosen.append(i)
+                        remaining &= ~rows[i]
+                continue
+
+            if not use_dominance or len(active) > self.dominance_limit:
+                break
+            kept = self._remove_dominated_rows(rows, costs, remaining, active)
+            if len(kept) == len(active):
+                break
+            active = kept
+
+        active = [i for i in active if rows[i] & remaining]
+        return chosen, remaining, active
+
+    def _remove_dominated_rows(self, rows: List[int], costs: List[int], remaining: int,
+                               active: List[int]) -> List[int]:
+        """Строка лишняя, если другая не дороже и покрывает все ее наборы"""
+        ordered = sorted(active, key=lambda i: (-(rows[i] & remaining).bit_count(), costs[i], i))
+        kept = []
+        for i in ordered:
+            bits = rows[i] & remaining
+            if not any(costs[j] <= costs[i] and not bits & ~rows[j] for j in kept):
+                kept.append(i)
+        return kept
+
+    def _branch(self, rows: List[int], costs: List[int], remaining: int, active: List[int],
+                chosen: List[int], cost: int) -> None:
+        self._nodes += 1
+        if time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+        reduced = self._reduce(rows, costs, remaining, chosen, active, use_dominance=False)
+        if reduced is None:
+            return
+        new_chosen, remaining, active = reduced
+        cost += sum(costs[i] for i in new_chosen[len(chosen):])
+        chosen = new_chosen
+
+        if cost >= self._best_cost:
+            return
+        if not remaining:
+            self._best, self._best_cost = chosen, cost
+            return
+        active_set = set(active)
+        if cost + self._lower_bound(costs, remaining, active_set) >= self._best_cost:
+            return
+
+        # Ветвление по набору с наименьшим числом покрывающих строк среди первых нескольких
+        candidates = None
+        columns = remaining
+        for _ in range(8):
+            if not columns:
+                break
+            lowest = columns & -columns
+            columns ^= lowest
+            covering = self._covering_rows(lowest, active_set)
+            if candidates is None or len(covering) < len(candidates):
+                candidates = covering
+
+        candidates.sort(key=lambda i: (costs[i] / (rows[i] & remaining).bit_count(), i))
+        excluded = set()
+        for i in candidates:
+            rest = [j for j in active if j != i and j not in excluded]
+            self._branch(rows, costs, remaining & ~rows[i], rest, chosen + [i], cost + costs[i])
+            # Решения с этой строкой уже рассмотрены
+            excluded.add(i)
+
+    def _lower_bound(self, costs: List[int], remaining: int, active_set: set, max_columns: int = 32) -> int:
+        """Оценка снизу: наборы с попарно непересекающимися множествами покрывающих строк"""
+        bound = 0
+        blocked = set()
+        columns = remaining
+        for _ in range(max_columns):
+            if not columns:
+                break
+            lowest = columns & -columns
+            columns ^= lowest
+            covering = self._covering_rows(lowest, active_set)
+            if blocked.isdisjoint(covering):
+                bound += min(costs[i] for i in covering)
+                blocked.update(covering)
+        return bound
+
+    def _greedy(self, rows: List[int], costs: List[int], remaining: int, active: List[int]) -> List[int]:
+        """Жадное покрытие по отношению «новые наборы / стоимость» с ленивым пересчетом"""
+        heap = [(-(rows[i] & remaining).bit_count() / max(costs[i], 1), i) for i in active]
+        heapq.heapify(heap)
+        chosen = []
+        while remaining and heap:
+            _, i = heapq.heappop(heap)
+            gain = (rows[i] & remaining).bit_count()
+            if not gain:
+                continue
+            score = -gain / max(costs[i], 1)
+            # Оценки только убывают: устаревшая запись возвращается в очередь
+            if heap and score > heap[0][0]:
+                heapq.heappush(heap, (score, i))
+                continue
+            chosen.append(i)
+            remaining &= ~rows[i]
+        return chosen
+
+    def _make_irredundant(self, rows: List[int], costs: List[int], target: int, chosen: List[int]) -> List[int]:
+        """Удаление строк, без которых покрытие сохраняется (сначала самых дорогих)"""
+        row_columns = {i: self._columns(rows[i] & target) for i in chosen}
+        coverage_counts = {}
+        for columns in row_columns.values():
+            for column in columns:
+                coverage_counts[column] = coverage_counts.get(column, 0) + 1
+
+        redundant = set()
+        for i in sorted(chosen, key=lambda j: (-costs[j], j)):
+            if all(coverage_counts[column] > 1 for column in row_columns[i]):
+                redundant.add(i)
+                for column in row_columns[i]:
+                    coverage_counts[column] -= 1
+        return [i for i in chosen if i not in redundant]
+
+    @staticmethod
+    def _columns(bits: int) -> List[int]:
+        columns = []
+        while bits:
+            lowest = bits & -bits
+            bits ^= lowest
+            columns.append(lowest.bit_length() - 1)
+        return columns
@@ -0,0 +1,350 @@
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Куб: (value, mask) — биты mask соответствуют отсутствующим в терме переменным,
+# в value эти биты всегда равны нулю
+Cube = Tuple[int, int]
+
+
+class EspressoMinimizer:
+    """Эвристическая двухуровневая минимизация в стиле Espresso.
+
+    Работает только со списками кубов (ON-, OFF- и DC-множества) и не
+    перечисляет наборы, поэтому применима к функциям с десятками входов.
+    Если OFF-множество не задано, оно не строится: дополнение функции с
+    десятками входов содержит десятки тысяч кубов, и EXPAND вместо него
+    проверяет расширенный куб на покрытие ON- и DC-множеством.
+    После начальных EXPAND и IRREDUNDANT цикл REDUCE → EXPAND → IRREDUNDANT
+    повторяется, пока уменьшается стоимость покрытия (по умолчанию число
+    кубов, затем литералов), но не более effort раз и не дольше time_budget
+    секунд.
+    """
+
+    def __init__(self, effort: int = 3, time_budget: Optional[float] = None):
+        self.effort = effort
+        self.time_budget = time_budget
+        self.last_iterations = 0
+
+    def minimize(self, on_set: List[Cube], num_vars: int, dc_set: List[Cube] = None,
+                 off_set: List[Cube] = None,
+                 objective: Optional[Callable[[List[Cube], int], Tuple]] = None) -> List[Cube]:
+        """Минимальное (в эвристическом смысле) покрытие ON-множества.
+
+        objective(cover, num_vars) — сравнимая стоимость покрытия вместо cost.
+        """
+        objective = objective or self.cost
+        full = (1 << num_vars) - 1
+        dc_set = list(dc_set or [])
+        self.last_iterations = 0
+        if not on_set:
+            return []
+        care = list(on_set) + dc_set
+        tautology = not off_set if off_set is not None else self._is_tautology(care, full)
+        if tautology:
+            return [(0, full)]
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        cover = self._irredundant(self._expand(on_set, full, off_set, care), dc_set, full)
+        best_cost = objective(cover, num_vars)
+
+        while self.last_iterations < self.effort:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self.last_iterations += 1
+            reduced = self._reduce(cover, dc_set, full)
+            candidate = self._irredundant(self._expand(reduced, full, off_set, care), dc_set, full)
+            candidate_cost = objective(candidate, num_vars)
+            if candidate_cost >= best_cost:
+                break
+            cover, best_cost = candidate, candidate_cost
+
+        return sorted(cover)
+
+    def update(self, cover: List[Cube], added: List[Cube], num_vars: int, dc_set: List[Cube] = None) -> List[Cube]:
+        """Покрытие после локального изменения функции.
+
+        cover — кубы прежнего покрытия, по-прежнему лежащие в ON- и DC-множестве,
+        added — кубы, покрывающие остальные наборы. Расширяются только новые
+        кубы, затем выполняется IRREDUNDANT; цикл REDUCE-EXPAND не повторяется.
+        """
+        full = (1 << num_vars) - 1
+        dc_set = list(dc_set or [])
+        self.last_iterations = 0
+        if not cover and not added:
+            return []
+        care = list(cover) + list(added) + dc_set
+        if self._is_tautology(care, full):
+            return [(0, full)]
+        expanded = self._expand(added, full, care=care)
+        return sorted(self._irredundant(list(dict.fromkeys(expanded + list(cover))), dc_set, full))
+
+    @staticmethod
+    def cost(cover: List[Cube], num_vars: int) -> Tuple[int, int]:
+        """Стоимость покрытия: (число кубов, число литералов)"""
+        return len(cover), sum(num_vars - mask.bit_count() for _, mask in cover)
+
+    def complement(self, cover: List[Cube], num_vars: int) -> List[Cube]:
+        """Покрытие дополнения функции (рекурсивное разложение Шеннона)"""
+        return self._complement(list(cover), (1 << num_vars) - 1)
+
+    def is_tautology(self, cover: List[Cube], num_vars: int) -> bool:
+        return self._is_tautology(list(cover), (1 << num_vars) - 1)
+
+    def _expand(self, cover: List[Cube], full: int, off_set: Optional[List[Cube]] = None,
+                care: Optional[List[Cube]] = None) -> List[Cube]:
+        """Расширение кубов до простых импликант; поглощенные кубы отбрасываются.
+
+        Куб расширяется до пересечения с off_set, а без него — пока лежит в care.
+        """
+        pending = sorted(cover, key=lambda c: (-c[1].bit_count(), c))
+        result = []
+        while pending:
+            if off_set is None:
+                value, mask = self._expand_cube_in_cover(pending[0], pending[1:], care, full)
+            else:
+                value, mask = self._expand_cube(pending[0], pending[1:], off_set, full)
+            result.append((value, mask))
+            pending = [(v, m) for v, m in pending[1:] if m & ~mask or (v ^ value) & ~mask]
+        # Кубы, поглощенные расширенными позже, удаляет IRREDUNDANT
+        return result
+
+    def _expand_cube(self, cube: Cube, pending: List[Cube], off_set: List[Cube], full: int) -> Cube:
+        value, mask = cube
+        fixed = full & ~mask
+        # Для каждого куба OFF-множества — переменные, по которым он не пересекается с cube;
+        # поднять можно любое множество переменных, не содержащее целиком ни одно из них
+        blocking = set()
+        for off_value, off_mask in off_set:
+            conflict = (value ^ off_value) & fixed & ~off_mask
+            if not conflict:
+                raise ValueError("ON-множество пересекается с OFF-множеством")
+            blocking.add(conflict)
+
+        # Переменные, единственные в конфликте, поднять нельзя; конфликты с ними уже не помеха
+        forbidden = 0
+        for conflict in blocking:
+            if not conflict & (conflict - 1):
+                forbidden |= conflict
+        blocking = [conflict for conflict in blocking if not conflict & forbidden]
+
+        weights = {}
+        for conflict in blocking:
+            while conflict:
+                bit = conflict & -conflict
+                conflict ^= bit
+                weights[bit] = weights.get(bit, 0) + 1
+        bits = []
+        remaining = fixed & ~forbidden
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            bits.append(bit)
+
+        gains = self._absorption_gains(cube, pending, full)
+        bits.sort(key=lambda b: (-gains.get(b, 0), weights.get(b, 0), b))
+
+        raised = 0
+        for bit in bits:
+            trial = raised | bit
+            if all(conflict & ~trial for conflict in blocking if conflict & bit):
+                raised = trial
+        return value & ~raised, mask | raised
+
+    def _expand_cube_in_cover(self, cube: Cube, pending: List[Cube], care: List[Cube], full: int) -> Cube:
+        value, mask = cube
+        fixed = full & ~mask
+        gains = self._absorption_gains(cube, pending, full)
+        bits = []
+        remaining = fixed
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            bits.append(bit)
+        bits.sort(key=lambda b: (-gains.get(b, 0), b))
+
+        # Переменную, которую нельзя поднять сейчас, нельзя поднять и после других:
+        # куб только растет, поэтому один проход дает простую импликанту
+        raised = 0
+        for bit in bits:
+            trial = raised | bit
+            if self._covers(care, (value & ~trial, mask | trial), full):
+                raised = trial
+        return value & ~raised, mask | raised
+
+    @staticmethod
+    def _absorption_gains(cube: Cube, pending: List[Cube], full: int) -> dict:
+        """Сколько кубов покрытия поглотит куб после подъема каждой переменной.
+
+        Сначала поднимаются переменные с наибольшим выигрышем.
+        """
+        value, mask = cube
+        fixed = full & ~mask
+        gains = {}
+        for other_value, other_mask in pending:
+            required = (other_mask | (other_value ^ value)) & fixed
+            if required and not required & (required - 1):
+                gains[required] = gains.get(required, 0) + 1
+        return gains
+
+    def _irredundant(self, cover: List[Cube], dc_set: List[Cube], full: int) -> List[Cube]:
+        """Удаление кубов, покрытых остальными кубами и безразличными наборами"""
+        kept = set(cover)
+        for cube in sorted(cover, key=lambda c: (c[1].bit_count(), c)):
+            kept.discard(cube)
+            if not self._covers(list(kept) + dc_set, cube, full):
+                kept.add(cube)
+        return [cube for cube in cover if cube in kept]
+
+    def _reduce(self, cover: List[Cube], dc_set: List[Cube], full: int) -> List[Cube]:
+        """Сжатие каждого куба до наименьшего, сохраняющего покрытие"""
+        result = list(cover)
+        for index in sorted(range(len(result)), key=lambda i: (-result[i][1].bit_count(), result[i])):
+            cube = result[index]
+            others = result[:index] + result[index + 1:] + dc_set
+            uncovered = self._complement_supercube(self._cofactor(others, cube, full), full)
+            if uncovered is None:
+                continue
+            super_value, super_mask = uncovered
+            result[index] = (cube[0] | super_value, cube[1] & super_mask)
+        return result
+
+    def _covers(self, cover: List[Cube], cube: Cube, full: int) -> bool:
+        cofactor = self._cofactor(cover, cube, full)
+        if any(mask == full for _, mask in cofactor):
+            return True
+        return self._is_tautology(cofactor, full)
+
+    def _is_tautology(self, cover: List[Cube], full: int) -> bool:
+        if not cover:
+            return False
+        if any(mask == full for _, mask in cover):
+            return True
+        # Суммарный объем кубов меньше объема пространства
+        if sum(1 << mask.bit_count() for _, mask in cover) < (1 << full.bit_count()):
+            return False
+        bit = self._splitting_variable(cover, full, binate_only=True)
+        if bit is None:
+            # Унатное покрытие — тавтология только при наличии универсального куба
+            return False
+        return (self._is_tautology(self._cofactor_literal(cover, bit, False), full) and
+                self._is_tautology(self._cofactor_literal(cover, bit, True), full))
+
+    def _complement_supercube(self, cover: List[Cube], full: int) -> Optional[Cube]:
+        """Наименьший куб, содержащий дополнение покрытия (None, если дополнение пусто).
+
+        Само дополнение не строится: супер-куб собирается из супер-кубов ветвей
+        разложения Шеннона.
+        """
+        if not cover:
+            return 0, full
+        if any(mask == full for _, mask in cover):
+            return None
+        fixed = full
+        ones = full
+        zeros = full
+        for value, mask in cover:
+            fixed &= ~mask
+            ones &= value
+            zeros &= ~value
+        common = fixed & (ones | zeros)
+        if common:
+            # не(l·F) = не l + не F: полупространство не l и часть другой половины
+            if common & (common - 1):
+                return 0, full
+            rest = [(value & ~common, mask | common) for value, mask in cover]
+            if self._is_tautology(rest, full):
+                return ~ones & common, full & ~common
+            return 0, full
+
+        bit = self._splitting_variable(cover, full, binate_only=True)
+        if bit is None:
+            # Унатное покрытие: дополнение лежит в полупространстве, противоположном
+            # однолитеральному кубу, а набор из одних "слабых" значений в нем всегда есть
+            value, fixed = 0, 0
+            for cube_value, mask in cover:
+                literal = full & ~mask
+                if not literal & (literal - 1):
+                    fixed |= literal
+                    value |= literal & ~cube_value
+            return value, full & ~fixed
+        negative = self._complement_supercube(self._cofactor_literal(cover, bit, False), full)
+        if negative is not None and negative[1] == full:
+            # Дополнение уже заполняет всю половину пространства
+            if self._is_tautology(self._cofactor_literal(cover, bit, True), full):
+                return 0, full & ~bit
+            return 0, full
+        positive = self._complement_supercube(self._cofactor_literal(cover, bit, True), full)
+        if negative is None:
+            return None if positive is None else (positive[0] | bit, positive[1] & ~bit)
+        if positive is None:
+            return negative[0], negative[1] & ~bit
+        return self._supercube([negative, positive])
+
+    def _complement(self, cover: List[Cube], full: int) -> List[Cube]:
+        if not cover:
+            return [(0, full)]
+        if any(mask == full for _, mask in cover):
+            return []
+        if len(cover) == 1:
+            # Закон де Моргана для одного куба
+            value, mask = cover[0]
+            result = []
+            fixed = full & ~mask
+            while fixed:
+                bit = fixed & -fixed
+                fixed ^= bit
+                result.append((~value & bit, full & ~bit))
+            return result
+
+        bit = self._splitting_variable(cover, full, binate_only=False)
+        negative = self._complement(self._cofactor_literal(cover, bit, False), full)
+        positive = self._complement(self._cofactor_literal(cover, bit, True), full)
+
+        # Кубы, общие для обеих ветвей, не зависят от переменной разложения
+        common = set(negative) & set(positive)
+        result = list(common)
+        result.extend((value, mask & ~bit) for value, mask in negative if (value, mask) not in common)
+        result.extend((value | bit, mask & ~bit) for value, mask in positive if (value, mask) not in common)
+        return result
+
+    @staticmethod
+    def _splitting_variable(cover: List[Cube], full: int, binate_only: bool) -> Optional[int]:
+        """Переменная разложения: наиболее бинатная, иначе наиболее частая"""
+        zeros = {}
+        ones = {}
+        for value, mask in cover:
+            fixed = full & ~mask
+            while fixed:
+                bit = fixed & -fixed
+                fixed ^= bit
+                counts = ones if value & bit else zeros
+                counts[bit] = counts.get(bit, 0) + 1
+
+        binate = [bit for bit in zeros if bit in ones]
+        if binate:
+            return max(binate, key=lambda b: (min(zeros[b], ones[b]), zeros[b] + ones[b], -b))
+        if binate_only:
+            return None
+        counts = {**zeros, **ones}
+        return max(counts, key=lambda b: (counts[b], -b))
+
+    @staticmethod
+    def _cofactor_literal(cover: List[Cube], bit: int, positive: bool) -> List[Cube]:
+        return [(value & ~bit, mask | bit) for value, mask in cover
+                if mask & bit or bool(value & bit) == positive]
+
+    @staticmethod
+    def _cofactor(cover: List[Cube], cube: Cube, full: int) -> List[Cube]:
+        """Кофактор покрытия по кубу: переменные куба становятся безразличными"""
+        cube_value, cube_mask = cube
+        fixed = full & ~cube_mask
+        return [(value & ~fixed, mask | fixed) for value, mask in cover
+                if not (value ^ cube_value) & fixed & ~mask]
+
+    @staticmethod
+    def _supercube(cubes: List[Cube]) -> Cube:
+        first_value = cubes[0][0]
+        mask = 0
+        for value, cube_mask in cubes:
+            mask |= cube_mask | (value ^ first_value)
+        return first_value & ~mask, mask
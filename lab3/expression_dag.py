@@ -0,0 +1,210 @@
+from typing import Dict, List, Tuple
+
+
+class ExpressionDAG:
+    """Представление выражения в виде ациклического графа с хэш-консингом.
+
+    Одинаковые подвыражения хранятся в единственном экземпляре, константы
+    сворачиваются при построении, поэтому при вычислении каждый уникальный
+    подтерм посещается ровно один раз.
+    """
+
+    UNARY_OPERATORS = {'!'}
+    BINARY_OPERATORS = {'&', '|', '->', '~'}
+    COMMUTATIVE_OPERATORS = {'&', '|', '~'}
+
+    def __init__(self, postfix_tokens: List[str] = None):
+        self.nodes: List[Tuple] = []
+        self._node_ids: Dict[Tuple, int] = {}
+        self.root = None
+        self.program: List[int] = []
+        if postfix_tokens is not None:
+            self.root = self._build_from_postfix(postfix_tokens)
+            self.program = self._collect_program(self.root)
+
+    @property
+    def variables(self) -> List[str]:
+        """Переменные, достижимые из корня, в алфавитном порядке"""
+        return sorted(self.nodes[i][1] for i in self.program if self.nodes[i][0] == 'var')
+
+    @property
+    def unique_subterms(self) -> int:
+        """Количество уникальных подтермов, вычисляемых для одной строки"""
+        return len(self.program)
+
+    def make_const(self, value: bool) -> int:
+        return self._intern(('const', bool(value)))
+
+    def make_var(self, name: str) -> int:
+        return self._intern(('var', name))
+
+    def make_not(self, operand: int) -> int:
+        node = self.nodes[operand]
+        if node[0] == 'const':
+            return self.make_const(not node[1])
+        return self._intern(('!', operand))
+
+    def make_binary(self, operator: str, left: int, right: int) -> int:
+        """Создание бинарного узла со сворачиванием констант"""
+        left_node, right_node = self.nodes[left], self.nodes[right]
+        if left_node[0] == 'const' and right_node[0] == 'const':
+            return self.make_const(self._apply(operator, left_node[1], right_node[1]))
+
+        folded = self._fold_constant_operand(operator, left, right)
+        if folded is not None:
+            return folded
+
+        if operator in self.COMMUTATIVE_OPERATORS and right < left:
+            left, right = right, left
+        return self._intern((operator, left, right))
+
+    def evaluate(self, variable_values: Dict[str, bool]) -> bool:
+        """Вычисление значения выражения для одного набора переменных"""
+        if self.root is None:
+            raise ValueError("Граф выражения пуст")
+
+        values = [False] * len(self.nodes)
+        nodes = self.nodes
+        for node_id in self.program:
+            node = nodes[node_id]
+            kind = node[0]
+            if kind == 'var':
+                values[node_id] = variable_values[node[1]]
+            elif kind == 'const':
+                values[node_id] = node[1]
+            elif kind == '!':
+                values[node_id] = not values[node[1]]
+            else:
+                values[node_id] = self._apply(kind, values[node[1]], values[node[2]])
+        return values[self.root]
+
+    def evaluate_columns(self, variables: List[str]) -> int:
+        """Вычисление сразу на всех 2^n наборах переменных variables.
+
+        Значения узлов — битовые столбцы (бит i — значение на наборе i, первая
+        переменная — старший разряд номера), поэтому программа выполняется один
+        раз, а каждая операция обрабатывает всю таблицу.
+        """
+        return self.evaluate_bits(dict(zip(variables, self.variable_columns(len(variables)))),
+                                  1 << len(variables))
+
+    def evaluate_bits(self, columns: Dict[str, int], width: int) -> int:
+        """Вычисление над произвольными битовыми столбцами ширины width:
+        бит k результата — значение выражения на k-м наборе столбцов"""
+        if self.root is None:
+            raise ValueError("Граф выражения пуст")
+
+        full = (1 << width) - 1
+        values = [0] * len(self.nodes)
+        nodes = self.nodes
+        for node_id in self.program:
+            node = nodes[node_id]
+            kind = node[0]
+            if kind == 'var':
+                values[node_id] = columns[node[1]]
+            elif kind == 'const':
+                values[node_id] = full if node[1] else 0
+            elif kind == '!':
+                values[node_id] = full ^ values[node[1]]
+            else:
+                left, right = values[node[1]], values[node[2]]
+                if kind == '&':
+                    values[node_id] = left & right
+                elif kind == '|':
+                    values[node_id] = left | right
+                elif kind == '->':
+                    values[node_id] = (full ^ left) | right
+                else:
+                    values[node_id] = full ^ (left ^ right)
+        return values[self.root]
+
+    @staticmethod
+    def variable_columns(num_vars: int) -> List[int]:
+        """Битовые столбцы переменных: у j-й переменной разряд n-1-j номера набора"""
+        total = 1 << num_vars
+        columns = []
+        for index in range(num_vars):
+            step = 1 << (num_vars - 1 - index)
+            # Блок из step нулей и step единиц размножается удвоением
+            column, width = ((1 << step) - 1) << step, 2 * step
+            while width < total:
+                column |= column << width
+                width *= 2
+            columns.append(column)
+        return columns
+
+    def _build_from_postfix(self, postfix_tokens: List[str]) -> int:
+        """Построение графа из постфиксной записи"""
+        stack = []
+        for token in postfix_tokens:
+            if token in self.UNARY_OPERATORS:
+                if len(stack) < 1:
+                    raise ValueError("Недостаточно операндов для унарной операции")
+                stack.append(self.make_not(stack.pop()))
+            elif token in self.BINARY_OPERATORS:
+                if len(stack) < 2:
+                    raise ValueError(f"Недостаточно операндов для бинарной операции '{token}'")
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(self.make_binary(token, left, right))
+            elif token in ('0', '1'):
+                stack.append(self.make_const(token == '1'))
+            else:
+                stack.append(self.make_var(token))
+
+        if len(stack) != 1:
+            raise ValueError(f"Некорректное выражение. Осталось значений в стеке: {len(stack)}")
+        return stack[0]
+
+    def _collect_program(self, root: int) -> List[int]:
+        """Узлы, достижимые из корня, в топологическом порядке"""
+        reachable = set()
+        pending = [root]
+        while pending:
+            node_id = pending.pop()
+            if node_id in reachable:
+                continue
+            reachable.add(node_id)
+            node = self.nodes[node_id]
+            if node[0] not in ('var', 'const'):
+                pending.extend(node[1:])
+        # Дочерние узлы всегда создаются раньше родительских
+        return sorted(reachable)
+
+    def _intern(self, key: Tuple) -> int:
+        node_id = self._node_ids.get(key)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.nodes.append(key)
+            self._node_ids[key] = node_id
+        return node_id
+
+    def _fold_constant_operand(self, operator: str, left: int, right: int):
+        """Упрощение бинарной операции, если один из операндов — константа.
+
+        Результат подбирается по двум значениям второго операнда:
+        это либо константа, либо сам операнд, либо его отрицание.
+        """
+        left_node, right_node = self.nodes[left], self.nodes[right]
+        if left_node[0] == 'const':
+            outcome = [self._apply(operator, left_node[1], x) for x in (False, True)]
+            other = right
+        elif right_node[0] == 'const':
+            outcome = [self._apply(operator, x, right_node[1]) for x in (False, True)]
+            other = left
+        else:
+            return None
+
+        if outcome[0] == outcome[1]:
+            return self.make_const(outcome[0])
+        return other if outcome[1] else self.make_not(other)
+
+    @staticmethod
+    def _apply(operator: str, left: bool, right: bool) -> bool:
+        if operator == '&':
+            return left and right
+        if operator == '|':
+            return left or right
+        if operator == '->':
+            return (not left) or right
+        return left == right
@@ -1,5 +1,14 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+class ExpressionSyntaxError(Exception):
+    """Ошибка разбора с позицией символа в исходной строке (с нуля; None — позиции нет)"""
+
+    def __init__(self, message: str, offset: Optional[int]):
+        super().__init__(message)
+        self.message = message
+        self.offset = offset
 
 
 class LogicalExpressionProcessor:
@@ -8,151 +17,160 @@ class LogicalExpressionProcessor:
         self.supported_variables = {'a', 'b', 'c', 'd', 'e'}
         self.operator_precedence = {'!': 5, '~': 4, '&': 3, '|': 2, '->': 1}
 
-    def validate_and_parse(self, expression: str) -> Dict:
-        """Комплексная валидация и парсинг логического выражения"""
-        # Очистка от пробелов
-        cleaned_expression = self._remove_whitespace(expression)
-
-        # Базовая валидация
-        validation_result = self._validate_expression(cleaned_expression)
-        if not validation_result["is_valid"]:
-            return validation_result
-
-        # Извлечение переменных
-        variables = self._extract_unique_variables(cleaned_expression)
-
-        # Токенизация
-        tokens = self._tokenize_expression(cleaned_expression)
-        if not tokens:
-            return {"is_valid": False, "error_message": "Ошибка токенизации"}
-
-        # Преобразование в постфиксную форму
-        postfix_tokens = self._convert_to_postfix(tokens)
+    def validate_and_parse(self, expression: str, dont_cares: Union[str, List[int], None] = None) -> Dict:
+        """Комплексная валидация и парсинг логического выражения.
+
+        dont_cares — безразличные наборы: список номеров наборов либо второе
+        выражение, истинное на безразличных наборах.
+        """
+        if dont_cares is not None:
+            return self._parse_with_dont_cares(expression, dont_cares)
+
+        try:
+            tokens, postfix_tokens, variables = self._parse(expression)
+        except ExpressionSyntaxError as error:
+            position = "" if error.offset is None else f" (позиция {error.offset + 1})"
+            return {
+                "is_valid": False,
+                "error_message": f"{error.message}{position}",
+                "error_offset": error.offset
+            }
 
         return {
             "is_valid": True,
             "original_expression": expression,
-            "cleaned_expression": cleaned_expression,
+            "cleaned_expression": self._remove_whitespace(expression),
             "variables": variables,
             "tokens": tokens,
             "postfix_tokens": postfix_tokens
         }
 
+    def _parse_with_dont_cares(self, expression: str, dont_cares: Union[str, List[int]]) -> Dict:
+        """Разбор выражения вместе с безразличными наборами"""
+        result = self.validate_and_parse(expression)
+        if not result["is_valid"]:
+            return result
+
+        if isinstance(dont_cares, str):
+            dont_care_result = self.validate_and_parse(dont_cares)
+            if not dont_care_result["is_valid"]:
+                return {"is_valid": False,
+                        "error_message": f"Безразличные наборы: {dont_care_result['error_message']}"}
+            # Номера наборов считаются по объединению переменных обоих выражений
+            result["variables"] = sorted(set(result["variables"]) | set(dont_care_result["variables"]))
+            result["dont_care_postfix"] = dont_care_result["postfix_tokens"]
+            return result
+
+        indices = list(dont_cares)
+        if not all(isinstance(index, int) and not isinstance(index, bool) for index in indices):
+            return {"is_valid": False, "error_message": "Безразличные наборы: ожидаются номера наборов"}
+        table_size = 2 ** len(result["variables"])
+        if any(index < 0 or index >= table_size for index in indices):
+            return {"is_valid": False,
+                    "error_message": f"Безразличные наборы: номер вне диапазона 0..{table_size - 1}"}
+        result["dont_care_indices"] = sorted(set(indices))
+        return result
+
     def _remove_whitespace(self, expression: str) -> str:
         """Удаление всех пробельных символов"""
         return re.sub(r'\s+', '', expression)
 
-    def _validate_expression(self, expression: str) -> Dict:
-        """Комплексная валидация выражения"""
-        # Удаляем пробелы перед валидацией
-        expression = self._remove_whitespace(expression)
-
-        if not expression:
-            return {"is_valid": False, "error_message": "Пустое выражение"}
-
-        # Проверка символов
-        if not self._validate_characters(expression):
-            return {"is_valid": False, "error_message": "Недопустимые символы в выражении"}
-
-        # Проверка скобок
-        if not self._validate_parentheses(expression):
-            return {"is_valid": False, "error_message": "Несбалансированные скобки"}
-
-        # Проверка синтаксиса
-        syntax_error = self._validate_syntax(expression)
-        if syntax_error:
-            return {"is_valid": False, "error_message": syntax_error}
-
-        return {"is_valid": True}
-
-    def _validate_characters(self, expression: str) -> bool:
-        """Проверка допустимости символов"""
-        pattern = r'^[a-e&|!~()\->]+$'
-        if not re.match(pattern, expression):
-            return False
-        return True
-
-    def _validate_parentheses(self, expression: str) -> bool:
-        """Проверка баланса скобок"""
-        balance = 0
-        for char in expression:
-            if char == '(':
-                balance += 1
-            elif char == ')':
-                balance -= 1
-                if balance < 0:
-                    return False
-        return balance == 0
-
-    def _validate_syntax(self, expression: str) -> str:
-        """Проверка синтаксической корректности (улучшенная версия)"""
-        # Проверка операторов в начале/конце
-        if expression[0] in {'&', '|', '~', '->'}:
-            return "Выражение не может начинаться с бинарного оператора"
-        if expression[-1] in {'&', '|', '~', '-', '!'}:
-            return "Выражение не может заканчиваться оператором"
-
-        # Проверка пустых скобок
-        if '()' in expression:
-            return "Пустые скобки"
-
-        # Проверка последовательности операторов
-        if re.search(r'[&|~!]{2,}', expression):
-            return "Некорректная последовательность операторов"
-
-        # Проверка импликации
-        if re.search(r'->.*->', expression):
-            return "Некорректное использование импликации"
-
-        return ""
-
-    def _extract_unique_variables(self, expression: str) -> List[str]:
-        """Извлечение уникальных переменных в алфавитном порядке"""
-        variables = sorted(set(char for char in expression if char in self.supported_variables))
-        return variables
-
-    def _tokenize_expression(self, expression: str) -> List[str]:
-        """Токенизация выражения"""
-        tokens = []
-        i = 0
-        n = len(expression)
-
-        while i < n:
-            if expression[i] in self.supported_variables:
-                tokens.append(expression[i])
-                i += 1
-            elif expression[i] in {'(', ')', '!', '&', '|', '~'}:
-                tokens.append(expression[i])
-                i += 1
-            elif expression[i] == '-' and i + 1 < n and expression[i + 1] == '>':
-                tokens.append('->')
-                i += 2
+    def _parse(self, expression: str) -> Tuple[List[str], List[str], List[str]]:
+        """Однопроходный разбор: лексемы, постфиксная запись и переменные.
+
+        Лексемы читаются лениво, по одной, и сразу разбираются подъемом
+        приоритетов на явном стеке операторов (глубина вложенности скобок
+        не ограничена стеком вызовов) за время, линейное по длине выражения;
+        бинарные операторы левоассоциативны. При ошибке выбрасывается
+        ExpressionSyntaxError со смещением символа в исходной строке.
+        """
+        lexer = self._lex(expression)
+        tokens: List[str] = []
+        postfix: List[str] = []
+        variables = set()
+        # Отложенные операторы и открытые скобки со смещениями
+        operator_stack: List[Tuple[str, int]] = []
+        open_parens = 0
+        token, offset = next(lexer, (None, len(expression)))
+        previous_offset = None
+        expect_operand = True
+
+        while True:
+            if expect_operand:
+                if token is None:
+                    if not tokens:
+                        raise ExpressionSyntaxError("Пустое выражение", None)
+                    raise ExpressionSyntaxError("Выражение не может заканчиваться оператором", previous_offset)
+                tokens.append(token)
+                if token == '!' or token == '(':
+                    operator_stack.append((token, offset))
+                    if token == '(':
+                        open_parens += 1
+                elif token in self.supported_variables:
+                    postfix.append(token)
+                    variables.add(token)
+                    expect_operand = False
+                elif token == ')':
+                    if operator_stack and operator_stack[-1][0] == '(' and tokens[-2] == '(':
+                        raise ExpressionSyntaxError("Пустые скобки", operator_stack[-1][1])
+                    raise ExpressionSyntaxError("Пропущен операнд перед закрывающей скобкой", offset)
+                elif len(tokens) == 1:
+                    raise ExpressionSyntaxError("Выражение не может начинаться с бинарного оператора", offset)
+                else:
+                    raise ExpressionSyntaxError("Некорректная последовательность операторов", offset)
+            elif token in self.operator_precedence and token != '!':
+                tokens.append(token)
+                precedence = self.operator_precedence[token]
+                # Унарное отрицание на стеке уже получило операнд и выталкивается всегда
+                while (operator_stack and operator_stack[-1][0] != '('
+                       and self.operator_precedence[operator_stack[-1][0]] >= precedence):
+                    postfix.append(operator_stack.pop()[0])
+                operator_stack.append((token, offset))
+                expect_operand = True
+            elif token == ')' and open_parens:
+                tokens.append(token)
+                while operator_stack[-1][0] != '(':
+                    postfix.append(operator_stack.pop()[0])
+                operator_stack.pop()
+                open_parens -= 1
             else:
-                return []
-        return tokens
-
-    def _convert_to_postfix(self, tokens: List[str]) -> List[str]:
-        """Преобразование в постфиксную нотацию (алгоритм сортировочной станции)"""
-        output = []
-        operator_stack = []
-
-        for token in tokens:
-            if token in self.supported_variables:
-                output.append(token)
-            elif token == '(':
-                operator_stack.append(token)
-            elif token == ')':
-                while operator_stack and operator_stack[-1] != '(':
-                    output.append(operator_stack.pop())
-                operator_stack.pop()  # Удаляем '('
-            elif token in self.operator_precedence:
-                while (operator_stack and
-                       operator_stack[-1] != '(' and
-                       self.operator_precedence.get(operator_stack[-1], 0) >= self.operator_precedence[token]):
-                    output.append(operator_stack.pop())
-                operator_stack.append(token)
+                # Операнд закончился, а следующая лексема его не продолжает
+                for pending, pending_offset in reversed(operator_stack):
+                    if pending == '(':
+                        raise ExpressionSyntaxError("Несбалансированные скобки", pending_offset)
+                if token == ')':
+                    raise ExpressionSyntaxError("Несбалансированные скобки", offset)
+                if token is not None:
+                    raise ExpressionSyntaxError("Пропущен оператор между операндами", offset)
+                break
+            previous_offset = offset
+            token, offset = next(lexer, (None, len(expression)))
 
         while operator_stack:
-            output.append(operator_stack.pop())
+            postfix.append(operator_stack.pop()[0])
+        return tokens, postfix, sorted(variables)
+
+    def _lex(self, expression: str) -> Iterator[Tuple[str, int]]:
+        """Лексемы с их смещениями; пробельные символы пропускаются"""
+        offset = 0
+        length = len(expression)
+        while offset < length:
+            char = expression[offset]
+            if char.isspace():
+                offset += 1
+            elif char in self.supported_variables or char in '()!&|~':
+                yield char, offset
+                offset += 1
+            elif char == '-' and offset + 1 < length and expression[offset + 1] == '>':
+                yield '->', offset
+                offset += 2
+            else:
+                raise ExpressionSyntaxError("Недопустимые символы в выражении", offset)
 
-        return output
\ No newline at end of file
+    def _validate_syntax(self, expression: str) -> str:
+        """Проверка синтаксической корректности; пустая строка — ошибок нет"""
+        try:
+            self._parse(expression)
+        except ExpressionSyntaxError as error:
+            return error.message
+        return ""
@@ -0,0 +1,201 @@
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from expression_dag import ExpressionDAG
+
+
+class ExpressionRewriter:
+    """Алгебраическое упрощение выражения в постфиксной записи.
+
+    Выражение перестраивается снизу вверх через конструкторы, которые сразу
+    применяют правила: свертку констант, двойное отрицание, идемпотентность
+    и дополнение (x & x = x, x & !x = 0), поглощение (x & (x | y) = x,
+    (x | y) & (x | y | z) = x | y) и понижение импликации (a -> b = !a | b).
+    Эквивалентность понижается до (a & b) | (!a & !b), только если после
+    упрощения это короче a ~ b. Конъюнкции и дизъюнкции хранятся как
+    множества операндов, узлы интернируются, как в ExpressionDAG. Если
+    упрощенная запись не короче исходной, возвращается исходная.
+    """
+
+    def __init__(self):
+        self.nodes: List[Tuple] = []
+        self._node_ids: Dict[Tuple, int] = {}
+        # Длина постфиксной записи каждого узла
+        self._sizes: List[int] = []
+
+    def simplify(self, postfix_tokens: List[str]) -> List[str]:
+        """Упрощенная постфиксная запись того же выражения"""
+        self.nodes, self._node_ids, self._sizes = [], {}, []
+        root = self._build_from_postfix(postfix_tokens)
+        if self._sizes[root] >= len(postfix_tokens):
+            return list(postfix_tokens)
+        return self._emit(root)
+
+    def find_counterexample(self, original: List[str], simplified: List[str], variables: List[str],
+                            exhaustive_limit: int = 20, samples: int = 4096,
+                            seed: Optional[int] = None) -> Optional[Dict[str, bool]]:
+        """Набор, на котором выражения различаются, или None.
+
+        До exhaustive_limit переменных выражения сравниваются на всех наборах
+        (битовые столбцы, как в TruthTableGenerator) — это доказательство
+        равносильности; для большего числа переменных — на samples случайных
+        наборах, тоже одним проходом по столбцам.
+        """
+        left, right = ExpressionDAG(original), ExpressionDAG(simplified)
+        unknown = set(left.variables) | set(right.variables)
+        unknown.difference_update(variables)
+        if unknown:
+            raise ValueError(f"Неизвестный токен: {sorted(unknown)[0]}")
+
+        if len(variables) <= exhaustive_limit:
+            width = 1 << len(variables)
+            columns = dict(zip(variables, ExpressionDAG.variable_columns(len(variables))))
+        else:
+            generator = random.Random(seed)
+            width = samples
+            columns = {variable: generator.getrandbits(samples) for variable in variables}
+
+        difference = left.evaluate_bits(columns, width) ^ right.evaluate_bits(columns, width)
+        if not difference:
+            return None
+        position = (difference & -difference).bit_length() - 1
+        return {variable: bool(columns[variable] >> position & 1) for variable in variables}
+
+    def verify(self, original: List[str], simplified: List[str], variables: List[str], **options) -> bool:
+        return self.find_counterexample(original, simplified, variables, **options) is None
+
+    def _build_from_postfix(self, postfix_tokens: List[str]) -> int:
+        stack = []
+        for token in postfix_tokens:
+            if token in ExpressionDAG.UNARY_OPERATORS:
+                if len(stack) < 1:
+                    raise ValueError("Недостаточно операндов для унарной операции")
+                stack.append(self._make_not(stack.pop()))
+            elif token in ExpressionDAG.BINARY_OPERATORS:
+                if len(stack) < 2:
+                    raise ValueError(f"Недостаточно операндов для бинарной операции '{token}'")
+                right = stack.pop()
+                left = stack.pop()
+                if token == '->':
+                    stack.append(self._make_nary('|', (self._make_not(left), right)))
+                elif token == '~':
+                    stack.append(self._make_equivalence(left, right))
+                else:
+                    stack.append(self._make_nary(token, (left, right)))
+            elif token in ('0', '1'):
+                stack.append(self._make_const(token == '1'))
+            else:
+                stack.append(self._intern(('var', token), 1))
+
+        if len(stack) != 1:
+            raise ValueError(f"Некорректное выражение. Осталось значений в стеке: {len(stack)}")
+        return stack[0]
+
+    def _make_const(self, value: bool) -> int:
+        return self._intern(('const', bool(value)), 1)
+
+    def _make_not(self, operand: int) -> int:
+        node = self.nodes[operand]
+        if node[0] == 'const':
+            return self._make_const(not node[1])
+        if node[0] == '!':
+            return node[1]
+        return self._intern(('!', operand), self._sizes[operand] + 1)
+
+    def _make_nary(self, operator: str, operands: Iterable[int]) -> int:
+        """Конъюнкция или дизъюнкция операндов с упрощением"""
+        identity = operator == '&'
+        dual = '|' if identity else '&'
+        operands = set(operands)
+        if any(self._complement_id(operand) in operands for operand in operands):
+            return self._make_const(not identity)
+
+        flat = set()
+        for operand in operands:
+            node = self.nodes[operand]
+            if node[0] == operator:
+                flat.update(node[1])
+            elif node[0] == 'const':
+                if node[1] != identity:
+                    return self._make_const(not identity)
+            else:
+                flat.add(operand)
+
+        if any(self._complement_id(operand) in flat for operand in flat):
+            return self._make_const(not identity)
+
+        # Поглощение: x & (x | y) = x; (x | y) & (x | y | z) = x | y
+        absorbed = set()
+        for operand in flat:
+            node = self.nodes[operand]
+            if node[0] == dual and any(other in node[1] or (self.nodes[other][0] == dual
+                                                            and self.nodes[other][1] < node[1])
+                                       for other in flat if other != operand):
+                absorbed.add(operand)
+        flat -= absorbed
+
+        if not flat:
+            return self._make_const(identity)
+        if len(flat) == 1:
+            return next(iter(flat))
+        size = sum(self._sizes[operand] for operand in flat) + len(flat) - 1
+        return self._intern((operator, frozenset(flat)), size)
+
+    def _make_equivalence(self, left: int, right: int) -> int:
+        lowered = self._make_nary('|', (self._make_nary('&', (left, right)),
+                                        self._make_nary('&', (self._make_not(left), self._make_not(right)))))
+        if self.nodes[lowered][0] == 'const':
+            return lowered
+
+        for operand, other in ((left, right), (right, left)):
+            if self.nodes[operand][0] == 'const':
+                kept = other if self.nodes[operand][1] else self._make_not(other)
+                break
+        else:
+            if left == right or self._complement_id(left) == right:
+                return self._make_const(left == right)
+            if self.nodes[left][0] == '!' and self.nodes[right][0] == '!':
+                left, right = self.nodes[left][1], self.nodes[right][1]
+            kept = self._intern(('~', frozenset((left, right))), self._sizes[left] + self._sizes[right] + 1)
+        return lowered if self._sizes[lowered] < self._sizes[kept] else kept
+
+    def _complement_id(self, operand: int) -> Optional[int]:
+        """Номер узла-отрицания, если он уже построен"""
+        node = self.nodes[operand]
+        if node[0] == '!':
+            return node[1]
+        return self._node_ids.get(('!', operand))
+
+    def _intern(self, key: Tuple, size: int) -> int:
+        node_id = self._node_ids.get(key)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.nodes.append(key)
+            self._sizes.append(size)
+            self._node_ids[key] = node_id
+        return node_id
+
+    def _emit(self, root: int) -> List[str]:
+        """Постфиксная запись узла; операнды — в порядке построения"""
+        output = []
+        pending = [root]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, str):
+                output.append(item)
+                continue
+            node = self.nodes[item]
+            kind = node[0]
+            if kind == 'const':
+                output.append('1' if node[1] else '0')
+            elif kind == 'var':
+                output.append(node[1])
+            elif kind == '!':
+                pending.extend(('!', node[1]))
+            else:
+                operands = sorted(node[1])
+                sequence = [operands[0]]
+                for operand in operands[1:]:
+                    sequence.extend((operand, kind))
+                pending.extend(reversed(sequence))
+        return output
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+
+class PipelineProfiler:
+    """Замеры этапов пайплайна: время, пиковая память и счетчики.
+
+    Этапы вкладываются друг в друга (with profiler.stage(...)); счетчики
+    относятся к самому внутреннему открытому этапу. Пиковая память этапа —
+    прирост выделенной памяти (tracemalloc) над уровнем на его начало;
+    пик вложенного этапа учитывается и во внешнем. Отслеживание памяти
+    замедляет вычисления в несколько раз, его можно отключить (track_memory=False).
+    """
+
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"name": name, "depth": len(self._stack), "start_ms": self._elapsed_ms(),
+                  "wall_ms": 0.0, "peak_memory_kib": None, "counters": {}}
+        self.records.append(record)
+        frame = {"record": record, "started": time.perf_counter(), "base": 0, "peak": 0}
+        self._enter_memory(frame)
+        self._stack.append(frame)
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            record["wall_ms"] = round((time.perf_counter() - frame["started"]) * 1000, 3)
+            self._exit_memory(frame)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Увеличение счетчика текущего этапа"""
+        counters = self._current_counters()
+        if counters is not None:
+            counters[name] = counters.get(name, 0) + value
+
+    def append(self, name: str, value: Any) -> None:
+        """Добавление значения в список текущего этапа (например, импликант в раунде)"""
+        counters = self._current_counters()
+        if counters is not None:
+            counters.setdefault(name, []).append(value)
+
+    def set(self, name: str, value: Any) -> None:
+        counters = self._current_counters()
+        if counters is not None:
+            counters[name] = value
+
+    def summary(self) -> Dict[str, Any]:
+        """Замеры в виде данных для словаря результатов"""
+        top_level = [record for record in self.records if record["depth"] == 0]
+        return {
+            "total_ms": round(sum(record["wall_ms"] for record in top_level), 3),
+            "stages": [dict(record, counters=dict(record["counters"])) for record in self.records]
+        }
+
+    def trace_events(self) -> Dict[str, Any]:
+        """Замеры в формате Trace Event (chrome://tracing, Perfetto, speedscope)"""
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = []
+        for record in self.records:
+            args = dict(record["counters"])
+            if record["peak_memory_kib"] is not None:
+                args["peak_memory_kib"] = record["peak_memory_kib"]
+            events.append({
+                "name": record["name"],
+                "cat": "lab3",
+                "ph": "X",
+                "ts": round(record["start_ms"] * 1000, 1),
+                "dur": round(record["wall_ms"] * 1000, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.trace_events(), trace_file, ensure_ascii=False)
+
+    def _current_counters(self) -> Optional[Dict[str, Any]]:
+        return self._stack[-1]["record"]["counters"] if self._stack else None
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1000, 3)
+
+    def _enter_memory(self, frame: Dict[str, Any]) -> None:
+        if not self.track_memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Пик внешнего этапа до начала вложенного
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], peak)
+        tracemalloc.reset_peak()
+        frame["base"] = current
+        frame["peak"] = current
+
+    def _exit_memory(self, frame: Dict[str, Any]) -> None:
+        if not self.track_memory:
+            return
+        peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        frame["record"]["peak_memory_kib"] = round((peak - frame["base"]) / 1024, 1)
+        if self._stack:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def profile_stage(profiler: Optional[PipelineProfiler], name: str):
+    """Этап профилировщика или пустой контекст, если профилирование выключено"""
+    return profiler.stage(name) if profiler is not None else nullcontext()
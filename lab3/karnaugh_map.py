@@ -0,0 +1,156 @@
+from typing import Dict, List, Tuple
+
+# Отрезок по одному измерению карты: (номера позиций, битовая маска позиций)
+Span = Tuple[Tuple[int, ...], int]
+
+MAX_KARNAUGH_VARIABLES = 6
+
+# Значение клетки карты для безразличного набора
+DONT_CARE_CELL = 2
+
+
+def gray_code(count: int) -> List[int]:
+    """Первые count значений кода Грея"""
+    if count <= 0:
+        return [0]
+    return [i ^ (i >> 1) for i in range(count)]
+
+
+def karnaugh_dimensions(num_vars: int) -> Tuple[int, int, int]:
+    """Число переменных слоев, строк и столбцов карты.
+
+    До 4 переменных карта плоская; для 5 и 6 переменных — стопка карт 4×4,
+    слои которой упорядочены кодом Грея по первым переменным.
+    """
+    if num_vars > MAX_KARNAUGH_VARIABLES:
+        raise ValueError(f"Карта Карно строится не более чем для {MAX_KARNAUGH_VARIABLES} переменных")
+    layer_bits = max(num_vars - 4, 0)
+    plane = num_vars - layer_bits
+    return layer_bits, plane // 2, (plane + 1) // 2
+
+
+class KarnaughMap:
+    """Поиск групп на карте Карно.
+
+    Каждая строка каждого слоя хранится битовой маской столбцов, поэтому
+    проверка прямоугольника — это AND масок его строк и сравнение с маской
+    отрезка столбцов. Измерения карты замкнуты в тор; при не более чем двух
+    переменных на измерение любой отрезок длины 2^k — это подкуб, поэтому
+    максимальные прямоугольники совпадают с простыми импликантами.
+    """
+
+    def __init__(self, grid: List[List[List[int]]], num_vars: int):
+        self.grid = grid
+        self.num_vars = num_vars
+        self.layer_bits, self.row_bits, self.column_bits = karnaugh_dimensions(num_vars)
+        self.layer_codes = gray_code(1 << self.layer_bits)
+        self.row_codes = gray_code(1 << self.row_bits)
+        self.column_codes = gray_code(1 << self.column_bits)
+
+    def cell_index(self, layer: int, row: int, column: int) -> int:
+        """Номер набора, которому соответствует клетка"""
+        return ((self.layer_codes[layer] << (self.row_bits + self.column_bits)) |
+                (self.row_codes[row] << self.column_bits) | self.column_codes[column])
+
+    def groups(self, value: int, dont_care: int = None) -> List[Dict]:
+        """Все максимальные прямоугольники из клеток со значением value.
+
+        Клетки со значением dont_care могут входить в группы, но группы
+        только из таких клеток не возвращаются.
+        """
+        lines = self._line_masks(value, dont_care)
+        required = self._line_masks(value)
+        layer_spans = self._spans(len(self.layer_codes))
+        row_spans = self._spans(len(self.row_codes))
+        column_spans = self._spans(len(self.column_codes))
+
+        filled = set()
+        useful = set()
+        for li, (layers, _) in enumerate(layer_spans):
+            for ri, (rows, _) in enumerate(row_spans):
+                common = -1
+                touched = 0
+                for layer in layers:
+                    for row in rows:
+                        common &= lines[layer][row]
+                        touched |= required[layer][row]
+                for ci, (_, columns_mask) in enumerate(column_spans):
+                    if common & columns_mask == columns_mask:
+                        filled.add((li, ri, ci))
+                        if touched & columns_mask:
+                            useful.add((li, ri, ci))
+
+        layer_ext = self._extensions(layer_spans)
+        row_ext = self._extensions(row_spans)
+        column_ext = self._extensions(column_spans)
+        result = []
+        for li, ri, ci in sorted(useful):
+            if (any((other, ri, ci) in filled for other in layer_ext[li]) or
+                    any((li, other, ci) in filled for other in row_ext[ri]) or
+                    any((li, ri, other) in filled for other in column_ext[ci])):
+                continue
+            result.append(self._describe(layer_spans[li][0], row_spans[ri][0], column_spans[ci][0]))
+        return result
+
+    def _line_masks(self, value: int, dont_care: int = None) -> List[List[int]]:
+        """Для каждой строки каждого слоя — маска столбцов со значением value или dont_care"""
+        masks = []
+        for layer in self.grid:
+            layer_masks = []
+            for row in layer:
+                mask = 0
+                for column, cell in enumerate(row):
+                    if cell == value or (dont_care is not None and cell == dont_care):
+                        mask |= 1 << column
+                layer_masks.append(mask)
+            masks.append(layer_masks)
+        return masks
+
+    @staticmethod
+    def _spans(size: int) -> List[Span]:
+        """Отрезки длины 2^k на кольце из size позиций"""
+        full = (1 << size) - 1
+        spans = []
+        width = 1
+        while width <= size:
+            block = (1 << width) - 1
+            for start in range(size if width < size else 1):
+                mask = ((block << start) | (block >> (size - start))) & full
+                spans.append((tuple(i for i in range(size) if mask >> i & 1), mask))
+            width *= 2
+        return spans
+
+    @staticmethod
+    def _extensions(spans: List[Span]) -> List[List[int]]:
+        """Для каждого отрезка — отрезки вдвое длиннее, содержащие его"""
+        return [[j for j, (other, other_mask) in enumerate(spans)
+                 if len(other) == 2 * len(positions) and mask & ~other_mask == 0]
+                for positions, mask in spans]
+
+    def _describe(self, layers: Tuple[int, ...], rows: Tuple[int, ...], columns: Tuple[int, ...]) -> Dict:
+        value = 0
+        mask = 0
+        for codes, positions, shift in ((self.layer_codes, layers, self.row_bits + self.column_bits),
+                                        (self.row_codes, rows, self.column_bits),
+                                        (self.column_codes, columns, 0)):
+            common = -1
+            union = 0
+            for position in positions:
+                common &= codes[position]
+                union |= codes[position]
+            value |= common << shift
+            mask |= (common ^ union) << shift
+
+        cells = sorted(self.cell_index(layer, row, column)
+                       for layer in layers for row in rows for column in columns)
+        pattern = ''.join('-' if (mask >> bit) & 1 else str((value >> bit) & 1)
+                          for bit in range(self.num_vars - 1, -1, -1))
+        return {
+            "pattern": pattern,
+            "value": value,
+            "mask": mask,
+            "layers": list(layers),
+            "rows": list(rows),
+            "columns": list(columns),
+            "cells": cells
+        }
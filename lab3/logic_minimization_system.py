@@ -1,52 +1,147 @@
+from typing import Dict, List, Optional, Union
+
 from expression_processor import LogicalExpressionProcessor
+from instrumentation import PipelineProfiler, profile_stage
+from minimization_cache import MinimizationCache
 from minimization_engine import MinimizationEngine
 from truth_table_generator import TruthTableGenerator
 from results_presenter import ResultsPresenter
 
 
 class LogicMinimizationSystem:
-    def __init__(self):
+    def __init__(self, cache: Optional[MinimizationCache] = None, cost_metric: str = "literals"):
+        """cost_metric — метрика выбора покрытий (см. MinimizationEngine); кэш хранит
+        покрытия, построенные по числу литералов, и с другими метриками не используется"""
         self.expression_processor = LogicalExpressionProcessor()
-        self.minimization_engine = MinimizationEngine()
+        self.minimization_engine = MinimizationEngine(cost_metric=cost_metric)
         self.truth_table_generator = TruthTableGenerator()
         self.results_presenter = ResultsPresenter()
-
-    def execute_minimization_pipeline(self, input_expression):
-        """Основной пайплайн обработки логического выражения"""
+        self.cache = cache
+
+    def execute_minimization_pipeline(self, input_expression, dont_cares: Union[str, List[int], None] = None,
+                                      profiler: Optional[PipelineProfiler] = None):
+        """Основной пайплайн обработки логического выражения.
+
+        dont_cares — безразличные наборы: список номеров или выражение.
+        Если передан profiler, замеры этапов добавляются в raw_data["profile"].
+        """
+        minimization_results = self.analyze_expression(input_expression, dont_cares, profiler=profiler)
+        if "error" in minimization_results:
+            return minimization_results
+
+        # Презентация результатов
+        with profile_stage(profiler, "presentation"):
+            presented = self.results_presenter.format_comprehensive_results(minimization_results)
+        if profiler is not None:
+            minimization_results["profile"] = profiler.summary()
+        return presented
+
+    def analyze_expression(self, input_expression, dont_cares: Union[str, List[int], None] = None,
+                           with_display: bool = True, profiler: Optional[PipelineProfiler] = None,
+                           trace_mode: str = "structured") -> Dict:
+        """Результаты минимизации в виде данных, без текстового оформления.
+
+        with_display=False не добавляет таблицу истинности (truth_table_data),
+        trace_mode="none" отключает этапы методов (пакетный режим). По умолчанию этапы
+        хранятся как StageTrace и превращаются в текст только при отображении.
+        """
+        previous_trace_mode = self.minimization_engine.trace_mode
+        self.minimization_engine.trace_mode = trace_mode
+        self.minimization_engine.profiler = profiler
         try:
             # Валидация и парсинг выражения
-            validated_data = self.expression_processor.validate_and_parse(input_expression)
+            with profile_stage(profiler, "validation"):
+                validated_data = self.expression_processor.validate_and_parse(input_expression, dont_cares)
             if not validated_data["is_valid"]:
                 return {"error": validated_data["error_message"]}
 
             # Генерация таблицы истинности
-            truth_table_data = self.truth_table_generator.generate_complete_table(
-                validated_data["variables"],
-                validated_data["postfix_tokens"]
-            )
-
-            # Получаем отформатированную таблицу истинности
-            table_display = self.truth_table_generator.get_truth_table_display(truth_table_data)
-
-            # Получаем информацию о минтермах и макстермах
-            minterm_info = self.truth_table_generator.get_minterm_maxterm_info(truth_table_data)
+            with profile_stage(profiler, "truth_table"):
+                truth_table_data = self.truth_table_generator.generate_complete_table(
+                    validated_data["variables"],
+                    validated_data["postfix_tokens"],
+                    validated_data.get("dont_care_indices"),
+                    validated_data.get("dont_care_postfix")
+                )
+                # Получаем информацию о минтермах и макстермах
+                minterm_info = self.truth_table_generator.get_minterm_maxterm_info(truth_table_data)
+                if profiler is not None:
+                    profiler.set("rows", truth_table_data["total_rows"])
+                    profiler.set("postfix_tokens", len(validated_data["postfix_tokens"]))
 
             # Минимизация различными методами
-            minimization_results = self.minimization_engine.perform_all_minimizations(
-                truth_table_data,
-                validated_data["variables"]
-            )
+            with profile_stage(profiler, "minimization"):
+                minimization_results = self._minimize(truth_table_data, validated_data["variables"])
 
             # Добавляем дополнительную информацию в результаты
-            minimization_results["truth_table_display"] = table_display
+            if with_display:
+                # Строки таблицы строятся при отображении или потоковой записи
+                minimization_results["truth_table_data"] = truth_table_data
             minimization_results["minterm_info"] = minterm_info
+            if profiler is not None:
+                minimization_results["profile"] = profiler.summary()
+            return minimization_results
 
-            # Презентация результатов
-            return self.results_presenter.format_comprehensive_results(minimization_results)
+        except Exception as e:
+            return {"error": f"Системная ошибка: {str(e)}"}
+        finally:
+            self.minimization_engine.profiler = None
+            self.minimization_engine.trace_mode = previous_trace_mode
+
+    def execute_multi_output_pipeline(self, input_expressions: List[str],
+                                      dont_cares: Optional[List[Union[str, List[int], None]]] = None):
+        """Совместная минимизация нескольких выражений с общими термами.
+
+        Все функции рассматриваются от объединения их переменных;
+        dont_cares — безразличные наборы для каждого выражения (или None).
+        """
+        try:
+            dont_cares = dont_cares or [None] * len(input_expressions)
+            parsed = []
+            for expression, expression_dont_cares in zip(input_expressions, dont_cares):
+                validated_data = self.expression_processor.validate_and_parse(expression, expression_dont_cares)
+                if not validated_data["is_valid"]:
+                    return {"error": f"{expression}: {validated_data['error_message']}"}
+                if validated_data.get("dont_care_indices") and len(input_expressions) > 1:
+                    return {"error": f"{expression}: безразличные наборы нескольких функций задаются выражениями"}
+                parsed.append(validated_data)
+
+            variables = sorted({variable for data in parsed for variable in data["variables"]})
+            truth_tables = [self.truth_table_generator.generate_complete_table(
+                variables, data["postfix_tokens"], None, data.get("dont_care_postfix")) for data in parsed]
+
+            results = self.minimization_engine.minimize_multi_output(truth_tables, variables)
+            results["expressions"] = list(input_expressions)
+            return self.results_presenter.format_multi_output_results(results)
 
         except Exception as e:
             return {"error": f"Системная ошибка: {str(e)}"}
 
+    def _minimize(self, truth_table_data: Dict, variables: List[str]) -> Dict:
+        """Минимизация всеми методами с использованием кэша, если он подключен"""
+        if self.cache is None or self.minimization_engine.cost_model.metric != "literals":
+            return self.minimization_engine.perform_all_minimizations(truth_table_data, variables)
+
+        minterms = truth_table_data["sdnf_numeric"]
+        dont_cares = truth_table_data.get("dont_care_numeric", [])
+        with profile_stage(self.minimization_engine.profiler, "cache_lookup"):
+            covers = self.cache.lookup(minterms, len(variables), dont_cares)
+        methods = self.minimization_engine.minimization_methods
+        # Записи, сохраненные до появления метода, считаются промахом
+        if covers is not None and all(set(methods[form_type]) <= set(covers[form_type]) for form_type in covers):
+            results = self.minimization_engine.results_from_covers(
+                truth_table_data, variables, covers, "Результат получен из кэша (NPN-эквивалентная функция)")
+        else:
+            results = self.minimization_engine.perform_all_minimizations(truth_table_data, variables)
+            covers = {form_type: {method: data["cover"] for method, data in results[f"{form_type}_results"].items()}
+                      for form_type in ('sdnf', 'sknf')}
+            # Результаты с ошибками не кэшируются
+            if all(cover is not None for form in covers.values() for cover in form.values()):
+                self.cache.store(minterms, len(variables), covers, dont_cares)
+
+        results["cache_stats"] = self.cache.stats
+        return results
+
 
 def main():
     system = LogicMinimizationSystem()
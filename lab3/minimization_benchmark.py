@@ -0,0 +1,290 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from batch_minimization import ItemTimeout, run_with_timeout
+from cost_model import COST_METRICS
+from instrumentation import PipelineProfiler
+from minimization_engine import MinimizationEngine
+from truth_table_generator import TruthTableGenerator
+
+DEFAULT_VARIABLES = (4, 6, 8, 10, 12, 14, 16)
+DEFAULT_DENSITIES = (0.1, 0.3, 0.5)
+# Построчное вычисление таблицы дольше этого размера не запускается
+MAX_ROWS_BACKEND_ROWS = 1 << 14
+
+METHOD_COLUMNS = [("n", "n"), ("method", "метод"), ("status", "статус"), ("time_ms", "время, мс"),
+                  ("peak_memory_kib", "память, КиБ"), ("primes", "простых"), ("cubes", "кубов"),
+                  ("literals", "литералов"), ("gates", "элементов")]
+BACKEND_COLUMNS = [("n", "n"), ("tokens", "токенов"), ("mode", "режим"), ("simplify", "упрощение"),
+                   ("processes", "процессов"), ("status", "статус"), ("time_ms", "время, мс"), ("peak_memory_kib", "память, КиБ")]
+
+
+def variable_names(num_vars: int) -> List[str]:
+    return [f"x{index}" for index in range(1, num_vars + 1)]
+
+
+def random_function(num_vars: int, density: float, seed: int,
+                    dont_care_density: float = 0.0) -> Tuple[List[int], List[int]]:
+    """Случайная функция: каждый набор — единица с вероятностью density,
+    из остальных безразличный с вероятностью dont_care_density"""
+    generator = random.Random(f"{seed}:{num_vars}:{density}:{dont_care_density}")
+    minterms, dont_cares = [], []
+    for index in range(1 << num_vars):
+        if generator.random() < density:
+            minterms.append(index)
+        elif generator.random() < dont_care_density:
+            dont_cares.append(index)
+    return minterms, dont_cares
+
+
+def random_expression(num_vars: int, seed: int, operators: Optional[int] = None) -> List[str]:
+    """Случайное выражение в постфиксной записи не менее чем с operators бинарными
+    операциями (по умолчанию 4n)"""
+    generator = random.Random(f"{seed}:{num_vars}:expression")
+    variables = variable_names(num_vars)
+    operators = 4 * num_vars if operators is None else operators
+    stack_depth = 0
+    postfix = []
+    remaining = operators
+    while remaining or stack_depth != 1:
+        if stack_depth >= 2 and (remaining == 0 or generator.random() < 0.45):
+            postfix.append(generator.choice(['&', '|', '->', '~']))
+            stack_depth -= 1
+            remaining = max(0, remaining - 1)
+        elif stack_depth and generator.random() < 0.1:
+            postfix.append('!')
+        else:
+            postfix.append(generator.choice(variables))
+            stack_depth += 1
+    return postfix
+
+
+def run_method_benchmark(num_vars_list: Sequence[int] = DEFAULT_VARIABLES,
+                         densities: Sequence[float] = DEFAULT_DENSITIES,
+                         methods: Optional[Sequence[str]] = None, form_type: str = 'sdnf', seed: int = 1,
+                         timeout: Optional[float] = 10.0, track_memory: bool = True,
+                         dont_care_density: float = 0.0, progress=None,
+                         cost_metric: str = "literals") -> List[Dict]:
+    """Замеры методов минимизации на случайных функциях.
+
+    Покрытия выбираются по метрике cost_metric (см. CostModel), в записях
+    приводятся термы, литералы и оценка числа 2-входовых элементов.
+    Каждый метод вызывается отдельно (без общих простых импликант). Если
+    метод не уложился в timeout, большие n для той же плотности не
+    запускаются (статус "skipped"). Память измеряется повторным прогоном
+    под tracemalloc, чтобы не искажать время.
+    """
+    engine = MinimizationEngine(trace_mode="none", cost_metric=cost_metric)
+    methods = list(methods or engine.minimization_methods[form_type])
+    records = []
+    for density in densities:
+        stopped = set()
+        for num_vars in sorted(num_vars_list):
+            minterms, dont_cares = random_function(num_vars, density, seed, dont_care_density)
+            if form_type == 'sknf':
+                excluded = set(minterms) | set(dont_cares)
+                terms = [index for index in range(1 << num_vars) if index not in excluded]
+            else:
+                terms = minterms
+            for method in methods:
+                record = {"n": num_vars, "density": density, "form": form_type, "method": method,
+                          "terms": len(terms), "status": "skipped", "time_ms": None, "peak_memory_kib": None,
+                          "primes": None, "cubes": None, "literals": None, "gates": None}
+                records.append(record)
+                if method in stopped:
+                    continue
+                record.update(_measure_method(engine, form_type, method, terms, num_vars, dont_cares,
+                                              timeout, track_memory))
+                if record["status"] != "ok":
+                    stopped.add(method)
+                if progress is not None:
+                    progress(record)
+    return records
+
+
+def run_backend_benchmark(num_vars_list: Sequence[int] = DEFAULT_VARIABLES, seed: int = 1,
+                          modes: Sequence[str] = TruthTableGenerator.EVALUATION_MODES,
+                          timeout: Optional[float] = 10.0, track_memory: bool = True,
+                          progress=None, simplify: bool = False, processes: Optional[int] = 1) -> List[Dict]:
+    """Замеры построения таблицы истинности случайного выражения в каждом режиме вычисления.
+
+    Упрощение выражения (simplify) задается одинаково для всех режимов: по
+    умолчанию TruthTableGenerator упрощает выражение только построчно, и
+    сравнение режимов было бы сравнением разных выражений. processes — число
+    процессов для блочного вычисления по столбцам (None — по числу ядер).
+    """
+    records = []
+    for num_vars in sorted(num_vars_list):
+        postfix = random_expression(num_vars, seed)
+        variables = variable_names(num_vars)
+        reference = None
+        for mode in modes:
+            record = {"n": num_vars, "tokens": len(postfix), "mode": mode, "simplify": simplify,
+                      "processes": (processes or os.cpu_count()) if mode == "columns" else 1, "status": "skipped",
+                      "time_ms": None, "peak_memory_kib": None}
+            records.append(record)
+            if mode == "rows" and (1 << num_vars) > MAX_ROWS_BACKEND_ROWS:
+                continue
+            generator = TruthTableGenerator(mode, simplify=simplify, processes=processes)
+            outcome = _measure(lambda: generator.generate_complete_table(variables, postfix).result_bits,
+                               timeout, track_memory)
+            record.update(outcome[0])
+            if record["status"] == "ok":
+                if reference is not None and outcome[1] != reference:
+                    raise AssertionError(f"Режимы вычисления расходятся при n = {num_vars}")
+                reference = outcome[1]
+            if progress is not None:
+                progress(record)
+    return records
+
+
+def scaling_limits(records: List[Dict]) -> Dict[str, Dict[float, Optional[int]]]:
+    """Наибольшее n, на котором метод завершился, для каждой плотности"""
+    limits: Dict[str, Dict[float, Optional[int]]] = {}
+    for record in records:
+        per_density = limits.setdefault(record["method"], {})
+        best = per_density.setdefault(record["density"], None)
+        if record["status"] == "ok" and (best is None or record["n"] > best):
+            per_density[record["density"]] = record["n"]
+    return limits
+
+
+def format_table(records: List[Dict], columns: List[Tuple[str, str]]) -> List[str]:
+    """Текстовая таблица: столбцы columns = [(ключ, заголовок)]"""
+    rows = [[title for _, title in columns]]
+    for record in records:
+        rows.append(["—" if record.get(key) is None else str(record[key]) for key, _ in columns])
+    widths = [max(len(row[index]) for row in rows) for index in range(len(columns))]
+    lines = [" | ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "-+-".join("-" * width for width in widths))
+    return lines
+
+
+def format_report(method_records: List[Dict], backend_records: List[Dict]) -> List[str]:
+    lines = []
+    for density in sorted({record["density"] for record in method_records}):
+        selected = [record for record in method_records if record["density"] == density]
+        lines.append(f"Методы минимизации ({selected[0]['form'].upper()}), плотность единиц {density}:")
+        lines.extend(format_table(selected, METHOD_COLUMNS))
+        lines.append("")
+
+    limits = scaling_limits(method_records)
+    if limits:
+        densities = sorted({record["density"] for record in method_records})
+        summary = [{"method": method, **{str(density): per_density.get(density) for density in densities}}
+                   for method, per_density in limits.items()]
+        lines.append("Наибольшее завершенное n по плотностям:")
+        lines.extend(format_table(summary, [("method", "метод")] + [(str(density), str(density))
+                                                                     for density in densities]))
+        lines.append("")
+
+    if backend_records:
+        lines.append("Построение таблицы истинности:")
+        lines.extend(format_table(backend_records, BACKEND_COLUMNS))
+    return lines
+
+
+def _measure_method(engine: MinimizationEngine, form_type: str, method: str, terms: List[int], num_vars: int,
+                    dont_cares: List[int], timeout: Optional[float], track_memory: bool) -> Dict:
+    method_func = engine.minimization_methods[form_type][method]
+    variables = variable_names(num_vars)
+
+    def run():
+        engine.last_cover = None
+        method_func(terms, num_vars, variables, dont_cares)
+        return engine.last_cover
+
+    profiler = PipelineProfiler(track_memory=False)
+    engine.profiler = profiler
+    try:
+        outcome, cover = _measure(run, timeout, track_memory, profiler)
+    finally:
+        engine.profiler = None
+    if outcome["status"] == "ok" and cover is not None:
+        cost = engine.cover_cost(cover, form_type)
+        outcome.update(cubes=cost["products"], literals=cost["literals"], gates=cost["gates"])
+    # Простые импликанты считают алгоритм Квайна и карта Карно (все максимальные группы)
+    for record in profiler.records:
+        for counter in ("primes", "groups"):
+            if counter in record["counters"]:
+                outcome["primes"] = record["counters"][counter]
+    return outcome
+
+
+def _measure(function, timeout: Optional[float], track_memory: bool,
+             profiler: Optional[PipelineProfiler] = None) -> Tuple[Dict, object]:
+    """Время без tracemalloc и, если нужно, пиковая память повторным прогоном"""
+    profiler = profiler or PipelineProfiler(track_memory=False)
+    started = time.perf_counter()
+    try:
+        with profiler.stage("run"):
+            value = run_with_timeout(function, timeout)
+    except ItemTimeout:
+        return {"status": "timeout", "time_ms": round((time.perf_counter() - started) * 1000, 1)}, None
+    except (ValueError, RecursionError, MemoryError) as e:
+        return {"status": f"error: {e}", "time_ms": None}, None
+    outcome = {"status": "ok", "time_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    if track_memory:
+        memory_profiler = PipelineProfiler(track_memory=True)
+        try:
+            with memory_profiler.stage("run") as record:
+                # Под tracemalloc вычисления медленнее, отводится больше времени
+                run_with_timeout(function, timeout and timeout * 5)
+            outcome["peak_memory_kib"] = record["peak_memory_kib"]
+        except ItemTimeout:
+            pass
+    return outcome, value
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры масштабируемости методов минимизации на случайных функциях")
+    parser.add_argument("--vars", type=int, nargs="+", default=list(DEFAULT_VARIABLES), help="числа переменных")
+    parser.add_argument("--densities", type=float, nargs="+", default=list(DEFAULT_DENSITIES),
+                        help="доли единиц функции")
+    parser.add_argument("--dont-care-density", type=float, default=0.0, help="доля безразличных среди остальных")
+    parser.add_argument("--methods", nargs="+", default=None, help="методы (по умолчанию все)")
+    parser.add_argument("--form", choices=("sdnf", "sknf"), default="sdnf")
+    parser.add_argument("--cost-metric", choices=COST_METRICS, default="literals",
+                        help="метрика выбора покрытий")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=10.0, help="ограничение времени на один запуск, с")
+    parser.add_argument("--no-memory", action="store_true", help="не измерять пиковую память")
+    parser.add_argument("--no-backends", action="store_true", help="не замерять построение таблиц")
+    parser.add_argument("--simplify", action="store_true",
+                        help="упрощать выражение перед построением таблицы (во всех режимах)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="процессов для построения таблицы по столбцам (0 — по числу ядер)")
+    parser.add_argument("--json", default=None, help="файл для записей замеров")
+    args = parser.parse_args(argv)
+
+    engine_methods = MinimizationEngine().minimization_methods[args.form]
+    unknown = [method for method in args.methods or [] if method not in engine_methods]
+    if unknown:
+        parser.error(f"неизвестный метод: {unknown[0]}")
+
+    def progress(record: Dict) -> None:
+        label = record.get("method") or record.get("mode")
+        print(f"n={record['n']} {label}: {record['status']} {record['time_ms']} мс", file=sys.stderr)
+
+    method_records = run_method_benchmark(args.vars, args.densities, args.methods, args.form, args.seed,
+                                          args.timeout, not args.no_memory, args.dont_care_density, progress,
+                                          args.cost_metric)
+    backend_records = [] if args.no_backends else run_backend_benchmark(
+        args.vars, args.seed, timeout=args.timeout, track_memory=not args.no_memory, progress=progress,
+        simplify=args.simplify, processes=args.processes or None)
+
+    print("\n".join(format_report(method_records, backend_records)))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({"methods": method_records, "backends": backend_records}, output, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
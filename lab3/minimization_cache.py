@@ -0,0 +1,235 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from itertools import permutations, product
+from math import factorial
+from typing import Dict, List, Optional, Tuple
+
+# Преобразование NPN: (perm, neg, out). Разряд k канонического номера набора
+# соответствует разряду perm[k] исходного, neg — маска инвертируемых входов
+# (в разрядах исходного номера), out — инверсия выхода
+Transform = Tuple[Tuple[int, ...], int, int]
+
+# Покрытия всех методов: {'sdnf'|'sknf': {метод: [шаблоны импликант]}}
+Covers = Dict[str, Dict[str, List[str]]]
+
+
+def npn_canonical_form(truth_bits: int, num_vars: int, max_candidates: int = 4096,
+                       dont_care_bits: int = 0) -> Tuple[int, Transform]:
+    """Канонический представитель NPN-класса функции и преобразование к нему.
+
+    truth_bits — упакованная таблица истинности (бит i — значение на наборе i).
+    При безразличных наборах dont_care_bits инверсия выхода переводит единицы
+    в нули вне безразличных наборов, а из кандидатов с равными таблицами
+    выбирается тот, у которого меньше таблица безразличных наборов.
+    Перебираются только преобразования, согласованные с инвариантами: выход
+    инвертируется так, чтобы единиц было не больше половины, каждый вход — так,
+    чтобы единиц при x=1 было не меньше, чем при x=0, входы упорядочиваются по
+    весу кофакторов. Среди оставшихся кандидатов выбирается наименьшая таблица.
+    Если кандидатов больше max_candidates, берется первый из них: форма остается
+    корректной, но эквивалентные функции могут получить разные ключи.
+    """
+    rows = 1 << num_vars
+    full = (1 << rows) - 1
+    truth_bits &= ~dont_care_bits
+    ones = truth_bits.bit_count()
+    zeros = rows - ones - dont_care_bits.bit_count()
+    outputs = [out for out in (0, 1) if (zeros if out else ones) <= (ones if out else zeros)]
+    dont_care_table = format(dont_care_bits, f'0{rows}b')[::-1]
+
+    best = None
+    for out in outputs:
+        function = full & ~(truth_bits | dont_care_bits) if out else truth_bits
+        weight = zeros if out else ones
+        polarity_options = []
+        signatures = []
+        for position in range(num_vars):
+            upper = (function & _position_mask(position, num_vars)).bit_count()
+            lower = weight - upper
+            polarity_options.append([0] if upper > lower else [1 << position] if upper < lower
+                                    else [0, 1 << position])
+            signatures.append(max(upper, lower))
+
+        groups = {}
+        for position in sorted(range(num_vars), key=lambda p: (signatures[p], p)):
+            groups.setdefault(signatures[position], []).append(position)
+        groups = [groups[signature] for signature in sorted(groups)]
+
+        candidates = len(outputs)
+        for options in polarity_options:
+            candidates *= len(options)
+        for group in groups:
+            candidates *= factorial(len(group))
+        if candidates > max_candidates:
+            polarity_options = [options[:1] for options in polarity_options]
+            groups = [[position] for group in groups for position in group]
+
+        table = format(function, f'0{rows}b')[::-1]
+        for perm_parts in product(*(permutations(group) for group in groups)):
+            perm = tuple(position for part in perm_parts for position in part)
+            for negations in product(*polarity_options):
+                neg = sum(negations)
+                candidate = _permute_table(table, perm, neg, rows)
+                if dont_care_bits:
+                    candidate = (candidate, _permute_table(dont_care_table, perm, neg, rows))
+                if best is None or candidate < best[0]:
+                    best = (candidate, (perm, neg, out))
+
+    canonical, transform = best
+    return (canonical[0] if dont_care_bits else canonical), transform
+
+
+def pattern_to_canonical(pattern: str, transform: Transform) -> str:
+    """Шаблон импликанты ('01-') в переменных канонической функции"""
+    perm, neg, _ = transform
+    num_vars = len(pattern)
+    result = ['-'] * num_vars
+    for k, position in enumerate(perm):
+        symbol = pattern[num_vars - 1 - position]
+        if symbol != '-':
+            result[num_vars - 1 - k] = str(int(symbol) ^ ((neg >> position) & 1))
+    return ''.join(result)
+
+
+def pattern_from_canonical(pattern: str, transform: Transform) -> str:
+    """Шаблон импликанты канонической функции в исходных переменных"""
+    perm, neg, _ = transform
+    num_vars = len(pattern)
+    result = ['-'] * num_vars
+    for k, position in enumerate(perm):
+        symbol = pattern[num_vars - 1 - k]
+        if symbol != '-':
+            result[num_vars - 1 - position] = str(int(symbol) ^ ((neg >> position) & 1))
+    return ''.join(result)
+
+
+def _position_mask(position: int, num_vars: int) -> int:
+    """Наборы, у которых разряд position номера равен единице"""
+    step = 1 << position
+    block = ((1 << step) - 1) << step
+    return block * (((1 << (1 << num_vars)) - 1) // ((1 << (2 * step)) - 1))
+
+
+def _permute_table(table: str, perm: Tuple[int, ...], neg: int, rows: int) -> int:
+    """Таблица функции g(y) = f(x(y)); table[x] — значение f на наборе x"""
+    sources = [neg] * rows
+    for y in range(1, rows):
+        lowest = y & -y
+        sources[y] = sources[y ^ lowest] ^ (1 << perm[lowest.bit_length() - 1])
+    return int(''.join(table[x] for x in reversed(sources)), 2)
+
+
+class MinimizationCache:
+    """Кэш результатов минимизации с ключом по NPN-классу функции.
+
+    Хранятся покрытия канонической функции, поэтому одна запись обслуживает
+    все функции, отличающиеся перестановкой и инверсией входов и инверсией
+    выхода. Первый уровень — LRU в памяти процесса, второй (если задан path) —
+    база SQLite на диске, общая для запусков.
+    """
+
+    def __init__(self, capacity: int = 1024, path: Optional[str] = None):
+        self.capacity = capacity
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Covers]" = OrderedDict()
+        self._last_form: Optional[Tuple[Tuple[int, int, int], Tuple[int, Transform]]] = None
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS covers (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._connection.commit()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
+
+    def lookup(self, minterms: List[int], num_vars: int, dont_cares: List[int] = ()) -> Optional[Covers]:
+        """Покрытия в переменных вызывающего или None, если функции нет в кэше"""
+        key, transform = self._lookup_key(minterms, num_vars, dont_cares)
+        covers = self._get(key)
+        if covers is None:
+            return None
+        return self._translate(covers, transform, pattern_from_canonical)
+
+    def store(self, minterms: List[int], num_vars: int, covers: Covers, dont_cares: List[int] = ()) -> None:
+        key, transform = self._lookup_key(minterms, num_vars, dont_cares)
+        self._put(key, self._translate(covers, transform, pattern_to_canonical))
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _lookup_key(self, minterms: List[int], num_vars: int, dont_cares: List[int]) -> Tuple[str, Transform]:
+        """Ключ записи (каноническая функция и ее безразличные наборы) и преобразование к ней"""
+        truth_bits = self._pack(minterms)
+        dont_care_bits = self._pack(dont_cares)
+        form_key = (truth_bits, dont_care_bits, num_vars)
+        # lookup и store для одной функции обычно следуют друг за другом
+        if self._last_form is None or self._last_form[0] != form_key:
+            self._last_form = (form_key, npn_canonical_form(truth_bits, num_vars, dont_care_bits=dont_care_bits))
+        canonical, transform = self._last_form[1]
+        key = f"{num_vars}:{canonical:x}"
+        if dont_care_bits:
+            rows = 1 << num_vars
+            table = format(dont_care_bits, f'0{rows}b')[::-1]
+            key += f":{_permute_table(table, transform[0], transform[1], rows):x}"
+        return key, transform
+
+    @staticmethod
+    def _pack(indices: List[int]) -> int:
+        bits = 0
+        for index in indices:
+            bits |= 1 << index
+        return bits
+
+    @staticmethod
+    def _translate(covers: Covers, transform: Transform, convert) -> Covers:
+        """Перенос покрытий между исходной и канонической функциями.
+
+        Инверсия выхода меняет местами единицы и нули функции, а вместе с ними
+        покрытия СДНФ и СКНФ.
+        """
+        swapped = {'sdnf': 'sknf', 'sknf': 'sdnf'} if transform[2] else {'sdnf': 'sdnf', 'sknf': 'sknf'}
+        return {form_type: {method: [convert(pattern, transform) for pattern in patterns]
+                            for method, patterns in covers[swapped[form_type]].items()}
+                for form_type in ('sdnf', 'sknf')}
+
+    def _get(self, key: str) -> Optional[Covers]:
+        covers = self._entries.get(key)
+        if covers is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return covers
+
+        if self._connection is not None:
+            row = self._connection.execute("SELECT value FROM covers WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                covers = json.loads(row[0])
+                self._remember(key, covers)
+                self.disk_hits += 1
+                return covers
+
+        self.misses += 1
+        return None
+
+    def _put(self, key: str, covers: Covers) -> None:
+        self._remember(key, covers)
+        if self._connection is not None:
+            self._connection.execute("INSERT OR REPLACE INTO covers (key, value) VALUES (?, ?)",
+                                     (key, json.dumps(covers)))
+            self._connection.commit()
+
+    def _remember(self, key: str, covers: Covers) -> None:
+        self._entries[key] = covers
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
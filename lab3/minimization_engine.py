@@ -1,19 +1,61 @@
-from typing import List, Dict, Tuple, Set
+from typing import Iterable, List, Dict, Optional, Tuple, Set
 import math
 
+from bdd import BDD
+from cost_model import CostModel
+from cover_solver import CoverSolver
+from espresso_minimizer import EspressoMinimizer
+from multi_output_minimizer import MultiOutputMinimizer
+from karnaugh_map import DONT_CARE_CELL, MAX_KARNAUGH_VARIABLES, KarnaughMap, gray_code, karnaugh_dimensions
+from instrumentation import PipelineProfiler, profile_stage
+from stage_trace import TRACE_MODES, StageTrace, finalize_stages
+
+# Импликант: (value, mask, bits) — значения неисключенных переменных,
+# маска исключенных переменных и битовое множество покрываемых наборов
+Implicant = Tuple[int, int, int]
+
 
 class MinimizationEngine:
-    def __init__(self):
+    def __init__(self, cover_time_budget: float = 1.0, espresso_effort: int = 3, trace_mode: str = "text",
+                 cost_metric: str = "literals", espresso_time_budget: Optional[float] = None):
+        """trace_mode — вид этапов в результатах: "text" (строки), "structured"
+        (StageTrace, текст строится при отображении) или "none" (без этапов);
+        cost_metric — стоимость, по которой выбираются покрытия: "literals",
+        "products" или "gates" (см. CostModel); espresso_time_budget — предел
+        времени цикла REDUCE-EXPAND-IRREDUNDANT в секундах (None — без предела)"""
+        if trace_mode not in TRACE_MODES:
+            raise ValueError(f"Неизвестный режим этапов: {trace_mode}")
+        self.trace_mode = trace_mode
+        self.cost_model = CostModel(cost_metric)
+        self.cover_solver = CoverSolver(time_budget=cover_time_budget)
+        self.espresso_minimizer = EspressoMinimizer(effort=espresso_effort, time_budget=espresso_time_budget)
+        self.multi_output_minimizer = MultiOutputMinimizer(self.cover_solver)
+        # Простые импликанты и покрытия, общие для методов одной полярности;
+        # заполняется только на время perform_all_minimizations
+        self._cover_cache: Optional[Dict[Tuple[int, int, int], Tuple[List[Implicant], List[Implicant]]]] = None
+        # Прежние и новые кубы покрытия Espresso при пошаговом пересчете (update_minimizations)
+        self._espresso_seeds: Optional[Dict[Tuple[int, int, int],
+                                            Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]]] = None
+        # Шаблоны импликант, по которым построено последнее выражение
+        self.last_cover: Optional[List[str]] = None
+        # Структурированные данные последнего метода (например, карта Карно и группы)
+        self.last_details: Optional[Dict] = None
+        # Профилировщик этапов; задается на время профилируемого вызова
+        self.profiler: Optional[PipelineProfiler] = None
         self.minimization_methods = {
             'sdnf': {
                 'calculation': self._minimize_sdnf_calculation,
                 'tabular': self._minimize_sdnf_tabular,
-                'karnaugh': self._minimize_sdnf_karnaugh
+                'karnaugh': self._minimize_sdnf_karnaugh,
+                'espresso': self._minimize_sdnf_espresso,
+                'bdd': self._minimize_sdnf_bdd
             },
             'sknf': {
                 'calculation': self._minimize_sknf_calculation,
                 'tabular': self._minimize_sknf_tabular,
-                'karnaugh': self._minimize_sknf_karnaugh
+                'karnaugh': self._minimize_sknf_karnaugh,
+                'espresso': self._minimize_sknf_espresso,
+                'bdd': self._minimize_sknf_bdd
             }
         }
 
@@ -21,239 +63,610 @@ class MinimizationEngine:
         """Выполнение всех видов минимизации"""
         sdnf_indices = truth_table_data["sdnf_numeric"]
         sknf_indices = truth_table_data["sknf_numeric"]
+        dont_cares = truth_table_data.get("dont_care_numeric", [])
         num_variables = len(variables)
+        results = self._empty_results(truth_table_data, variables)
 
-        results = {
-            "variables": variables,
-            "sdnf_results": {},
-            "sknf_results": {},
-            "truth_table_info": {
-                "total_rows": truth_table_data["total_rows"],
-                "sdnf_count": len(sdnf_indices),
-                "sknf_count": len(sknf_indices)
-            }
-        }
+        self._cover_cache = {}
+        try:
+            self._run_methods('sdnf', sdnf_indices, num_variables, variables, results["sdnf_results"], dont_cares)
+            self._run_methods('sknf', sknf_indices, num_variables, variables, results["sknf_results"], dont_cares)
+            results["incremental_state"] = self._incremental_state(
+                results, num_variables, self._indices_to_bits(sdnf_indices), self._indices_to_bits(dont_cares))
+        finally:
+            self._cover_cache = None
+
+        return results
 
-        # Минимизация СДНФ
-        for method_name, method_func in self.minimization_methods['sdnf'].items():
+    def update_minimizations(self, previous: Dict, added: Iterable[int] = (), removed: Iterable[int] = ()) -> Dict:
+        """Пересчет результатов после изменения нескольких строк таблицы истинности.
+
+        previous — результат perform_all_minimizations или update_minimizations;
+        наборы added становятся единицами функции, removed — нулями (в том
+        числе бывшие безразличные). Простые импликанты обновляются локально:
+        сохраняются те, что не задеты изменением, а новые ищутся расширением
+        только измененных наборов и наборов удаленных импликант. Покрытие
+        достраивается из сохранившихся импликант, Espresso начинает с прежнего
+        покрытия. Результат может отличаться от полного пересчета стоимостью
+        покрытия, но не функцией.
+        """
+        state = previous.get("incremental_state")
+        if state is None:
+            raise ValueError("Результат не содержит состояния для пошагового пересчета")
+        num_vars = state["num_vars"]
+        variables = previous["variables"]
+        added_bits = self._indices_to_bits(added)
+        removed_bits = self._indices_to_bits(removed)
+        if (added_bits | removed_bits) >> (1 << num_vars):
+            raise ValueError(f"Номер набора вне диапазона 0..{(1 << num_vars) - 1}")
+        if added_bits & removed_bits:
+            raise ValueError("Набор не может быть одновременно добавлен и удален")
+
+        full = (1 << (1 << num_vars)) - 1
+        on_bits = (state["on"] | added_bits) & ~removed_bits
+        dc_bits = state["dont_cares"] & ~(added_bits | removed_bits)
+        off_bits = full & ~(on_bits | dc_bits)
+        old_off = full & ~(state["on"] | state["dont_cares"])
+
+        self._cover_cache = {}
+        self._espresso_seeds = {}
+        try:
+            changes = {}
+            for form_type, old_target, target in (('sdnf', state["on"], on_bits), ('sknf', old_off, off_bits)):
+                form_state = state[form_type]
+                primes, changes[form_type] = self._update_primes(
+                    form_state["primes"], old_target | state["dont_cares"], target | dc_bits,
+                    old_target ^ target, target, num_vars)
+                key = (num_vars, target, dc_bits)
+                cover = self._update_cover(form_state["cover"], primes, target, num_vars, form_type)
+                self._cover_cache[key] = primes, cover
+                self._espresso_seeds[key] = self._update_espresso_seed(
+                    form_state["espresso"], (old_target | state["dont_cares"]) & ~(target | dc_bits), target)
+
+            sdnf_indices, sknf_indices = self._bits_to_indices(on_bits), self._bits_to_indices(off_bits)
+            dont_cares = self._bits_to_indices(dc_bits)
+            truth_table_data = {"total_rows": 1 << num_vars, "sdnf_numeric": sdnf_indices,
+                                "sknf_numeric": sknf_indices, "dont_care_numeric": dont_cares}
+            results = self._empty_results(truth_table_data, variables)
+            self._run_methods('sdnf', sdnf_indices, num_vars, variables, results["sdnf_results"], dont_cares)
+            self._run_methods('sknf', sknf_indices, num_vars, variables, results["sknf_results"], dont_cares)
+            results["incremental_state"] = self._incremental_state(results, num_vars, on_bits, dc_bits)
+            results["incremental_update"] = changes
+        finally:
+            self._cover_cache = None
+            self._espresso_seeds = None
+
+        return results
+
+    def _run_methods(self, form_type: str, terms: List[int], num_variables: int, variables: List[str],
+                     form_results: Dict, dont_cares: List[int] = None) -> None:
+        """Выполнение всех методов минимизации одной формы"""
+        for method_name, method_func in self.minimization_methods[form_type].items():
+            self.last_cover = None
+            self.last_details = None
             try:
-                minimized, stages = method_func(sdnf_indices, num_variables, variables)
-                results["sdnf_results"][method_name] = {
+                with profile_stage(self.profiler, f"{form_type}.{method_name}"):
+                    minimized, stages = method_func(terms, num_variables, variables, dont_cares)
+                form_results[method_name] = {
                     "expression": minimized,
-                    "stages": stages,
-                    "method_description": self._get_method_description('sdnf', method_name)
+                    "stages": finalize_stages(stages, self.trace_mode),
+                    "cover": self.last_cover,
+                    "cost": self.cover_cost(self.last_cover, form_type),
+                    "details": self.last_details,
+                    "method_description": self._get_method_description(form_type, method_name)
                 }
             except Exception as e:
-                results["sdnf_results"][method_name] = {
+                form_results[method_name] = {
                     "expression": f"Ошибка: {str(e)}",
-                    "stages": [["Ошибка при минимизации"]],
-                    "method_description": self._get_method_description('sdnf', method_name)
+                    "stages": finalize_stages([["Ошибка при минимизации"]], self.trace_mode),
+                    "cover": None,
+                    "cost": None,
+                    "details": None,
+                    "method_description": self._get_method_description(form_type, method_name)
                 }
 
-        # Минимизация СКНФ
-        for method_name, method_func in self.minimization_methods['sknf'].items():
-            try:
-                minimized, stages = method_func(sknf_indices, num_variables, variables)
-                results["sknf_results"][method_name] = {
-                    "expression": minimized,
-                    "stages": stages,
-                    "method_description": self._get_method_description('sknf', method_name)
-                }
-            except Exception as e:
-                results["sknf_results"][method_name] = {
-                    "expression": f"Ошибка: {str(e)}",
-                    "stages": [["Ошибка при минимизации"]],
-                    "method_description": self._get_method_description('sknf', method_name)
+    def results_from_covers(self, truth_table_data: Dict, variables: List[str], covers: Dict,
+                            note: str) -> Dict:
+        """Результаты в формате perform_all_minimizations по готовым покрытиям.
+
+        covers — {'sdnf'|'sknf': {метод: [шаблоны импликант]}}, например
+        покрытия, полученные из кэша. Для карты Карно карта и группы строятся
+        заново, поэтому этапы и данные карты те же, что и при минимизации.
+        Состояние для update_minimizations собирается из покрытий расчетного
+        метода; заново находятся только простые импликанты.
+        """
+        results = self._empty_results(truth_table_data, variables)
+        for form_type, construct in (('sdnf', self._construct_sdnf_expression),
+                                     ('sknf', self._construct_sknf_expression)):
+            for method_name in self.minimization_methods[form_type]:
+                patterns = covers[form_type][method_name]
+                if method_name == 'karnaugh':
+                    stages, details = self._karnaugh_from_cover(form_type, patterns, truth_table_data, variables, note)
+                else:
+                    stages = [[note], [f"Покрытие: {', '.join(patterns) if patterns else 'пустое'}"]]
+                    details = None
+                results[f"{form_type}_results"][method_name] = {
+                    "expression": construct([(pattern, None) for pattern in patterns], variables),
+                    "stages": finalize_stages(stages, self.trace_mode),
+                    "cover": list(patterns),
+                    "cost": self.cover_cost(patterns, form_type),
+                    "details": details,
+                    "method_description": self._get_method_description(form_type, method_name)
                 }
 
+        num_vars = len(variables)
+        dont_cares = truth_table_data.get("dont_care_numeric", [])
+        dc_bits = self._indices_to_bits(dont_cares)
+        self._cover_cache = {}
+        try:
+            for form_type, terms in (('sdnf', truth_table_data["sdnf_numeric"]),
+                                     ('sknf', truth_table_data["sknf_numeric"])):
+                if not terms:
+                    continue
+                target = self._indices_to_bits(terms)
+                primes = self._prime_implicant_masks(list(terms) + list(dont_cares), num_vars)
+                primes = [implicant for implicant in primes if implicant[2] & target]
+                cover = [(value, mask, self._implicant_cover_bits(value, mask))
+                         for value, mask in map(self._pattern_cube, covers[form_type]['calculation'])]
+                self._cover_cache[(num_vars, target, dc_bits)] = primes, cover
+            results["incremental_state"] = self._incremental_state(
+                results, num_vars, self._indices_to_bits(truth_table_data["sdnf_numeric"]), dc_bits)
+        finally:
+            self._cover_cache = None
         return results
 
+    def _karnaugh_from_cover(self, form_type: str, patterns: List[str], truth_table_data: Dict,
+                             variables: List[str], note: str) -> Tuple[List, Optional[Dict]]:
+        """Этапы и данные карты Карно для готового покрытия: выбранными
+        считаются группы карты с шаблонами покрытия"""
+        value = 1 if form_type == 'sdnf' else 0
+        num_vars = len(variables)
+        terms = truth_table_data["sdnf_numeric" if value else "sknf_numeric"]
+        dont_cares = truth_table_data.get("dont_care_numeric", [])
+        stages = [[f"Построение карты Карно для {'СДНФ' if value else 'СКНФ'}"]]
+        details = None
+        if terms and num_vars <= MAX_KARNAUGH_VARIABLES:
+            if value:
+                minterms = terms
+            else:
+                excluded = set(terms) | set(dont_cares)
+                minterms = [index for index in range(2 ** num_vars) if index not in excluded]
+            k_map, groups = self._karnaugh_groups(minterms, value, num_vars, dont_cares)
+            selected = set(patterns)
+            chosen = [index for index, group in enumerate(groups) if group["pattern"] in selected]
+            # Покрытие не из групп этой карты описывается только шаблонами
+            if len(chosen) == len(selected):
+                details = self._karnaugh_details(k_map, groups, chosen, value, variables, stages)
+        if details is None and terms:
+            stages.append([f"Покрытие: {', '.join(patterns) if patterns else 'пустое'}"])
+        stages.append([note])
+        return stages, details
+
+    @staticmethod
+    def _empty_results(truth_table_data: Dict, variables: List[str]) -> Dict:
+        return {
+            "variables": variables,
+            "sdnf_results": {},
+            "sknf_results": {},
+            "truth_table_info": {
+                "total_rows": truth_table_data["total_rows"],
+                "sdnf_count": len(truth_table_data["sdnf_numeric"]),
+                "sknf_count": len(truth_table_data["sknf_numeric"]),
+                "dont_care_count": len(truth_table_data.get("dont_care_numeric", []))
+            }
+        }
+
+    def minimize_multi_output(self, truth_tables: List[Dict], variables: List[str]) -> Dict:
+        """Совместная минимизация ДНФ нескольких функций одних переменных.
+
+        Для сравнения приводится и стоимость раздельной минимизации каждой
+        функции тем же точным методом.
+        """
+        num_vars = len(variables)
+        on_sets = [table["sdnf_numeric"] for table in truth_tables]
+        dc_sets = [table.get("dont_care_numeric", []) for table in truth_tables]
+
+        covers = self.multi_output_minimizer.minimize(on_sets, num_vars, dc_sets)
+        # Термы, используемые несколькими выходами
+        shared_cubes = {cube for i, cover in enumerate(covers) for cube in cover
+                        if any(cube in other for other in covers[i + 1:])}
+
+        outputs = []
+        for cover in covers:
+            patterns = [(self._implicant_pattern(value, mask, num_vars), None) for value, mask in cover]
+            outputs.append({
+                "expression": self._construct_sdnf_expression(patterns, variables),
+                "cover": [pattern for pattern, _ in patterns]
+            })
+
+        separate = []
+        for on_set, dc_set in zip(on_sets, dc_sets):
+            _, cover = self._compute_cover(on_set, num_vars, dc_set) if on_set else ([], [])
+            separate.append([(value, mask) for value, mask, _ in cover])
+
+        return {
+            "variables": variables,
+            "outputs": outputs,
+            "shared_terms": sorted(self._implicant_pattern(value, mask, num_vars) for value, mask in shared_cubes),
+            "cost": self.multi_output_minimizer.cost(covers, num_vars),
+            "separate_cost": self.multi_output_minimizer.cost(separate, num_vars)
+        }
+
     def _get_method_description(self, form_type: str, method: str) -> str:
         """Получение описания метода минимизации"""
         descriptions = {
             'sdnf': {
                 'calculation': 'Расчетный метод (Квайна)',
                 'tabular': 'Расчетно-табличный метод (Квайна-МакКласки)',
-                'karnaugh': 'Карта Карно'
+                'karnaugh': 'Карта Карно',
+                'espresso': 'Эвристический метод (Espresso)',
+                'bdd': 'Неприводимая ДНФ по BDD (Минато–Морреале)'
             },
             'sknf': {
                 'calculation': 'Расчетный метод (Квайна)',
                 'tabular': 'Расчетно-табличный метод (Квайна-МакКласки)',
-                'karnaugh': 'Карта Карно'
+                'karnaugh': 'Карта Карно',
+                'espresso': 'Эвристический метод (Espresso)',
+                'bdd': 'Неприводимая КНФ по BDD дополнения (Минато–Морреале)'
             }
         }
         return descriptions[form_type][method]
 
-    def _minimize_sdnf_calculation(self, minterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
+    def _minimize_sdnf_calculation(self, minterms: List[int], num_vars: int, variables: List[str],
+                                   dont_cares: List[int] = None) -> Tuple[str, List]:
         """Улучшенный расчетный метод минимизации СДНФ"""
+        dont_cares = dont_cares or []
         if not minterms:
-            return "Ложь", [["Нет истинных значений"]]
+            return self._construct_sdnf_expression([], variables), [["Нет истинных значений"]]
 
-        if len(minterms) == 2 ** num_vars:
-            return "Истина", [["Все значения истинны"]]
+        if len(minterms) + len(dont_cares) == 2 ** num_vars:
+            return self._construct_sdnf_expression([('-' * num_vars, None)], variables), [["Все значения истинны"]]
 
-        # Находим простые импликанты
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
+        # Находим простые импликанты и покрытие
+        prime_implicants, essential_primes = self._compute_cover(minterms, num_vars, dont_cares)
 
-        # Находим существенные импликанты
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
-
-        stages = self._build_calculation_stages(prime_implicants, essential_primes, minterms)
-        expression = self._construct_sdnf_expression(essential_primes, variables)
+        stages = self._build_calculation_stages(prime_implicants, essential_primes, minterms, num_vars,
+                                                dont_cares=dont_cares)
+        expression = self._construct_sdnf_expression(
+            self._cube_patterns([(value, mask) for value, mask, _ in essential_primes], num_vars), variables)
 
         return expression, stages
 
-    def _minimize_sknf_calculation(self, maxterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
+    def _minimize_sknf_calculation(self, maxterms: List[int], num_vars: int, variables: List[str],
+                                   dont_cares: List[int] = None) -> Tuple[str, List]:
         """Улучшенный расчетный метод минимизации СКНФ"""
+        dont_cares = dont_cares or []
         if not maxterms:
-            return "Истина", [["Нет ложных значений"]]
+            return self._construct_sknf_expression([], variables), [["Нет ложных значений"]]
 
-        if len(maxterms) == 2 ** num_vars:
-            return "Ложь", [["Все значения ложны"]]
+        if len(maxterms) + len(dont_cares) == 2 ** num_vars:
+            return self._construct_sknf_expression([('-' * num_vars, None)], variables), [["Все значения ложны"]]
 
-        minterms = [i for i in range(2 ** num_vars) if i not in maxterms]
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
+        # Склеиваются нули функции: каждая импликанта дает дизъюнкцию
+        prime_implicants, essential_primes = self._compute_cover(maxterms, num_vars, dont_cares, 'sknf')
 
-        stages = self._build_calculation_stages(prime_implicants, essential_primes, minterms)
-        expression = self._construct_sknf_expression(essential_primes, variables)
+        stages = self._build_calculation_stages(prime_implicants, essential_primes, maxterms, num_vars,
+                                                "Исходные макстермы", dont_cares)
+        expression = self._construct_sknf_expression(
+            self._cube_patterns([(value, mask) for value, mask, _ in essential_primes], num_vars), variables)
 
         return expression, stages
 
+    def _compute_cover(self, minterms: List[int], num_vars: int, dont_cares: List[int] = None,
+                       form_type: str = 'sdnf') -> Tuple[List[Implicant], List[Implicant]]:
+        """Простые импликанты и выбранное из них покрытие наборов минимальной стоимости.
+
+        Безразличные наборы участвуют в склеивании, но покрывать их не нужно;
+        импликанты, покрывающие только безразличные наборы, отбрасываются.
+        form_type определяет инверсные литералы для метрики "gates".
+        """
+        target = self._indices_to_bits(minterms)
+        dont_cares = dont_cares or []
+        key = (num_vars, target, self._indices_to_bits(dont_cares))
+        if self._cover_cache is not None and key in self._cover_cache:
+            if self.profiler is not None:
+                self.profiler.count("cover_cache_hits")
+            return self._cover_cache[key]
+
+        with profile_stage(self.profiler, "prime_implicants"):
+            prime_implicants = self._prime_implicant_masks(list(minterms) + list(dont_cares), num_vars)
+            if dont_cares:
+                prime_implicants = [implicant for implicant in prime_implicants if implicant[2] & target]
+        with profile_stage(self.profiler, "cover"):
+            cover_indices = self._select_cover([bits for _, _, bits in prime_implicants], target,
+                                               self._implicant_costs(prime_implicants, num_vars, form_type))
+        result = prime_implicants, [prime_implicants[i] for i in cover_indices]
+        if self._cover_cache is not None:
+            self._cover_cache[key] = result
+        return result
+
+    def _incremental_state(self, results: Dict, num_vars: int, on_bits: int, dc_bits: int) -> Dict:
+        """Данные для update_minimizations: наборы, простые импликанты и покрытия обеих форм"""
+        off_bits = ((1 << (1 << num_vars)) - 1) & ~(on_bits | dc_bits)
+        state = {"num_vars": num_vars, "on": on_bits, "dont_cares": dc_bits}
+        for form_type, target in (('sdnf', on_bits), ('sknf', off_bits)):
+            primes, cover = self._cover_cache.get((num_vars, target, dc_bits), ([], []))
+            espresso_cover = results[f"{form_type}_results"].get("espresso", {}).get("cover") or []
+            state[form_type] = {"primes": primes, "cover": cover,
+                                "espresso": [self._pattern_cube(pattern) for pattern in espresso_cover]}
+        return state
+
+    def _update_primes(self, primes: List[Implicant], old_inside: int, inside: int, changed: int, target: int,
+                       num_vars: int) -> Tuple[List[Implicant], Dict[str, int]]:
+        """Простые импликанты множества inside по простым импликантам old_inside.
+
+        Новая простая импликанта содержит либо добавленный набор, либо набор
+        удаленной импликанты, либо набор, сменивший значение (changed): иначе
+        она была бы простой и раньше. Прежняя импликанта сохраняется, если не
+        содержит исключенных наборов и не поглощена новой. Возвращаются только
+        импликанты, покрывающие хотя бы один набор target.
+        """
+        excluded = old_inside & ~inside
+        kept, dropped = [], []
+        for implicant in primes:
+            (dropped if implicant[2] & excluded else kept).append(implicant)
+
+        affected = (inside & ~old_inside) | (changed & inside)
+        for _, _, bits in dropped:
+            affected |= bits & inside
+        found = set()
+        for point in self._bits_to_indices(affected):
+            found.update(self._primes_containing(point, inside, num_vars))
+
+        result = {cube: self._implicant_cover_bits(*cube) for cube in found}
+        # Поглотить прежнюю импликанту может только новая, содержащая добавленный набор
+        wider_cubes = [cube for cube, bits in result.items() if bits & inside & ~old_inside]
+        wider_bits = 0
+        for cube in wider_cubes:
+            wider_bits |= result[cube]
+        kept = [(value, mask, bits) for value, mask, bits in kept
+                if bits & ~wider_bits or not any(mask & ~wider == 0 and mask != wider
+                                                 and (value ^ wide_value) & ~wider == 0
+                                                 for wide_value, wider in wider_cubes)]
+        result.update(((value, mask), bits) for value, mask, bits in kept)
+        updated = [(value, mask, bits) for (value, mask), bits in sorted(result.items()) if bits & target]
+        return updated, {"kept_primes": len(kept), "dropped_primes": len(primes) - len(kept),
+                         "expanded_points": affected.bit_count(), "primes": len(updated)}
+
+    def _primes_containing(self, point: int, inside: int, num_vars: int) -> List[Tuple[int, int]]:
+        """Все простые импликанты множества inside, содержащие набор point.
+
+        Маски кубов, содержащих point, перебираются по уровням: куб
+        расширяется по переменной, если его зеркальная половина лежит в inside.
+        """
+        full = (1 << num_vars) - 1
+        level, rejected, primes = {0}, set(), []
+        while level:
+            next_level = set()
+            for mask in level:
+                grown = False
+                free = full & ~mask
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    wider = mask | bit
+                    if wider in next_level:
+                        grown = True
+                    elif wider not in rejected:
+                        if self._implicant_cover_bits((point ^ bit) & ~mask, mask) & ~inside:
+                            rejected.add(wider)
+                        else:
+                            next_level.add(wider)
+                            grown = True
+                if not grown:
+                    primes.append((point & ~mask, mask))
+            level = next_level
+        return primes
+
+    def _update_cover(self, cover: List[Implicant], primes: List[Implicant], target: int,
+                      num_vars: int, form_type: str = 'sdnf') -> List[Implicant]:
+        """Покрытие target: прежние импликанты, оставшиеся простыми, и добор для непокрытых наборов"""
+        prime_keys = {(value, mask) for value, mask, _ in primes}
+        chosen = [implicant for implicant in cover if implicant[:2] in prime_keys]
+        uncovered = target
+        for _, _, bits in chosen:
+            uncovered &= ~bits
+        if uncovered:
+            candidates = [implicant for implicant in primes if implicant[2] & uncovered]
+            cover_indices = self._select_cover([bits & uncovered for _, _, bits in candidates], uncovered,
+                                               self._implicant_costs(candidates, num_vars, form_type))
+            chosen.extend(candidates[i] for i in cover_indices)
+
+        # Прежние импликанты могли стать избыточными: удаляются, начиная с самых дорогих;
+        # объединение остальных — уже оставленные и еще не просмотренные
+        chosen.sort(key=lambda implicant: implicant[1].bit_count())
+        suffix = [0] * (len(chosen) + 1)
+        for index in range(len(chosen) - 1, -1, -1):
+            suffix[index] = suffix[index + 1] | chosen[index][2]
+        irredundant, covered = [], 0
+        for index, implicant in enumerate(chosen):
+            if implicant[2] & target & ~(covered | suffix[index + 1]):
+                irredundant.append(implicant)
+                covered |= implicant[2]
+        return sorted(irredundant)
+
+    def _update_espresso_seed(self, cubes: List[Tuple[int, int]], excluded: int,
+                              target: int) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Прежние кубы Espresso, не задетые изменением, и новые: части задетых кубов
+        без исключенных наборов и непокрытые наборы target"""
+        kept, added = [], []
+        uncovered = target
+        for value, mask in cubes:
+            bits = self._implicant_cover_bits(value, mask)
+            uncovered &= ~bits
+            if not bits & excluded:
+                kept.append((value, mask))
+                continue
+            pieces = [(value, mask)]
+            for point in self._bits_to_indices(bits & excluded):
+                pieces = [piece for cube in pieces for piece in self._sharp_point(cube, point)]
+            added.extend(pieces)
+        return kept, added + [(point, 0) for point in self._bits_to_indices(uncovered)]
+
+    @staticmethod
+    def _sharp_point(cube: Tuple[int, int], point: int) -> List[Tuple[int, int]]:
+        """Куб без набора point в виде непересекающихся подкубов"""
+        value, mask = cube
+        if (value ^ point) & ~mask:
+            return [cube]
+        pieces = []
+        fixed = 0
+        free = mask
+        while free:
+            bit = free & -free
+            free ^= bit
+            pieces.append((value | (point & fixed) | (bit & ~point), mask & ~(fixed | bit)))
+            fixed |= bit
+        return pieces
+
+    @staticmethod
+    def _pattern_cube(pattern: str) -> Tuple[int, int]:
+        """Куб (value, mask) по шаблону вида '01-1'"""
+        value = int(pattern.replace('-', '0'), 2) if pattern else 0
+        mask = int(pattern.replace('1', '0').replace('-', '1'), 2) if pattern else 0
+        return value, mask
+
+    def _prime_implicant_masks(self, minterms: List[int], num_vars: int) -> List[Implicant]:
+        """Алгоритм Квайна-МакКласки на целочисленных парах (value, mask).
+
+        Биты mask — исключенные переменные ('-'), в value они всегда равны нулю.
+        Термы склеиваются, если различаются ровно одним битом при равных масках;
+        партнер ищется в хэш-множестве текущего раунда, дубликаты отсекаются сразу.
+        """
+        full = (1 << num_vars) - 1
+        current = {(m, 0) for m in minterms}
+        primes = []
+
+        while current:
+            if self.profiler is not None:
+                self.profiler.append("implicants_per_round", len(current))
+                self.profiler.count("merge_comparisons",
+                                    sum((full & ~(value | mask)).bit_count() for value, mask in current))
+            merged = set()
+            next_round = set()
+            for value, mask in current:
+                free = full & ~(value | mask)
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    partner = (value | bit, mask)
+                    if partner in current:
+                        next_round.add((value, mask | bit))
+                        merged.add((value, mask))
+                        merged.add(partner)
+            primes.extend(current - merged)
+            current = next_round
+
+        primes.sort()
+        if self.profiler is not None:
+            self.profiler.set("primes", len(primes))
+        return [(value, mask, self._implicant_cover_bits(value, mask)) for value, mask in primes]
+
     def _quine_mccluskey(self, minterms: List[int], num_vars: int) -> List[Tuple[str, Set[int]]]:
-        """Реализация алгоритма Квайна-МакКласки для нахождения простых импликант"""
+        """Простые импликанты в виде пар (шаблон '01-1', множество минтермов)"""
         if not minterms:
             return []
+        return self._as_patterns(self._prime_implicant_masks(minterms, num_vars), num_vars)
 
-        # Группируем минтермы по количеству единиц
-        groups = {}
-        for minterm in minterms:
-            binary = format(minterm, f'0{num_vars}b')
-            ones_count = binary.count('1')
-            if ones_count not in groups:
-                groups[ones_count] = []
-            groups[ones_count].append((binary, {minterm}))
-
-        prime_implicants = []
-        used = set()
-
-        # Многократное объединение пока это возможно
-        while True:
-            new_groups = {}
-            merged_any = False
-
-            keys = sorted(groups.keys())
-            for i in range(len(keys) - 1):
-                group1 = groups[keys[i]]
-                group2 = groups[keys[i + 1]]
-
-                for term1, set1 in group1:
-                    for term2, set2 in group2:
-                        # Проверяем можно ли объединить
-                        diff_positions = []
-                        for k in range(num_vars):
-                            if term1[k] != term2[k]:
-                                diff_positions.append(k)
-
-                        if len(diff_positions) == 1:
-                            # Объединяем
-                            pos = diff_positions[0]
-                            new_term = term1[:pos] + '-' + term1[pos + 1:]
-                            new_set = set1.union(set2)
-
-                            ones_count = new_term.count('1')
-                            if ones_count not in new_groups:
-                                new_groups[ones_count] = []
-                            new_groups[ones_count].append((new_term, new_set))
-
-                            used.add(term1)
-                            used.add(term2)
-                            merged_any = True
-
-            # Добавляем необъединенные термины в простые импликанты
-            for group in groups.values():
-                for term, term_set in group:
-                    if term not in used:
-                        prime_implicants.append((term, term_set))
-
-            if not merged_any:
-                break
-
-            groups = new_groups
-
-        # Удаляем дубликаты
-        unique_primes = []
-        seen_terms = set()
-        for term, term_set in prime_implicants:
-            if term not in seen_terms:
-                unique_primes.append((term, term_set))
-                seen_terms.add(term)
-
-        return unique_primes
-
-    def _find_essential_primes(self, prime_implicants: List[Tuple[str, Set[int]]], minterms: List[int]) -> List[Tuple[str, Set[int]]]:
-        """Нахождение существенных простых импликант"""
+    def _find_essential_primes(self, prime_implicants: List[Tuple[str, Set[int]]], minterms: List[int],
+                               form_type: str = 'sdnf') -> List[Tuple[str, Set[int]]]:
+        """Нахождение существенных простых импликант и покрытия оставшихся минтермов"""
         if not prime_implicants or not minterms:
             return []
 
-        minterm_set = set(minterms)
-        coverage = {m: [] for m in minterm_set}
-
-        # Заполняем покрытие для каждого минтерма
-        for implicant in prime_implicants:
-            pattern, covered = implicant
-            for m in covered:
-                if m in coverage:
-                    coverage[m].append(implicant)
-
-        essential_primes = []
-        covered_minterms = set()
-
-        # Находим импликанты, покрывающие уникальные минтермы
-        for m, implicants in coverage.items():
-            if len(implicants) == 1:  # Минтерм покрыт только одной импликантой
-                essential = implicants[0]
-                if essential not in essential_primes:
-                    essential_primes.append(essential)
-                    covered_minterms.update(essential[1])
-
-        # Покрываем оставшиеся минтермы минимальным количеством импликант
-        remaining_minterms = minterm_set - covered_minterms
-        remaining_implicants = [imp for imp in prime_implicants if imp not in essential_primes]
-
-        while remaining_minterms:
-            # Выбираем импликант, который покрывает больше всего оставшихся минтермов
-            best_implicant = None
-            best_coverage = 0
-
-            for implicant in remaining_implicants:
-                pattern, covered = implicant
-                coverage_count = len(covered.intersection(remaining_minterms))
-                if coverage_count > best_coverage:
-                    best_coverage = coverage_count
-                    best_implicant = implicant
-
-            if best_implicant:
-                essential_primes.append(best_implicant)
-                covered_minterms.update(best_implicant[1])
-                remaining_implicants.remove(best_implicant)
-            else:
-                break
+        covers = [self._indices_to_bits(covered) for _, covered in prime_implicants]
+        costs = self.cost_model.weights([self._pattern_cube(pattern) for pattern, _ in prime_implicants],
+                                        len(prime_implicants[0][0]), form_type)
+        cover_indices = self._select_cover(covers, self._indices_to_bits(minterms), costs)
+        return [prime_implicants[i] for i in cover_indices]
+
+    def _select_cover(self, covers: List[int], target: int, costs: List[int] = None) -> List[int]:
+        """Покрытие минимальной стоимости (по умолчанию — по числу строк).
+
+        Точный перебор ограничен по времени, после чего используется лучшее
+        найденное решение, не хуже жадного.
+        """
+        chosen = self.cover_solver.solve(covers, target, costs)
+        if self.profiler is not None:
+            self.profiler.set("rows", len(covers))
+            self.profiler.set("columns", target.bit_count())
+            self.profiler.set("chosen", len(chosen))
+            self.profiler.set("search_nodes", self.cover_solver.last_nodes)
+            self.profiler.set("exact", self.cover_solver.last_solution_exact)
+        return chosen
+
+    def _as_patterns(self, implicants: List[Implicant], num_vars: int) -> List[Tuple[str, Set[int]]]:
+        """Преобразование импликант (value, mask, bits) в пары (шаблон, множество минтермов)"""
+        return [(self._implicant_pattern(value, mask, num_vars), set(self._bits_to_indices(bits)))
+                for value, mask, bits in implicants]
+
+    @staticmethod
+    def _implicant_pattern(value: int, mask: int, num_vars: int) -> str:
+        return ''.join('-' if (mask >> bit) & 1 else str((value >> bit) & 1)
+                       for bit in range(num_vars - 1, -1, -1))
+
+    @staticmethod
+    def _implicant_cover_bits(value: int, mask: int) -> int:
+        """Битовое множество минтермов, покрываемых импликантом"""
+        bits = 1 << value
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            bits |= bits << bit
+        return bits
+
+    @staticmethod
+    def _indices_to_bits(indices) -> int:
+        """Битовое множество из списка номеров наборов (через строку — линейно по размеру)"""
+        indices = list(indices)
+        if not indices:
+            return 0
+        top = max(indices)
+        digits = bytearray(b'0' * (top + 1))
+        for index in indices:
+            digits[top - index] = ord('1')
+        return int(digits, 2)
+
+    @staticmethod
+    def _bits_to_indices(bits: int) -> List[int]:
+        return [i for i, digit in enumerate(reversed(format(bits, 'b'))) if digit == '1']
+
+    def _build_calculation_stages(self, prime_implicants: List[Implicant], essential_primes: List[Implicant],
+                                  minterms: List[int], num_vars: int, terms_title: str = "Исходные минтермы",
+                                  dont_cares: List[int] = None) -> List[StageTrace]:
+        """Этапы расчетного метода; строки с импликантами строятся только при отображении"""
+        stages = [StageTrace("terms", lambda: [f"{terms_title}: {list(minterms)}"],
+                             title=terms_title, terms=minterms)]
+        if dont_cares:
+            stages.append(StageTrace("dont_cares", lambda: [f"Безразличные наборы: {list(dont_cares)}"],
+                                     dont_cares=dont_cares))
+        stages.append(StageTrace(
+            "prime_implicants",
+            lambda: [self._format_implicants("Найдены простые импликанты", prime_implicants, num_vars)],
+            cubes=[(value, mask) for value, mask, _ in prime_implicants], num_vars=num_vars))
+        stages.append(StageTrace(
+            "essential_implicants",
+            lambda: [self._format_implicants("Существенные импликанты", essential_primes, num_vars)],
+            cubes=[(value, mask) for value, mask, _ in essential_primes], num_vars=num_vars))
+        return stages
 
-            remaining_minterms = minterm_set - covered_minterms
+    def _implicant_costs(self, implicants: List[Implicant], num_vars: int, form_type: str) -> List[int]:
+        return self.cost_model.weights([(value, mask) for value, mask, _ in implicants], num_vars, form_type)
 
-        return essential_primes
+    def cover_cost(self, patterns: Optional[List[str]], form_type: str) -> Optional[Dict]:
+        """Стоимость покрытия, заданного шаблонами импликант, по модели стоимости"""
+        if patterns is None:
+            return None
+        num_vars = len(patterns[0]) if patterns else 0
+        return self.cost_model.evaluate([self._pattern_cube(pattern) for pattern in patterns], num_vars, form_type)
 
-    def _build_calculation_stages(self, prime_implicants: List[Tuple[str, Set[int]]], essential_primes: List[Tuple[str, Set[int]]], minterms: List[int]) -> List[List[str]]:
-        """Построение этапов минимизации для расчетного метода"""
-        stages = []
-        stages.append([f"Исходные минтермы: {minterms}"])
-        stages.append([f"Найдены простые импликанты:; " + "; ".join([f"{pattern} -> {list(covered)}" for pattern, covered in prime_implicants])])
-        stages.append([f"Существенные импликанты:; " + "; ".join([f"{pattern} -> {list(covered)}" for pattern, covered in essential_primes])])
-        return stages
+    def _format_implicants(self, title: str, implicants: List[Implicant], num_vars: int) -> str:
+        return f"{title}:; " + "; ".join(f"{pattern} -> {list(covered)}"
+                                         for pattern, covered in self._as_patterns(implicants, num_vars))
 
     def _construct_sdnf_expression(self, implicants: List[Tuple[str, Set[int]]], variables: List[str]) -> str:
         """Построение СДНФ выражения из импликант"""
+        self.last_cover = [pattern for pattern, _ in implicants]
         if not implicants:
             return "Ложь"
 
@@ -265,11 +678,10 @@ class MinimizationEngine:
                     term_parts.append(variables[i])
                 elif bit == '0':
                     term_parts.append(f"!{variables[i]}")
-            if term_parts:
-                terms.append(" & ".join(term_parts))
-
-        if not terms:
-            return "Ложь"
+            if not term_parts:
+                # Импликанта без литералов покрывает все наборы
+                return "Истина"
+            terms.append(" & ".join(term_parts))
 
         if len(terms) == 1:
             return terms[0]
@@ -277,6 +689,7 @@ class MinimizationEngine:
 
     def _construct_sknf_expression(self, implicants: List[Tuple[str, Set[int]]], variables: List[str]) -> str:
         """Построение СКНФ выражения из импликант"""
+        self.last_cover = [pattern for pattern, _ in implicants]
         if not implicants:
             return "Истина"
 
@@ -288,119 +701,276 @@ class MinimizationEngine:
                     term_parts.append(variables[i])
                 elif bit == '1':
                     term_parts.append(f"!{variables[i]}")
-            if term_parts:
-                terms.append(" | ".join(term_parts))
-
-        if not terms:
-            return "Истина"
+            if not term_parts:
+                # Пустая дизъюнкция: функция тождественно ложна
+                return "Ложь"
+            terms.append(" | ".join(term_parts))
 
         if len(terms) == 1:
             return terms[0]
         return " & ".join([f"({term})" for term in terms])
 
-    def _minimize_sdnf_tabular(self, minterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
+    def _minimize_sdnf_tabular(self, minterms: List[int], num_vars: int, variables: List[str],
+                               dont_cares: List[int] = None) -> Tuple[str, List]:
         """Упрощенный табличный метод для СДНФ"""
         stages = [["Табличный метод минимизации СДНФ"]]
 
         if not minterms:
-            return "Ложь", stages
+            return self._construct_sdnf_expression([], variables), stages
 
         # Используем тот же алгоритм что и для расчетного метода
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
+        prime_implicants, essential_primes = self._compute_cover(minterms, num_vars, dont_cares)
 
         stages.append([f"Найдено простых импликант: {len(prime_implicants)}"])
         stages.append([f"Существенных импликант: {len(essential_primes)}"])
 
-        expression = self._construct_sdnf_expression(essential_primes, variables)
+        expression = self._construct_sdnf_expression(self._as_patterns(essential_primes, num_vars), variables)
         return expression, stages
 
-    def _minimize_sknf_tabular(self, maxterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
+    def _minimize_sknf_tabular(self, maxterms: List[int], num_vars: int, variables: List[str],
+                               dont_cares: List[int] = None) -> Tuple[str, List]:
         """Упрощенный табличный метод для СКНФ"""
         stages = [["Табличный метод минимизации СКНФ"]]
 
         if not maxterms:
-            return "Истина", stages
+            return self._construct_sknf_expression([], variables), stages
 
-        minterms = [i for i in range(2 ** num_vars) if i not in maxterms]
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
+        prime_implicants, essential_primes = self._compute_cover(maxterms, num_vars, dont_cares, 'sknf')
 
         stages.append([f"Найдено простых импликант: {len(prime_implicants)}"])
         stages.append([f"Существенных импликант: {len(essential_primes)}"])
 
-        expression = self._construct_sknf_expression(essential_primes, variables)
+        expression = self._construct_sknf_expression(self._as_patterns(essential_primes, num_vars), variables)
         return expression, stages
 
-    def _minimize_sdnf_karnaugh(self, minterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
-        """Улучшенная минимизация СДНФ с помощью карт Карно"""
+    def _minimize_sdnf_karnaugh(self, minterms: List[int], num_vars: int, variables: List[str],
+                                dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Минимизация СДНФ по карте Карно: группы единиц"""
         stages = [["Построение карты Карно для СДНФ"]]
 
         if not minterms:
-            return "Ложь", stages
-
-        # Используем тот же алгоритм Квайна-МакКласки для получения групп
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
+            return self._construct_sdnf_expression([], variables), stages
 
-        stages.append(["Карта Карно построена (используется алгоритм Квайна для групп)"])
-        stages.append([f"Найдено групп: {len(essential_primes)}"])
-
-        expression = self._construct_sdnf_expression(essential_primes, variables)
-        return expression, stages
+        patterns = self._karnaugh_cover(minterms, minterms, 1, num_vars, variables, stages, dont_cares)
+        return self._construct_sdnf_expression(patterns, variables), stages
 
-    def _minimize_sknf_karnaugh(self, maxterms: List[int], num_vars: int, variables: List[str]) -> Tuple[str, List]:
-        """Улучшенная минимизация СКНФ с помощью карт Карно"""
+    def _minimize_sknf_karnaugh(self, maxterms: List[int], num_vars: int, variables: List[str],
+                                dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Минимизация СКНФ по карте Карно: группы нулей"""
         stages = [["Построение карты Карно для СКНФ"]]
 
         if not maxterms:
-            return "Истина", stages
-
-        minterms = [i for i in range(2 ** num_vars) if i not in maxterms]
-        prime_implicants = self._quine_mccluskey(minterms, num_vars)
-        essential_primes = self._find_essential_primes(prime_implicants, minterms)
+            return self._construct_sknf_expression([], variables), stages
+
+        excluded = set(maxterms) | set(dont_cares or [])
+        minterms = [index for index in range(2 ** num_vars) if index not in excluded]
+        patterns = self._karnaugh_cover(minterms, maxterms, 0, num_vars, variables, stages, dont_cares)
+        return self._construct_sknf_expression(patterns, variables), stages
+
+    def _karnaugh_cover(self, minterms: List[int], terms: List[int], value: int, num_vars: int,
+                        variables: List[str], stages: List, dont_cares: List[int] = None) -> List[Tuple[str, None]]:
+        """Выбор групп клеток со значением value, покрывающих наборы terms"""
+        form_type = 'sdnf' if value else 'sknf'
+        if num_vars > MAX_KARNAUGH_VARIABLES:
+            stages.append([f"Карта Карно строится не более чем для {MAX_KARNAUGH_VARIABLES} переменных, "
+                           f"группы найдены алгоритмом Квайна"])
+            _, cover = self._compute_cover(terms, num_vars, dont_cares, form_type)
+            stages.append([f"Найдено групп: {len(cover)}"])
+            return self._cube_patterns([(v, mask) for v, mask, _ in cover], num_vars)
+
+        with profile_stage(self.profiler, "karnaugh_groups"):
+            k_map, groups = self._karnaugh_groups(minterms, value, num_vars, dont_cares)
+            if self.profiler is not None:
+                self.profiler.set("groups", len(groups))
+        with profile_stage(self.profiler, "cover"):
+            chosen = self._select_cover([self._implicant_cover_bits(group["value"], group["mask"])
+                                         for group in groups],
+                                        self._indices_to_bits(terms),
+                                        self.cost_model.weights([(group["value"], group["mask"]) for group in groups],
+                                                                num_vars, form_type))
+
+        self.last_details = self._karnaugh_details(k_map, groups, chosen, value, variables, stages)
+        return [(groups[i]["pattern"], None) for i in chosen]
+
+    def _karnaugh_groups(self, minterms: List[int], value: int, num_vars: int,
+                         dont_cares: List[int] = None) -> Tuple[KarnaughMap, List[Dict]]:
+        """Карта Карно функции и все группы клеток со значением value"""
+        k_map = KarnaughMap(self._build_karnaugh_map(minterms, num_vars, dont_cares), num_vars)
+        return k_map, k_map.groups(value, DONT_CARE_CELL)
+
+    @staticmethod
+    def _karnaugh_details(k_map: KarnaughMap, groups: List[Dict], chosen: List[int], value: int,
+                          variables: List[str], stages: List) -> Dict:
+        """Этапы с описанием карты и выбранных групп и данные карты для отображения"""
+        layer_count, row_count, column_count = len(k_map.layer_codes), len(k_map.row_codes), len(k_map.column_codes)
+        size = f"{row_count}×{column_count}" if layer_count == 1 else f"{layer_count} слоя {row_count}×{column_count}"
+        stages.append([f"Карта {size}: слои — {''.join(variables[:k_map.layer_bits]) or 'нет'}, "
+                       f"строки — {''.join(variables[k_map.layer_bits:k_map.layer_bits + k_map.row_bits]) or 'нет'}, "
+                       f"столбцы — {''.join(variables[k_map.layer_bits + k_map.row_bits:]) or 'нет'}"])
+        stages.append([f"Найдено групп: {len(groups)}"])
+        stages.append([f"Выбрано групп: {len(chosen)}; " + "; ".join(groups[i]["pattern"] for i in chosen)])
+
+        return {
+            "karnaugh_map": {
+                "layer_variables": variables[:k_map.layer_bits],
+                "row_variables": variables[k_map.layer_bits:k_map.layer_bits + k_map.row_bits],
+                "column_variables": variables[k_map.layer_bits + k_map.row_bits:],
+                "layer_codes": k_map.layer_codes,
+                "row_codes": k_map.row_codes,
+                "column_codes": k_map.column_codes,
+                "grid": k_map.grid,
+                "value": value,
+                "groups": groups,
+                "selected": chosen
+            }
+        }
 
-        stages.append(["Карта Карно построена (используется алгоритм Квайна для групп)"])
-        stages.append([f"Найдено групп: {len(essential_primes)}"])
+    def _minimize_sdnf_espresso(self, minterms: List[int], num_vars: int, variables: List[str],
+                                dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Эвристическая минимизация СДНФ (Espresso)"""
+        if not minterms:
+            return self._construct_sdnf_expression([], variables), [["Нет истинных значений"]]
 
-        expression = self._construct_sknf_expression(essential_primes, variables)
+        cubes, stages = self._espresso_cover(minterms, num_vars, dont_cares, 'sdnf')
+        expression = self._construct_sdnf_expression(self._cube_patterns(cubes, num_vars), variables)
         return expression, stages
 
-    def _build_karnaugh_map(self, minterms: List[int], num_vars: int) -> List[List[int]]:
-        """Построение карты Карно"""
-        if num_vars == 0:
-            return [[]]
-
-        if num_vars == 1:
-            return [[1 if 0 in minterms else 0, 1 if 1 in minterms else 0]]
-
-        rows = 2 ** (num_vars // 2)
-        cols = 2 ** ((num_vars + 1) // 2)
-        k_map = [[0 for _ in range(cols)] for _ in range(rows)]
-
-        gray_code = self._generate_gray_code(max(rows, cols))
+    def _minimize_sknf_espresso(self, maxterms: List[int], num_vars: int, variables: List[str],
+                                dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Эвристическая минимизация СКНФ (Espresso): покрываются нули функции"""
+        if not maxterms:
+            return self._construct_sknf_expression([], variables), [["Нет ложных значений"]]
 
-        for minterm in minterms:
-            if minterm < rows * cols:
-                row_idx = (minterm // cols)
-                col_idx = (minterm % cols)
+        cubes, stages = self._espresso_cover(maxterms, num_vars, dont_cares, 'sknf')
+        expression = self._construct_sknf_expression(self._cube_patterns(cubes, num_vars), variables)
+        return expression, stages
 
-                # Преобразуем в Gray code
-                row_gray = gray_code[row_idx] if row_idx < len(gray_code) else row_idx
-                col_gray = gray_code[col_idx] if col_idx < len(gray_code) else col_idx
+    def _espresso_cover(self, terms: List[int], num_vars: int, dont_cares: List[int] = None,
+                        form_type: str = 'sdnf') -> Tuple[List[Tuple[int, int]], List]:
+        """Покрытие наборов кубами методом Espresso и этапы для отображения.
+
+        Итерации сравнивают покрытия по модели стоимости движка.
+        """
+        seed = None
+        if self._espresso_seeds is not None:
+            seed = self._espresso_seeds.get((num_vars, self._indices_to_bits(terms),
+                                             self._indices_to_bits(dont_cares or [])))
+        dc_set = [(index, 0) for index in dont_cares or []]
+        with profile_stage(self.profiler, "espresso"):
+            if seed is None:
+                initial = len(terms)
+                cubes = self.espresso_minimizer.minimize(
+                    [(term, 0) for term in terms], num_vars, dc_set=dc_set,
+                    objective=lambda cover, n: self.cost_model.key(cover, n, form_type))
+            else:
+                initial = len(seed[0]) + len(seed[1])
+                cubes = self.espresso_minimizer.update(seed[0], seed[1], num_vars, dc_set=dc_set)
+        cube_count, literal_count = self.espresso_minimizer.cost(cubes, num_vars)
+        if self.profiler is not None:
+            self.profiler.set("espresso_iterations", self.espresso_minimizer.last_iterations)
+            self.profiler.set("cubes", cube_count)
+        stages = [
+            ["Эвристическая минимизация (Espresso)"],
+            [f"Исходных кубов: {initial}"],
+            [f"Итераций REDUCE-EXPAND-IRREDUNDANT: {self.espresso_minimizer.last_iterations}"],
+            [f"Кубов в покрытии: {cube_count}, литералов: {literal_count}"]
+        ]
+        return cubes, stages
+
+    def _minimize_sdnf_bdd(self, minterms: List[int], num_vars: int, variables: List[str],
+                           dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Неприводимая ДНФ по BDD функции (Минато–Морреале)"""
+        bdd = BDD(num_vars)
+        on_set = bdd.from_bits(self._indices_to_bits(minterms))
+        dc_set = bdd.from_bits(self._indices_to_bits(dont_cares or []))
+        cubes, stages = self._bdd_cover(bdd, on_set, bdd.apply('|', on_set, dc_set), num_vars)
+        return self._construct_sdnf_expression(self._cube_patterns(cubes, num_vars), variables), stages
+
+    def _minimize_sknf_bdd(self, maxterms: List[int], num_vars: int, variables: List[str],
+                           dont_cares: List[int] = None) -> Tuple[str, List]:
+        """Неприводимая КНФ: ДНФ дополнения функции, кубы которой дают дизъюнкции"""
+        bdd = BDD(num_vars)
+        off_set = bdd.from_bits(self._indices_to_bits(maxterms))
+        dc_set = bdd.from_bits(self._indices_to_bits(dont_cares or []))
+        cubes, stages = self._bdd_cover(bdd, off_set, bdd.apply('|', off_set, dc_set), num_vars)
+        return self._construct_sknf_expression(self._cube_patterns(cubes, num_vars), variables), stages
+
+    def minimize_expression(self, postfix_tokens: List[str], variables: List[str],
+                            dont_care_postfix: List[str] = None) -> Dict:
+        """Минимизация по BDD прямо из выражения, без таблицы истинности.
+
+        Подходит для функций с числом переменных, при котором перечисление
+        наборов уже слишком дорого. Результат — в формате
+        perform_all_minimizations с единственным методом 'bdd'; число
+        наборов в truth_table_info считается по BDD.
+        """
+        num_vars = len(variables)
+        bdd = BDD(num_vars)
+        function = bdd.from_postfix(postfix_tokens, variables)
+        dc_set = bdd.from_postfix(dont_care_postfix, variables) if dont_care_postfix else BDD.FALSE
+        on_set = bdd.apply('&', function, bdd.negate(dc_set))
+        off_set = bdd.apply('&', bdd.negate(function), bdd.negate(dc_set))
 
-                k_map[row_gray][col_gray] = 1
+        results = {
+            "variables": variables,
+            "sdnf_results": {},
+            "sknf_results": {},
+            "truth_table_info": {
+                "total_rows": 1 << num_vars,
+                "sdnf_count": bdd.count(on_set),
+                "sknf_count": bdd.count(off_set),
+                "dont_care_count": bdd.count(dc_set)
+            }
+        }
+        for form_type, target, construct in (('sdnf', on_set, self._construct_sdnf_expression),
+                                             ('sknf', off_set, self._construct_sknf_expression)):
+            with profile_stage(self.profiler, f"{form_type}.bdd"):
+                cubes, stages = self._bdd_cover(bdd, target, bdd.apply('|', target, dc_set), num_vars)
+                expression = construct(self._cube_patterns(cubes, num_vars), variables)
+            results[f"{form_type}_results"]["bdd"] = {
+                "expression": expression,
+                "stages": finalize_stages(stages, self.trace_mode),
+                "cover": self.last_cover,
+                "cost": self.cover_cost(self.last_cover, form_type),
+                "details": None,
+                "method_description": self._get_method_description(form_type, "bdd")
+            }
+        return results
 
-        return k_map
+    def _bdd_cover(self, bdd: BDD, lower: int, upper: int, num_vars: int) -> Tuple[List[Tuple[int, int]], List]:
+        """Кубы неприводимого покрытия функции между lower и upper и этапы для отображения"""
+        with profile_stage(self.profiler, "isop"):
+            cubes, _ = bdd.isop(lower, upper)
+        literal_count = sum(num_vars - mask.bit_count() for _, mask in cubes)
+        if self.profiler is not None:
+            self.profiler.set("bdd_nodes", len(bdd.nodes))
+            self.profiler.set("cubes", len(cubes))
+        stages = [
+            ["Неприводимое покрытие по BDD (Минато–Морреале)"],
+            [f"Узлов BDD: {bdd.size(upper)} (верхняя граница), {bdd.size(lower)} (нижняя)"],
+            [f"Кубов в покрытии: {len(cubes)}, литералов: {literal_count}"]
+        ]
+        return sorted(cubes), stages
+
+    def _cube_patterns(self, cubes: List[Tuple[int, int]], num_vars: int) -> List[Tuple[str, None]]:
+        return [(self._implicant_pattern(value, mask, num_vars), None) for value, mask in cubes]
+
+    def _build_karnaugh_map(self, minterms: List[int], num_vars: int,
+                            dont_cares: List[int] = None) -> List[List[List[int]]]:
+        """Построение карты Карно: слои, строки и столбцы упорядочены кодом Грея.
+
+        До 4 переменных карта состоит из одного слоя, для 5 и 6 — из 2 и 4
+        слоев 4×4 по первым переменным. Безразличные наборы отмечаются
+        значением DONT_CARE_CELL.
+        """
+        layer_bits, row_bits, column_bits = karnaugh_dimensions(num_vars)
+        cells = dict.fromkeys(dont_cares or [], DONT_CARE_CELL)
+        cells.update(dict.fromkeys(minterms, 1))
+        return [[[cells.get((layer << (row_bits + column_bits)) | (row << column_bits) | column, 0)
+                  for column in self._generate_gray_code(1 << column_bits)]
+                 for row in self._generate_gray_code(1 << row_bits)]
+                for layer in self._generate_gray_code(1 << layer_bits)]
 
     def _generate_gray_code(self, n: int) -> List[int]:
-        """Генерация Gray code"""
-        if n <= 0:
-            return [0]
-        gray = [0, 1]
-        for i in range(2, n + 1):
-            reflect = gray[::-1]
-            gray = [0] + gray
-            reflect = [1] + reflect
-            gray.extend(reflect)
-        return gray[:n]
\ No newline at end of file
+        """Генерация первых n значений кода Грея"""
+        return gray_code(n)
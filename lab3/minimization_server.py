@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from batch_minimization import process_item
+
+MAX_BODY_SIZE = 1 << 20
+
+# HTTP-статус ответа по статусу записи результата
+RECORD_STATUS = {"ok": 200, "error": 422, "timeout": 504}
+
+
+class ServerStats:
+    """Счетчики сервера: запросы, объединения, отказы, задержки и пропускная способность"""
+
+    def __init__(self, window: int = 1024):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.failed = 0
+        self.completed = 0
+        self._latencies = deque(maxlen=window)
+
+    def observe(self, latency: float) -> None:
+        self.completed += 1
+        self._latencies.append(latency)
+
+    def snapshot(self, in_flight: int) -> Dict[str, Any]:
+        """Текущие значения; перцентили задержки — по последним window ответам"""
+        uptime = time.monotonic() - self.started
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 3)
+
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "completed": self.completed,
+            "in_flight": in_flight,
+            "throughput_rps": round(self.completed / uptime, 3) if uptime > 0 else 0.0,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+                           "max": percentile(1.0)}
+        }
+
+
+class MinimizationServer:
+    """Локальный HTTP-сервис минимизации на asyncio.
+
+    POST /minimize принимает {"expression": ..., "dont_cares": ..., "id": ...}
+    и возвращает запись того же вида, что и пакетный режим; GET /stats —
+    счетчики. Вычисления выполняются в пуле процессов. Одинаковые запросы,
+    пришедшие, пока первый из них вычисляется, ждут общий результат. Если в
+    работе уже max_pending различных вычислений, новый запрос сразу получает
+    503 — клиент должен повторить его позже.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64, timeout: Optional[float] = None,
+                 executor: Optional[Executor] = None):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.stats = ServerStats()
+        if executor is None:
+            # Процессы, порожденные fork, унаследовали бы открытые соединения клиентов
+            # и те не закрывались бы после ответа
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        self._executor = executor
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> Tuple[str, int]:
+        """Запуск приема соединений; возвращает фактический адрес"""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def minimize(self, payload: Any) -> Tuple[int, Dict[str, Any]]:
+        """Обработка одного запроса: (HTTP-статус, тело ответа)"""
+        self.stats.requests += 1
+        started = time.perf_counter()
+        if not isinstance(payload, dict) or not isinstance(payload.get("expression"), str):
+            self.stats.failed += 1
+            return 400, {"status": "error", "error": "Ожидается объект с полем expression"}
+
+        key = json.dumps([payload["expression"], payload.get("dont_cares")])
+        job = self._in_flight.get(key)
+        if job is not None:
+            self.stats.coalesced += 1
+        elif len(self._in_flight) >= self.max_pending:
+            self.stats.rejected += 1
+            return 503, {"status": "error", "error": "Очередь заполнена, повторите запрос позже"}
+        else:
+            item = (None, payload["expression"], payload.get("dont_cares"), None)
+            try:
+                job = asyncio.get_running_loop().run_in_executor(self._executor, process_item, item, self.timeout)
+            except RuntimeError as e:
+                self.stats.failed += 1
+                return 500, {"status": "error", "error": f"Системная ошибка: {e}"}
+            self._in_flight[key] = job
+            self.stats.computations += 1
+            job.add_done_callback(lambda done: self._in_flight.pop(key) if self._in_flight.get(key) is done else None)
+
+        try:
+            record = dict(await asyncio.shield(job))
+        except Exception as e:
+            self.stats.failed += 1
+            return 500, {"status": "error", "error": f"Системная ошибка: {e}"}
+
+        record["id"] = payload.get("id")
+        self.stats.observe(time.perf_counter() - started)
+        return RECORD_STATUS.get(record["status"], 500), record
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "Метод не поддерживается"}
+            return 200, self.stats.snapshot(len(self._in_flight))
+        if path == "/minimize":
+            if method != "POST":
+                return 405, {"error": "Метод не поддерживается"}
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                self.stats.requests += 1
+                self.stats.failed += 1
+                return 400, {"status": "error", "error": "Тело запроса — не JSON"}
+            return await self.minimize(payload)
+        return 404, {"error": "Неизвестный путь"}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    self._write_response(writer, 400, {"error": "Некорректная строка запроса"}, False)
+                    break
+                method, path, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_SIZE:
+                    self._write_response(writer, 413, {"error": "Слишком большой запрос"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, response = await self._route(method, path, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, response: Dict[str, Any], keep_alive: bool) -> None:
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def _serve(args) -> None:
+    server = MinimizationServer(args.workers, args.max_pending, args.timeout)
+    host, port = await server.start(args.host, args.port)
+    print(f"Сервер минимизации: http://{host}:{port} (POST /minimize, GET /stats)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP-сервис минимизации логических выражений")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--max-pending", type=int, default=64, help="предел одновременных вычислений")
+    parser.add_argument("--timeout", type=float, default=None, help="ограничение времени на выражение, с")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional, Tuple
+
+from cover_solver import CoverSolver
+
+# Многовыходная импликанта: (value, mask, tag) — tag содержит номера выходов,
+# для которых терм является импликантой (с учетом безразличных наборов)
+TaggedImplicant = Tuple[int, int, int]
+
+
+class MultiOutputMinimizer:
+    """Совместная минимизация нескольких функций в ДНФ с общими термами.
+
+    Простые импликанты ищутся модифицированным методом Квайна-МакКласки:
+    каждый терм несет маску выходов, при склеивании маски пересекаются, а терм
+    перестает быть простым, только если склеился без потери выходов. Затем
+    решается одна задача о покрытии по парам (выход, набор): терм, выбранный
+    для нескольких выходов, реализуется одним элементом И.
+    """
+
+    def __init__(self, cover_solver: Optional[CoverSolver] = None):
+        self.cover_solver = cover_solver or CoverSolver()
+
+    def minimize(self, on_sets: List[List[int]], num_vars: int,
+                 dc_sets: List[List[int]] = None) -> List[List[Tuple[int, int]]]:
+        """Покрытия выходов кубами (value, mask); общие кубы совпадают"""
+        outputs = len(on_sets)
+        dc_sets = dc_sets or [[] for _ in range(outputs)]
+        rows = 1 << num_vars
+
+        primes = self.prime_implicants(on_sets, num_vars, dc_sets)
+        targets = 0
+        for output, on_set in enumerate(on_sets):
+            for minterm in on_set:
+                targets |= 1 << (output * rows + minterm)
+
+        columns = [self._columns(value, mask, tag, rows, outputs) & targets for value, mask, tag in primes]
+        costs = [num_vars - mask.bit_count() + 1 for _, mask, _ in primes]
+        chosen = self.cover_solver.solve(columns, targets, costs)
+
+        # Каждый выход использует только нужные ему термы из выбранных
+        covers = []
+        for output in range(outputs):
+            shift = output * rows
+            candidates = [(primes[i][0], primes[i][1], (columns[i] >> shift) & ((1 << rows) - 1))
+                          for i in chosen if primes[i][2] >> output & 1]
+            covers.append(self._irredundant(candidates))
+        return covers
+
+    def prime_implicants(self, on_sets: List[List[int]], num_vars: int,
+                         dc_sets: List[List[int]] = None) -> List[TaggedImplicant]:
+        """Многовыходные простые импликанты, полезные хотя бы для одного выхода"""
+        dc_sets = dc_sets or [[] for _ in on_sets]
+        full = (1 << num_vars) - 1
+        current: Dict[Tuple[int, int], int] = {}
+        for output, (on_set, dc_set) in enumerate(zip(on_sets, dc_sets)):
+            for minterm in list(on_set) + list(dc_set):
+                current[(minterm, 0)] = current.get((minterm, 0), 0) | (1 << output)
+
+        primes = []
+        while current:
+            next_round: Dict[Tuple[int, int], int] = {}
+            covered = set()
+            for (value, mask), tag in current.items():
+                free = full & ~(value | mask)
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    partner = (value | bit, mask)
+                    partner_tag = current.get(partner)
+                    if partner_tag is None:
+                        continue
+                    merged_tag = tag & partner_tag
+                    if not merged_tag:
+                        continue
+                    next_round[(value, mask | bit)] = merged_tag
+                    if merged_tag == tag:
+                        covered.add((value, mask))
+                    if merged_tag == partner_tag:
+                        covered.add(partner)
+            primes.extend((value, mask, tag) for (value, mask), tag in current.items()
+                          if (value, mask) not in covered)
+            current = next_round
+
+        # Термы, покрывающие только безразличные наборы, не нужны
+        on_bits = [self._bits(on_set) for on_set in on_sets]
+        useful = []
+        for value, mask, tag in sorted(primes):
+            cells = self._cube_bits(value, mask)
+            tag = sum(1 << output for output in range(len(on_sets))
+                      if tag >> output & 1 and cells & on_bits[output])
+            if tag:
+                useful.append((value, mask, tag))
+        return useful
+
+    @staticmethod
+    def cost(covers: List[List[Tuple[int, int]]], num_vars: int) -> Dict[str, int]:
+        """Число различных термов и литералов в них, а также входов элементов ИЛИ"""
+        products = {cube for cover in covers for cube in cover}
+        return {
+            "products": len(products),
+            "literals": sum(num_vars - mask.bit_count() for _, mask in products),
+            "or_inputs": sum(len(cover) for cover in covers)
+        }
+
+    def _columns(self, value: int, mask: int, tag: int, rows: int, outputs: int) -> int:
+        cells = self._cube_bits(value, mask)
+        bits = 0
+        for output in range(outputs):
+            if tag >> output & 1:
+                bits |= cells << (output * rows)
+        return bits
+
+    @staticmethod
+    def _irredundant(candidates: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+        """Удаление термов, наборы которых покрыты остальными (сначала самых длинных)"""
+        counts: Dict[int, int] = {}
+        for _, _, cells in candidates:
+            bits = cells
+            while bits:
+                low = bits & -bits
+                bits ^= low
+                counts[low] = counts.get(low, 0) + 1
+
+        kept = []
+        for value, mask, cells in sorted(candidates, key=lambda c: (c[1].bit_count(), c[0])):
+            bits = cells
+            redundant = True
+            while bits:
+                low = bits & -bits
+                bits ^= low
+                if counts[low] == 1:
+                    redundant = False
+                    break
+            if redundant:
+                bits = cells
+                while bits:
+                    low = bits & -bits
+                    bits ^= low
+                    counts[low] -= 1
+            else:
+                kept.append((value, mask))
+        return sorted(kept)
+
+    @staticmethod
+    def _bits(indices: List[int]) -> int:
+        bits = 0
+        for index in indices:
+            bits |= 1 << index
+        return bits
+
+    @staticmethod
+    def _cube_bits(value: int, mask: int) -> int:
+        bits = 1 << value
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            bits |= bits << bit
+        return bits
@@ -1,4 +1,18 @@
-from typing import Dict, List
+import csv
+import json
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, TextIO
+
+from stage_trace import StageTrace
+from truth_table import TruthTable
+
+# Таблицы истинности с большим числом строк машинные форматы не выводят
+DEFAULT_MAX_TABLE_ROWS = 1 << 16
+
+BINARY_MAGIC = b"LMR\x01"
+FORM_TYPES = ('sdnf', 'sknf')
+# Число кубов вместо покрытия, если метод завершился ошибкой
+NO_COVER = 0xFFFFFFFF
 
 
 class ResultsPresenter:
@@ -15,7 +29,7 @@ class ResultsPresenter:
         output_lines.append(self.section_separator)
 
         # ТАБЛИЦА ИСТИННОСТИ
-        if "truth_table_display" in minimization_results:
+        if "truth_table_display" in minimization_results or "truth_table_data" in minimization_results:
             output_lines.extend(self._format_truth_table(minimization_results))
             output_lines.append(self.subsection_separator)
 
@@ -40,11 +54,15 @@ class ResultsPresenter:
 
     def _format_truth_table(self, results: Dict) -> List[str]:
         """Форматирование таблицы истинности для вывода"""
-        if "truth_table_display" not in results:
+        if "truth_table_display" in results:
+            display = results["truth_table_display"]
+        elif isinstance(results.get("truth_table_data"), TruthTable):
+            display = results["truth_table_data"].display_lines()
+        else:
             return []
 
         table_lines = ["📋 ТАБЛИЦА ИСТИННОСТИ:"]
-        table_lines.extend(results["truth_table_display"])
+        table_lines.extend(display)
         return table_lines
 
     def _format_function_info(self, results: Dict) -> List[str]:
@@ -56,6 +74,8 @@ class ResultsPresenter:
             f"Число истинных значений (для СДНФ): {results['truth_table_info']['sdnf_count']}",
             f"Число ложных значений (для СКНФ): {results['truth_table_info']['sknf_count']}"
         ]
+        if results['truth_table_info'].get('dont_care_count'):
+            info_lines.append(f"Число безразличных наборов: {results['truth_table_info']['dont_care_count']}")
 
         # Добавляем информацию о СДНФ и СКНФ если есть
         if "minterm_info" in results:
@@ -74,6 +94,8 @@ class ResultsPresenter:
                 f"  Результат: {method_data['expression']}",
                 f"  Этапы: {len(method_data['stages'])} этапов"
             ])
+            if method_data.get('cost'):
+                sdnf_lines.append(self._format_cost(method_data['cost']))
 
             # Добавление подробностей этапов (только первые 3 этапа для краткости)
             for i, stage in enumerate(method_data['stages'][:3], 1):
@@ -95,6 +117,8 @@ class ResultsPresenter:
                 f"  Результат: {method_data['expression']}",
                 f"  Этапы: {len(method_data['stages'])} этапов"
             ])
+            if method_data.get('cost'):
+                sknf_lines.append(self._format_cost(method_data['cost']))
 
             # Добавление подробностей этапов
             for i, stage in enumerate(method_data['stages'][:3], 1):
@@ -105,6 +129,201 @@ class ResultsPresenter:
             sknf_lines.append("")
         return sknf_lines
 
+    @staticmethod
+    def _format_cost(cost: Dict) -> str:
+        return (f"  Стоимость: термов {cost['products']}, литералов {cost['literals']}, "
+                f"2-входовых элементов {cost['gates']} (метрика: {cost['metric']})")
+
+    def format_multi_output_results(self, results: Dict) -> Dict:
+        """Форматирование результатов совместной минимизации нескольких функций"""
+        output_lines = ["СОВМЕСТНАЯ МИНИМИЗАЦИЯ ФУНКЦИЙ", self.section_separator,
+                        f"Переменные: {', '.join(results['variables'])}"]
+
+        for i, (expression, output) in enumerate(zip(results["expressions"], results["outputs"]), 1):
+            output_lines.append(f"F{i} = {expression}")
+            output_lines.append(f"  Результат: {output['expression']}")
+        output_lines.append(self.subsection_separator)
+
+        cost = results["cost"]
+        separate = results["separate_cost"]
+        output_lines.extend([
+            f"Общие термы: {', '.join(results['shared_terms']) if results['shared_terms'] else 'нет'}",
+            f"Различных термов: {cost['products']} (раздельно: {separate['products']})",
+            f"Литералов в термах: {cost['literals']} (раздельно: {separate['literals']})"
+        ])
+        output_lines.append(self.section_separator)
+
+        return {
+            "formatted_output": "\n".join(output_lines),
+            "raw_data": results
+        }
+
+    def write_json(self, results: Dict, stream: TextIO, max_table_rows: int = DEFAULT_MAX_TABLE_ROWS,
+                   include_stages: bool = False) -> None:
+        """Запись результатов одним объектом JSON по частям.
+
+        Таблица истинности (results["truth_table_data"]) выводится построчно:
+        строка — значения переменных и F (null для безразличного набора).
+        Если строк больше max_table_rows, выводится только их число.
+        """
+        info = results.get("truth_table_info", {})
+        header = {"variables": results["variables"], "truth_table_info": info,
+                  "methods": self._method_records(results, include_stages)}
+        for key in ("cache_stats", "profile"):
+            if key in results:
+                header[key] = results[key]
+        stream.write(json.dumps(header, ensure_ascii=False)[:-1])
+
+        table = results.get("truth_table_data")
+        if isinstance(table, TruthTable):
+            stream.write(f', "truth_table": {{"total_rows": {table.total_rows}')
+            if table.total_rows > max_table_rows:
+                stream.write(', "omitted": true}')
+            else:
+                stream.write(', "rows": [')
+                batch = []
+                for row_index, bits, value in self._table_rows(table):
+                    batch.append("[" + ", ".join(bits + ["null" if value is None else str(int(value))]) + "]")
+                    if len(batch) == 1024 or row_index == table.total_rows - 1:
+                        # Пачки строк, чтобы не вызывать write на каждую строку
+                        stream.write((", " if row_index >= len(batch) else "") + ", ".join(batch))
+                        batch = []
+                stream.write("]}")
+        stream.write("}")
+
+    def write_csv(self, results: Dict, stream: TextIO, table: str = "methods",
+                  max_table_rows: int = DEFAULT_MAX_TABLE_ROWS) -> int:
+        """Запись в CSV результатов методов (table="methods") или таблицы истинности
+        (table="truth_table", построчно, F — 1, 0 или '-'). Возвращает число строк данных."""
+        writer = csv.writer(stream, lineterminator="\n")
+        if table == "methods":
+            writer.writerow(["form", "method", "description", "expression", "cover", "products", "literals", "gates"])
+            count = 0
+            for form_type, method, record in self._iter_methods(results):
+                cover = record.get("cover")
+                cost = record.get("cost") or {}
+                writer.writerow([form_type, method, record.get("method_description", ""), record["expression"],
+                                 " ".join(cover) if cover is not None else "",
+                                 len(cover) if cover is not None else "",
+                                 sum(len(pattern) - pattern.count('-') for pattern in cover) if cover is not None else "",
+                                 cost.get("gates", "")])
+                count += 1
+            return count
+
+        if table != "truth_table":
+            raise ValueError(f"Неизвестная таблица: {table}")
+        truth_table = results.get("truth_table_data")
+        if not isinstance(truth_table, TruthTable):
+            raise ValueError("Таблица истинности недоступна")
+        if truth_table.total_rows > max_table_rows:
+            raise ValueError(f"Таблица истинности больше {max_table_rows} строк")
+        writer.writerow(list(truth_table.variables) + ["F"])
+        for _, bits, value in self._table_rows(truth_table):
+            writer.writerow(bits + ["-" if value is None else str(int(value))])
+        return truth_table.total_rows
+
+    def write_binary(self, results: Dict, stream: BinaryIO, max_table_rows: int = DEFAULT_MAX_TABLE_ROWS) -> None:
+        """Компактная двоичная запись (little-endian), читается read_binary.
+
+        Заголовок LMR\\x01, переменные, затем флаг таблицы и два битовых столбца
+        (значения и безразличные наборы, бит i — строка i), затем методы:
+        форма, имя, выражение и кубы (value, mask) покрытия.
+        """
+        variables = results["variables"]
+        width = max(1, (len(variables) + 7) // 8)
+        stream.write(BINARY_MAGIC + struct.pack("<B", len(variables)))
+        for variable in variables:
+            self._write_text(stream, variable, "<B")
+
+        table = results.get("truth_table_data")
+        if isinstance(table, TruthTable) and table.total_rows <= max_table_rows:
+            size = (table.total_rows + 7) // 8
+            stream.write(b"\x01")
+            stream.write(table.result_bits.to_bytes(size, "little"))
+            stream.write(table.dont_care_bits.to_bytes(size, "little"))
+        else:
+            stream.write(b"\x00")
+
+        methods = list(self._iter_methods(results))
+        stream.write(struct.pack("<H", len(methods)))
+        for form_type, method, record in methods:
+            stream.write(struct.pack("<B", FORM_TYPES.index(form_type)))
+            self._write_text(stream, method, "<B")
+            self._write_text(stream, record["expression"], "<I")
+            cover = record.get("cover")
+            stream.write(struct.pack("<I", NO_COVER if cover is None else len(cover)))
+            for pattern in cover or []:
+                value = int(pattern.replace('-', '0'), 2) if pattern else 0
+                mask = int(''.join('1' if symbol == '-' else '0' for symbol in pattern), 2) if pattern else 0
+                stream.write(value.to_bytes(width, "little") + mask.to_bytes(width, "little"))
+
+    @staticmethod
+    def read_binary(stream: BinaryIO) -> Dict[str, Any]:
+        """Чтение результата write_binary"""
+        if stream.read(4) != BINARY_MAGIC:
+            raise ValueError("Неизвестный формат данных")
+
+        def read(fmt: str):
+            return struct.unpack(fmt, stream.read(struct.calcsize(fmt)))[0]
+
+        def read_text(fmt: str) -> str:
+            return stream.read(read(fmt)).decode("utf-8")
+
+        num_vars = read("<B")
+        variables = [read_text("<B") for _ in range(num_vars)]
+        width = max(1, (num_vars + 7) // 8)
+        data: Dict[str, Any] = {"variables": variables, "result_bits": None, "dont_care_bits": None,
+                                "methods": {form_type: {} for form_type in FORM_TYPES}}
+        if read("<B"):
+            size = ((1 << num_vars) + 7) // 8
+            data["result_bits"] = int.from_bytes(stream.read(size), "little")
+            data["dont_care_bits"] = int.from_bytes(stream.read(size), "little")
+
+        for _ in range(read("<H")):
+            form_type = FORM_TYPES[read("<B")]
+            method = read_text("<B")
+            expression = read_text("<I")
+            count = read("<I")
+            cover = None
+            if count != NO_COVER:
+                cover = []
+                for _ in range(count):
+                    value = int.from_bytes(stream.read(width), "little")
+                    mask = int.from_bytes(stream.read(width), "little")
+                    cover.append(''.join('-' if mask >> bit & 1 else str(value >> bit & 1)
+                                         for bit in range(num_vars - 1, -1, -1)))
+            data["methods"][form_type][method] = {"expression": expression, "cover": cover}
+        return data
+
+    @staticmethod
+    def _iter_methods(results: Dict) -> Iterator:
+        for form_type in FORM_TYPES:
+            for method, record in results.get(f"{form_type}_results", {}).items():
+                yield form_type, method, record
+
+    def _method_records(self, results: Dict, include_stages: bool) -> Dict[str, Dict]:
+        records = {form_type: {} for form_type in FORM_TYPES}
+        for form_type, method, record in self._iter_methods(results):
+            entry = {"description": record.get("method_description"), "expression": record["expression"],
+                     "cover": record.get("cover"), "cost": record.get("cost")}
+            if include_stages:
+                entry["stages"] = [list(stage) if isinstance(stage, (list, StageTrace)) else [str(stage)]
+                                   for stage in record.get("stages", [])]
+            records[form_type][method] = entry
+        return records
+
+    @staticmethod
+    def _table_rows(table: TruthTable) -> Iterator:
+        """Строки таблицы: (номер, значения переменных '0'/'1', значение F или None)"""
+        num_vars = len(table.variables)
+        for row_index, value in enumerate(table.iter_values()):
+            yield row_index, list(format(row_index, f'0{num_vars}b')) if num_vars else [], value
+
+    @staticmethod
+    def _write_text(stream: BinaryIO, text: str, length_format: str) -> None:
+        encoded = text.encode("utf-8")
+        stream.write(struct.pack(length_format, len(encoded)) + encoded)
+
     def format_error_message(self, error_data: Dict) -> str:
         """Форматирование сообщения об ошибке"""
         error_type = error_data.get('type', 'UNKNOWN_ERROR')
@@ -0,0 +1,51 @@
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List
+
+# Режимы этапов минимизации: text — строки (как раньше), structured — объекты
+# StageTrace с отложенным текстом, none — этапы не сохраняются
+TRACE_MODES = ("text", "structured", "none")
+
+
+class StageTrace(Sequence):
+    """Этап минимизации в виде данных.
+
+    Строки этапа строятся функцией render при первом обращении (обычно из
+    ResultsPresenter), поэтому вызывающий, которому нужен только результат,
+    не тратит время на форматирование импликант. Как последовательность
+    строк объект взаимозаменяем с прежним списком строк.
+    """
+
+    __slots__ = ("kind", "data", "_render", "_lines")
+
+    def __init__(self, kind: str, render: Callable[[], List[str]], **data):
+        self.kind = kind
+        self.data = data
+        self._render = render
+        self._lines = None
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self._render()
+        return self._lines
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __str__(self) -> str:
+        return "; ".join(self.lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, **self.data}
+
+
+def finalize_stages(stages: List, trace_mode: str) -> List:
+    """Этапы в виде, соответствующем режиму"""
+    if trace_mode == "none":
+        return []
+    if trace_mode == "text":
+        return [stage.lines if isinstance(stage, StageTrace) else stage for stage in stages]
+    return stages
@@ -2,6 +2,13 @@
 import unittest
 import sys
 import os
+import tempfile
+import asyncio
+import io
+import random
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Добавляем путь для импорта модулей
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -11,6 +18,20 @@ from truth_table_generator import TruthTableGenerator
 from minimization_engine import MinimizationEngine
 from results_presenter import ResultsPresenter
 from logic_minimization_system import LogicMinimizationSystem
+from bdd import BDD
+from expression_dag import ExpressionDAG
+from expression_rewriter import ExpressionRewriter
+from cost_model import CostModel
+from cover_solver import CoverSolver
+from espresso_minimizer import EspressoMinimizer
+from minimization_cache import MinimizationCache, npn_canonical_form
+from multi_output_minimizer import MultiOutputMinimizer
+from batch_minimization import ItemTimeout, read_batch, run_batch, run_with_timeout
+from minimization_benchmark import (format_report, random_expression, random_function, run_backend_benchmark,
+                                    run_method_benchmark)
+from minimization_server import MinimizationServer
+from instrumentation import PipelineProfiler
+from stage_trace import StageTrace
 
 
 class TestLogicalExpressionProcessor(unittest.TestCase):
@@ -25,27 +46,28 @@ class TestLogicalExpressionProcessor(unittest.TestCase):
 
     def test_validate_characters_valid(self):
         """Тест валидации допустимых символов"""
-        self.assertTrue(self.processor._validate_characters("a&b"))
-        self.assertTrue(self.processor._validate_characters("(a|b)->c"))
-        self.assertTrue(self.processor._validate_characters("!a~b"))
+        self.assertTrue(self.processor.validate_and_parse("a&b")["is_valid"])
+        self.assertTrue(self.processor.validate_and_parse("(a|b)->c")["is_valid"])
+        self.assertTrue(self.processor.validate_and_parse("!a~b")["is_valid"])
 
     def test_validate_characters_invalid(self):
         """Тест валидации недопустимых символов"""
-        self.assertFalse(self.processor._validate_characters("a&x"))  # недопустимая переменная
-        self.assertFalse(self.processor._validate_characters("a+b"))  # недопустимый оператор
-        self.assertFalse(self.processor._validate_characters("a&1"))  # цифра не допускается
+        for expression in ("a&x", "a+b", "a&1"):  # недопустимые переменная, оператор и цифра
+            result = self.processor.validate_and_parse(expression)
+            self.assertFalse(result["is_valid"])
+            self.assertIn("Недопустимые символы", result["error_message"])
 
     def test_validate_parentheses_balanced(self):
         """Тест сбалансированных скобок"""
-        self.assertTrue(self.processor._validate_parentheses("(a&b)"))
-        self.assertTrue(self.processor._validate_parentheses("((a|b)->c)"))
-        self.assertTrue(self.processor._validate_parentheses("()"))
+        self.assertEqual(self.processor._validate_syntax("(a&b)"), "")
+        self.assertEqual(self.processor._validate_syntax("((a|b)->c)"), "")
+        self.assertIn("Пустые скобки", self.processor._validate_syntax("()"))
 
     def test_validate_parentheses_unbalanced(self):
         """Тест несбалансированных скобок"""
-        self.assertFalse(self.processor._validate_parentheses("(a&b"))
-        self.assertFalse(self.processor._validate_parentheses("a&b)"))
-        self.assertFalse(self.processor._validate_parentheses("((a|b)->c"))
+        self.assertIn("Несбалансированные скобки", self.processor._validate_syntax("(a&b"))
+        self.assertIn("Несбалансированные скобки", self.processor._validate_syntax("a&b)"))
+        self.assertIn("Несбалансированные скобки", self.processor._validate_syntax("((a|b)->c"))
 
     def test_validate_syntax_valid(self):
         """Тест синтаксически корректных выражений"""
@@ -60,27 +82,65 @@ class TestLogicalExpressionProcessor(unittest.TestCase):
         self.assertIn("Пустые скобки", self.processor._validate_syntax("a&()"))
         self.assertIn("последовательность", self.processor._validate_syntax("a&&b"))
 
+    def test_chained_implication(self):
+        """Тест цепочки импликаций и отрицания после оператора"""
+        self.assertEqual(self.processor._validate_syntax("a->b->c"), "")
+        result = self.processor.validate_and_parse("a -> b -> c")
+        self.assertEqual(result["postfix_tokens"], ["a", "b", "->", "c", "->"])
+        self.assertEqual(self.processor.validate_and_parse("a & !b")["postfix_tokens"], ["a", "b", "!", "&"])
+
+    def test_error_offsets(self):
+        """Тест позиций ошибок в исходной строке"""
+        cases = {
+            "a & x": 4,
+            "a  &&  b": 4,
+            "(a & b": 0,
+            "a | b)": 5,
+            "a b": 2,
+            "a | b & ": 6
+        }
+        for expression, offset in cases.items():
+            result = self.processor.validate_and_parse(expression)
+            self.assertFalse(result["is_valid"])
+            self.assertEqual(result["error_offset"], offset, expression)
+            self.assertIn(f"позиция {offset + 1}", result["error_message"])
+
+    def test_deeply_nested_expression(self):
+        """Тест глубокой вложенности скобок и отрицаний (разбор не рекурсивный)"""
+        depth = 5000
+        result = self.processor.validate_and_parse("(" * depth + "a & !" + "!" * depth + "b" + ")" * depth)
+        self.assertTrue(result["is_valid"])
+        self.assertEqual(result["postfix_tokens"], ["a", "b"] + ["!"] * (depth + 1) + ["&"])
+
+        result = self.processor.validate_and_parse("(" * depth + "a" + ")" * (depth - 1))
+        self.assertFalse(result["is_valid"])
+        self.assertEqual(result["error_offset"], 0)
+
+    def test_parse_time_is_linear(self):
+        """Тест времени разбора: глубокая вложенность не делает разбор квадратичным"""
+        depth = 100000
+        started = time.perf_counter()
+        result = self.processor.validate_and_parse("!" * depth + "(" * depth + "a" + ")" * depth)
+        self.assertTrue(result["is_valid"])
+        # Линейный разбор укладывается в доли секунды, квадратичный занял бы минуты
+        self.assertLess(time.perf_counter() - started, 2.0)
+
     def test_extract_unique_variables(self):
         """Тест извлечения уникальных переменных"""
-        self.assertEqual(self.processor._extract_unique_variables("a&b|a&c"), ["a", "b", "c"])
-        self.assertEqual(self.processor._extract_unique_variables("!a|b&a"), ["a", "b"])
-        self.assertEqual(self.processor._extract_unique_variables("a"), ["a"])
+        self.assertEqual(self.processor._parse("a&b|a&c")[2], ["a", "b", "c"])
+        self.assertEqual(self.processor._parse("!a|b&a")[2], ["a", "b"])
+        self.assertEqual(self.processor._parse("a")[2], ["a"])
 
     def test_tokenize_expression(self):
         """Тест токенизации выражения"""
-        self.assertEqual(self.processor._tokenize_expression("a&b"), ["a", "&", "b"])
-        self.assertEqual(self.processor._tokenize_expression("!a->b"), ["!", "a", "->", "b"])
-        self.assertEqual(self.processor._tokenize_expression("(a|b)~c"), ["(", "a", "|", "b", ")", "~", "c"])
+        self.assertEqual(self.processor._parse("a&b")[0], ["a", "&", "b"])
+        self.assertEqual(self.processor._parse("!a->b")[0], ["!", "a", "->", "b"])
+        self.assertEqual(self.processor._parse("(a|b)~c")[0], ["(", "a", "|", "b", ")", "~", "c"])
 
     def test_convert_to_postfix(self):
         """Тест преобразования в постфиксную форму"""
-        tokens = ["a", "&", "b", "|", "c"]
-        postfix = self.processor._convert_to_postfix(tokens)
-        self.assertEqual(postfix, ["a", "b", "&", "c", "|"])
-
-        tokens_with_parentheses = ["(", "a", "|", "b", ")", "&", "c"]
-        postfix2 = self.processor._convert_to_postfix(tokens_with_parentheses)
-        self.assertEqual(postfix2, ["a", "b", "|", "c", "&"])
+        self.assertEqual(self.processor._parse("a & b | c")[1], ["a", "b", "&", "c", "|"])
+        self.assertEqual(self.processor._parse("(a | b) & c")[1], ["a", "b", "|", "c", "&"])
 
     def test_validate_and_parse_valid(self):
         """Тест комплексной валидации и парсинга корректного выражения"""
@@ -101,6 +161,19 @@ class TestLogicalExpressionProcessor(unittest.TestCase):
         result2 = self.processor.validate_and_parse("a &")  # некорректный синтаксис
         self.assertFalse(result2["is_valid"])
 
+    def test_validate_and_parse_dont_cares(self):
+        """Тест безразличных наборов: номера или второе выражение"""
+        result = self.processor.validate_and_parse("a & b", [1, 1, 2])
+        self.assertTrue(result["is_valid"])
+        self.assertEqual(result["dont_care_indices"], [1, 2])
+
+        result = self.processor.validate_and_parse("a & b", "c")
+        self.assertEqual(result["variables"], ["a", "b", "c"])
+        self.assertEqual(result["dont_care_postfix"], ["c"])
+
+        self.assertFalse(self.processor.validate_and_parse("a & b", [4])["is_valid"])
+        self.assertIn("Безразличные наборы", self.processor.validate_and_parse("a", "a &")["error_message"])
+
 
 class TestTruthTableGenerator(unittest.TestCase):
     def setUp(self):
@@ -196,6 +269,46 @@ class TestTruthTableGenerator(unittest.TestCase):
         self.assertEqual(info["sdnf_count"], 1)
         self.assertEqual(info["sknf_count"], 3)
 
+    def test_dont_care_rows(self):
+        """Тест пометки безразличных наборов в таблице"""
+        table_data = self.generator.generate_complete_table(["a", "b"], ["a", "b", "&"],
+                                                            dont_care_indices=[0], dont_care_postfix=["a", "b", "&"])
+        self.assertEqual(table_data["dont_care_numeric"], [0, 3])
+        self.assertEqual(table_data["sdnf_numeric"], [])
+        self.assertEqual(table_data["sknf_numeric"], [1, 2])
+        self.assertTrue(table_data["truth_table"][3]["dont_care"])
+        self.assertTrue(self.generator.get_truth_table_display(table_data)[-1].strip().endswith("-"))
+
+    def test_columnar_table(self):
+        """Тест столбцового представления: строки и номера наборов выводятся из битов"""
+        table_data = self.generator.generate_complete_table(["a", "b", "c"], ["a", "b", "c", "|", "&"])
+        self.assertEqual(table_data.result_bits, 0b11100000)
+        self.assertEqual(dict(table_data)["sdnf_numeric"], [5, 6, 7])
+        row = table_data["truth_table"][-3]
+        self.assertEqual(row["row_index"], 5)
+        self.assertEqual(row["binary_representation"], "101")
+        self.assertEqual(row["variable_values"], {"a": True, "b": False, "c": True})
+        self.assertTrue(row["result"])
+        self.assertEqual([r["row_index"] for r in table_data["truth_table"][1:3]], [1, 2])
+        self.assertEqual(self.generator._extract_sknf_indices(table_data["truth_table"]), [0, 1, 2, 3, 4])
+        with self.assertRaises(KeyError):
+            table_data["unknown"]
+
+    def test_sharded_columns(self):
+        """Тест блочного вычисления по столбцам в пуле процессов: тот же столбец, что и целиком"""
+        variables = [f"x{index}" for index in range(1, 11)]
+        postfix = random_expression(10, 5)
+        expected = TruthTableGenerator(simplify=False).generate_complete_table(variables, postfix).result_bits
+        for processes in (1, 2):
+            sharded = TruthTableGenerator(simplify=False, processes=processes, shard_variables=4)
+            self.assertEqual(sharded.generate_complete_table(variables, postfix).result_bits, expected)
+        # Константы в выражении и переменные, не входящие в него
+        sharded = TruthTableGenerator(simplify=False, processes=2, shard_variables=3)
+        table = sharded.generate_complete_table(variables, ["x1", "1", "&", "x10", "!", "|"])
+        self.assertEqual(table.result_bits, sum(1 << row for row in range(1 << 10) if row >> 9 or not row & 1))
+        with self.assertRaises(ValueError):
+            TruthTableGenerator(shard_variables=2)
+
 
 class TestMinimizationEngine(unittest.TestCase):
     def setUp(self):
@@ -212,6 +325,25 @@ class TestMinimizationEngine(unittest.TestCase):
         # Должны найти простые импликанты
         self.assertGreater(len(prime_implicants), 0)
 
+    def test_prime_implicant_masks(self):
+        """Тест простых импликант в виде пар (value, mask)"""
+        # f = Σ(0, 1, 2, 5, 6, 7): импликанты 00-, 0-0, -01, -10, 1-1, 11-
+        primes = self.engine._prime_implicant_masks([0, 1, 2, 5, 6, 7], 3)
+        patterns = sorted(self.engine._implicant_pattern(value, mask, 3) for value, mask, _ in primes)
+        self.assertEqual(patterns, ["-01", "-10", "0-0", "00-", "1-1", "11-"])
+        for value, mask, bits in primes:
+            self.assertEqual(bits.bit_count(), 2 ** mask.bit_count())
+            self.assertEqual(value & mask, 0)
+
+    def test_cover_wide_function(self):
+        """Тест покрытия функции от 10 переменных"""
+        minterms = [i for i in range(2 ** 10) if (i * 2654435761) % 7 < 3]
+        _, cover = self.engine._compute_cover(minterms, 10)
+        covered = 0
+        for _, _, bits in cover:
+            covered |= bits
+        self.assertEqual(covered, self.engine._indices_to_bits(minterms))
+
     def test_find_essential_primes(self):
         """Тест нахождения существенных импликант"""
         prime_implicants = [
@@ -294,6 +426,157 @@ class TestMinimizationEngine(unittest.TestCase):
         self.assertIn("calculation", results["sdnf_results"])
         self.assertIn("tabular", results["sdnf_results"])
         self.assertIn("karnaugh", results["sdnf_results"])
+        self.assertIn("espresso", results["sdnf_results"])
+        self.assertIn("espresso", results["sknf_results"])
+
+
+    def test_prime_implicants_shared_per_polarity(self):
+        """Тест однократного поиска простых импликант для каждой формы"""
+        calls = []
+        original = self.engine._prime_implicant_masks
+
+        def counting(terms, num_vars):
+            calls.append(tuple(terms))
+            return original(terms, num_vars)
+
+        self.engine._prime_implicant_masks = counting
+        truth_table_data = {"sdnf_numeric": [0, 1, 2, 5, 6, 7], "sknf_numeric": [3, 4], "total_rows": 8}
+        self.engine.perform_all_minimizations(truth_table_data, ["a", "b", "c"])
+
+        self.assertEqual(sorted(calls), [(0, 1, 2, 5, 6, 7), (3, 4)])
+
+    def test_sknf_covers_maxterms(self):
+        """Тест СКНФ: дизъюнкции строятся по нулям функции"""
+        truth_table_data = {"sdnf_numeric": [3], "sknf_numeric": [0, 1, 2], "total_rows": 4}
+        results = self.engine.perform_all_minimizations(truth_table_data, ["a", "b"])
+
+        for method_data in results["sknf_results"].values():
+            self.assertEqual(method_data["expression"], "(a) & (b)")
+
+    def test_dont_cares_in_all_methods(self):
+        """Тест использования безразличных наборов всеми методами"""
+        # f = Σ(1) + d(3, 5, 7) -> c; нули 0, 2, 4, 6 -> c
+        truth_table_data = {"sdnf_numeric": [1], "sknf_numeric": [0, 2, 4, 6],
+                            "dont_care_numeric": [3, 5, 7], "total_rows": 8}
+        results = self.engine.perform_all_minimizations(truth_table_data, ["a", "b", "c"])
+
+        self.assertEqual(results["truth_table_info"]["dont_care_count"], 3)
+        for form in ("sdnf_results", "sknf_results"):
+            for method_data in results[form].values():
+                self.assertEqual(method_data["expression"], "c")
+
+    def test_gray_code(self):
+        """Тест генерации кода Грея"""
+        self.assertEqual(self.engine._generate_gray_code(8), [0, 1, 3, 2, 6, 7, 5, 4])
+        self.assertEqual(len(self.engine._generate_gray_code(64)), 64)
+
+    def test_karnaugh_map_layers(self):
+        """Тест карты Карно для 5 переменных: два слоя 4×4"""
+        k_map = self.engine._build_karnaugh_map([3, 18], 5)
+        self.assertEqual((len(k_map), len(k_map[0]), len(k_map[0][0])), (2, 4, 4))
+        self.assertEqual(k_map[0][0][2], 1)  # 00011: слой a=0, строка bc=00, столбец de=11
+        self.assertEqual(k_map[1][0][3], 1)  # 10010: слой a=1, строка bc=00, столбец de=10
+        self.assertEqual(sum(cell for layer in k_map for row in layer for cell in row), 2)
+
+    def test_karnaugh_groups_wrap_around(self):
+        """Тест группы из четырех углов карты"""
+        expression, _ = self.engine._minimize_sdnf_karnaugh([0, 2, 8, 10], 4, ["a", "b", "c", "d"])
+        self.assertEqual(expression, "!b & !d")
+
+        details = self.engine.last_details["karnaugh_map"]
+        self.assertEqual(len(details["groups"]), 1)
+        self.assertEqual(details["groups"][0]["rows"], [0, 3])
+        self.assertEqual(details["groups"][0]["columns"], [0, 3])
+
+    def test_karnaugh_six_variables(self):
+        """Тест группы, проходящей через слои карты 6 переменных"""
+        minterms = [index for index in range(64) if index & 0b000101 == 0b000101]  # d & f
+        expression, _ = self.engine._minimize_sdnf_karnaugh(minterms, 6, list("abcdef"))
+        self.assertEqual(expression, "d & f")
+        self.assertEqual(self.engine.last_details["karnaugh_map"]["groups"][0]["layers"], [0, 1, 2, 3])
+
+    def test_trace_modes(self):
+        """Тест режимов этапов: строки, отложенные объекты и отсутствие этапов"""
+        table = TruthTableGenerator().generate_complete_table(["a", "b", "c"], ["a", "b", "|", "c", "!", "&"])
+        text = self.engine.perform_all_minimizations(table, ["a", "b", "c"])
+        self.assertEqual(text["sdnf_results"]["calculation"]["stages"][1],
+                         ["Найдены простые импликанты:; -10 -> [2, 6]; 1-0 -> [4, 6]"])
+
+        structured_engine = MinimizationEngine(trace_mode="structured")
+        structured = structured_engine.perform_all_minimizations(table, ["a", "b", "c"])
+        stage = structured["sdnf_results"]["calculation"]["stages"][1]
+        self.assertIsInstance(stage, StageTrace)
+        self.assertIsNone(stage._lines)
+        self.assertEqual(stage.to_dict()["cubes"], [(2, 4), (4, 2)])
+        self.assertEqual(list(stage), text["sdnf_results"]["calculation"]["stages"][1])
+
+        silent = MinimizationEngine(trace_mode="none").perform_all_minimizations(table, ["a", "b", "c"])
+        self.assertEqual(silent["sknf_results"]["karnaugh"]["stages"], [])
+        self.assertEqual(silent["sknf_results"]["karnaugh"]["expression"], text["sknf_results"]["karnaugh"]["expression"])
+        with self.assertRaises(ValueError):
+            MinimizationEngine(trace_mode="verbose")
+
+    def test_cost_metrics(self):
+        """Тест модели стоимости: выбор покрытия по метрике и достигнутая стоимость в результатах"""
+        # Один куб из 3 литералов или два куба по одному литералу
+        cubes = [(0b0000, 0b0001), (0b0000, 0b0111), (0b1000, 0b0111)]
+        rows = [0b111, 0b011, 0b100]
+        self.assertEqual(CoverSolver().solve(rows, 0b111, CostModel("literals").weights(cubes, 4)), [1, 2])
+        self.assertEqual(CoverSolver().solve(rows, 0b111, CostModel("products").weights(cubes, 4)), [0])
+
+        on_set, dont_cares = [0, 2, 4, 5, 6, 9, 10, 14, 15], [1, 3, 7, 8, 13]
+        table = {"total_rows": 16, "sdnf_numeric": on_set, "dont_care_numeric": dont_cares,
+                 "sknf_numeric": [index for index in range(16) if index not in on_set + dont_cares]}
+        by_literals = self.engine.perform_all_minimizations(table, ["a", "b", "c", "d"])
+        by_gates = MinimizationEngine(cost_metric="gates").perform_all_minimizations(table, ["a", "b", "c", "d"])
+        for method in ("calculation", "tabular", "karnaugh"):
+            literal_cost = by_literals["sdnf_results"][method]["cost"]
+            gate_cost = by_gates["sdnf_results"][method]["cost"]
+            self.assertEqual(gate_cost["literals"], literal_cost["literals"])
+            self.assertLess(gate_cost["gates"], literal_cost["gates"])
+            self.assertEqual(gate_cost["value"], gate_cost["gates"])
+        # Покрытие 0---, --01, --10, -11-: инверторы для a, c и d
+        self.assertEqual(by_gates["sdnf_results"]["calculation"]["cost"],
+                         {"metric": "gates", "products": 4, "literals": 7, "inverters": 3, "gates": 9, "value": 9})
+        for form_type in ("sdnf_results", "sknf_results"):
+            for record in by_gates[form_type].values():
+                self.assertEqual(record["cost"]["products"], len(record["cover"]))
+        with self.assertRaises(ValueError):
+            MinimizationEngine(cost_metric="area")
+
+    def test_update_minimizations(self):
+        """Тест пошагового пересчета: те же простые импликанты, что и при полном пересчете"""
+        variables = ["a", "b", "c", "d", "e"]
+        generator = TruthTableGenerator()
+        before = generator.generate_complete_table(variables, ["a", "b", "&", "c", "d", "e", "|", "&", "|"])
+        previous = self.engine.perform_all_minimizations(before, variables)
+
+        # Наборы 3 и 8 становятся единицами, 31 — нулем
+        minterms = set(before["sdnf_numeric"]) | {3, 8}
+        minterms.discard(31)
+        after = {"sdnf_numeric": sorted(minterms), "sknf_numeric": sorted(set(range(32)) - minterms),
+                 "total_rows": 32}
+        updated = self.engine.update_minimizations(previous, added=[3, 8], removed=[31])
+        full = self.engine.perform_all_minimizations(after, variables)
+
+        self.assertEqual(updated["truth_table_info"], full["truth_table_info"])
+        for form_type, target in (("sdnf", minterms), ("sknf", set(range(32)) - minterms)):
+            self.assertEqual(updated["incremental_state"][form_type]["primes"],
+                             full["incremental_state"][form_type]["primes"])
+            for method_data in updated[f"{form_type}_results"].values():
+                covered = set()
+                for pattern in method_data["cover"]:
+                    cube = {index for index in range(32)
+                            if all(symbol == '-' or int(symbol) == (index >> (4 - i)) & 1
+                                   for i, symbol in enumerate(pattern))}
+                    self.assertTrue(cube <= target)
+                    covered |= cube
+                self.assertEqual(covered, target)
+
+        with self.assertRaises(ValueError):
+            self.engine.update_minimizations(previous, added=[3], removed=[3])
+        with self.assertRaises(ValueError):
+            self.engine.update_minimizations({"variables": variables}, added=[3])
 
 
 class TestResultsPresenter(unittest.TestCase):
@@ -337,6 +620,45 @@ class TestResultsPresenter(unittest.TestCase):
         self.assertIn("МИНИМИЗАЦИЯ СДНФ", formatted_output)
         self.assertIn("МИНИМИЗАЦИЯ СКНФ", formatted_output)
 
+    def test_stream_renderers(self):
+        """Тест потоковой записи результатов в JSON, CSV и двоичном виде"""
+        results = LogicMinimizationSystem().analyze_expression("(a & b) | c", dont_cares=[0])
+        self.assertNotIn("truth_table_display", results)
+        self.assertIn("ТАБЛИЦА ИСТИННОСТИ", self.presenter.format_comprehensive_results(results)["formatted_output"])
+
+        stream = io.StringIO()
+        self.presenter.write_json(results, stream)
+        data = json.loads(stream.getvalue())
+        self.assertEqual(data["variables"], ["a", "b", "c"])
+        self.assertEqual(data["truth_table"]["rows"][0], [0, 0, 0, None])
+        self.assertEqual(data["truth_table"]["rows"][6], [1, 1, 0, 1])
+        self.assertEqual(len(data["truth_table"]["rows"]), 8)
+        self.assertEqual(data["methods"]["sdnf"]["calculation"]["cover"], results["sdnf_results"]["calculation"]["cover"])
+
+        stream = io.StringIO()
+        self.presenter.write_json(results, stream, max_table_rows=4)
+        self.assertEqual(json.loads(stream.getvalue())["truth_table"], {"total_rows": 8, "omitted": True})
+
+        stream = io.StringIO()
+        self.assertEqual(self.presenter.write_csv(results, stream, table="truth_table"), 8)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[:2], ["a,b,c,F", "0,0,0,-"])
+        self.assertEqual(lines[8], "1,1,1,1")
+        with self.assertRaises(ValueError):
+            self.presenter.write_csv(results, io.StringIO(), table="truth_table", max_table_rows=4)
+
+        binary = io.BytesIO()
+        self.presenter.write_binary(results, binary)
+        binary.seek(0)
+        decoded = ResultsPresenter.read_binary(binary)
+        self.assertEqual(decoded["variables"], ["a", "b", "c"])
+        self.assertEqual(decoded["result_bits"], results["truth_table_data"].result_bits)
+        self.assertEqual(decoded["dont_care_bits"], 1)
+        for form_type in ("sdnf", "sknf"):
+            for method, record in results[f"{form_type}_results"].items():
+                self.assertEqual(decoded["methods"][form_type][method],
+                                 {"expression": record["expression"], "cover": record.get("cover")})
+
     def test_format_error_message(self):
         """Тест форматирования сообщения об ошибке"""
         error_data = {"type": "SYNTAX_ERROR", "message": "Несбалансированные скобки"}
@@ -402,35 +724,35 @@ class TestEdgeCases(unittest.TestCase):
         table_data = self.generator.generate_complete_table(["a"], ["a"])
         self.assertEqual(len(table_data["truth_table"]), 2)
 
-    # def test_always_true(self):
-    #     """Тест всегда истинного выражения"""
-    #     # a | !a - всегда истина
-    #     parsed = self.processor.validate_and_parse("a|!a")
-    #     self.assertTrue(parsed["is_valid"])
-    #
-    #     table_data = self.generator.generate_complete_table(
-    #         parsed["variables"],
-    #         parsed["postfix_tokens"]
-    #     )
-    #
-    #     # Все строки должны быть истинными
-    #     self.assertEqual(len(table_data["sdnf_numeric"]), 2)  # для одной переменной
-    #     self.assertEqual(len(table_data["sknf_numeric"]), 0)
-
-    # def test_always_false(self):
-    #     """Тест всегда ложного выражения"""
-    #     # a & !a - всегда ложь
-    #     parsed = self.processor.validate_and_parse("a&!a")
-    #     self.assertTrue(parsed["is_valid"])
-    #
-    #     table_data = self.generator.generate_complete_table(
-    #         parsed["variables"],
-    #         parsed["postfix_tokens"]
-    #     )
-    #
-    #     # Все строки должны быть ложными
-    #     self.assertEqual(len(table_data["sdnf_numeric"]), 0)
-    #     self.assertEqual(len(table_data["sknf_numeric"]), 2)  # для одной переменной
+    def test_always_true(self):
+        """Тест всегда истинного выражения"""
+        # a | !a - всегда истина
+        parsed = self.processor.validate_and_parse("a|!a")
+        self.assertTrue(parsed["is_valid"])
+
+        table_data = self.generator.generate_complete_table(
+            parsed["variables"],
+            parsed["postfix_tokens"]
+        )
+
+        # Все строки должны быть истинными
+        self.assertEqual(len(table_data["sdnf_numeric"]), 2)  # для одной переменной
+        self.assertEqual(len(table_data["sknf_numeric"]), 0)
+
+    def test_always_false(self):
+        """Тест всегда ложного выражения"""
+        # a & !a - всегда ложь
+        parsed = self.processor.validate_and_parse("a&!a")
+        self.assertTrue(parsed["is_valid"])
+
+        table_data = self.generator.generate_complete_table(
+            parsed["variables"],
+            parsed["postfix_tokens"]
+        )
+
+        # Все строки должны быть ложными
+        self.assertEqual(len(table_data["sdnf_numeric"]), 0)
+        self.assertEqual(len(table_data["sknf_numeric"]), 2)  # для одной переменной
 
     def test_multiple_variables(self):
         """Тест с максимальным количеством переменных"""
@@ -448,6 +770,573 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(table_data["total_rows"], 32)  # 2^5 = 32
 
 
+class TestExpressionDAG(unittest.TestCase):
+    def test_common_subexpressions_shared(self):
+        """Тест хэш-консинга одинаковых подвыражений"""
+        # (a & b) | (b & a) -> (a & b)
+        dag = ExpressionDAG(["a", "b", "&", "b", "a", "&", "|", "a", "b", "&", "->"])
+        operators = [dag.nodes[i][0] for i in dag.program]
+        self.assertEqual(operators.count("&"), 1)
+        self.assertEqual(dag.unique_subterms, 5)
+
+    def test_constant_folding(self):
+        """Тест сворачивания констант"""
+        dag = ExpressionDAG(["a", "0", "&", "b", "|"])
+        self.assertEqual(dag.nodes[dag.root], ("var", "b"))
+        self.assertEqual(dag.variables, ["b"])
+
+        dag = ExpressionDAG(["a", "0", "->"])
+        self.assertEqual(dag.nodes[dag.root][0], "!")
+
+    def test_matches_postfix_evaluation(self):
+        """Тест совпадения с эталонным вычислением постфиксной записи"""
+        generator = TruthTableGenerator()
+        postfix = ["a", "b", "!", "->", "c", "a", "|", "~", "b", "&"]
+        dag = ExpressionDAG(postfix)
+        for row in range(8):
+            values = generator._generate_variable_combination(["a", "b", "c"], row, 3)
+            self.assertEqual(dag.evaluate(values), generator._evaluate_postfix(postfix, values))
+
+    def test_column_evaluation(self):
+        """Тест вычисления по битовым столбцам против построчного эталона"""
+        generator = TruthTableGenerator()
+        variables = ["a", "b", "c", "d"]
+        expressions = [
+            ["a", "b", "!", "->", "c", "a", "|", "~", "b", "&"],
+            ["a", "!", "!", "d", "~", "b", "c", "->", "|"],
+            ["c", "c", "&", "a", "a", "!", "->", "~"],
+            ["d"]
+        ]
+        for postfix in expressions:
+            column = ExpressionDAG(postfix).evaluate_columns(variables)
+            for row in range(16):
+                values = generator._generate_variable_combination(variables, row, 4)
+                self.assertEqual(bool(column >> row & 1), generator._evaluate_postfix(postfix, values))
+
+        by_rows = TruthTableGenerator("rows").generate_complete_table(variables, expressions[1])
+        by_columns = generator.generate_complete_table(variables, expressions[1])
+        self.assertEqual(by_rows.result_bits, by_columns.result_bits)
+        with self.assertRaises(ValueError):
+            TruthTableGenerator("numpy")
+
+    def test_invalid_postfix(self):
+        """Тест некорректной постфиксной записи"""
+        with self.assertRaises(ValueError):
+            ExpressionDAG(["a", "&"])
+        with self.assertRaises(ValueError):
+            ExpressionDAG(["a", "b"])
+
+
+class TestExpressionRewriter(unittest.TestCase):
+    def setUp(self):
+        self.rewriter = ExpressionRewriter()
+
+    def test_rewrite_rules(self):
+        """Тест правил упрощения"""
+        cases = [
+            (["a", "a", "b", "|", "&"], ["a"]),                       # поглощение
+            (["a", "!", "!", "b", "&"], ["a", "b", "&"]),             # двойное отрицание
+            (["a", "b", "&", "b", "a", "&", "&"], ["a", "b", "&"]),   # идемпотентность
+            (["a", "a", "!", "|", "b", "&"], ["b"]),                  # дополнение и константы
+            (["a", "0", "|", "1", "->"], ["1"]),
+            (["a", "b", "->", "a", "!", "|"], ["b", "a", "!", "|"]),  # понижение импликации
+            (["a", "b", "~", "a", "b", "~", "!", "|"], ["1"]),
+            (["a", "!", "b", "!", "~"], ["a", "b", "~"])
+        ]
+        for postfix, expected in cases:
+            self.assertEqual(self.rewriter.simplify(postfix), expected)
+        # Эквивалентность без упрощений не раскрывается
+        self.assertEqual(self.rewriter.simplify(["a", "b", "~"]), ["a", "b", "~"])
+
+    def test_random_expressions_equivalent(self):
+        """Тест равносильности упрощенных выражений на всех наборах"""
+        generator = random.Random(7)
+
+        def random_postfix(depth):
+            if depth == 0 or generator.random() < 0.2:
+                return [generator.choice("abcd01" if generator.random() < 0.1 else "abcd")]
+            if generator.random() < 0.2:
+                return random_postfix(depth - 1) + ["!"]
+            return random_postfix(depth - 1) + random_postfix(depth - 1) + [generator.choice(["&", "|", "->", "~"])]
+
+        variables = ["a", "b", "c", "d"]
+        for _ in range(300):
+            postfix = random_postfix(6)
+            simplified = self.rewriter.simplify(postfix)
+            self.assertLessEqual(len(simplified), len(postfix))
+            self.assertIsNone(self.rewriter.find_counterexample(postfix, simplified, variables))
+
+        # Случайные наборы и найденный контрпример
+        self.assertTrue(self.rewriter.verify(["a", "b", "|"], ["b", "a", "|"], variables, exhaustive_limit=0))
+        counterexample = self.rewriter.find_counterexample(["a", "b", "&"], ["a"], ["a", "b"])
+        self.assertEqual(counterexample, {"a": True, "b": False})
+
+    def test_generator_uses_simplified_expression(self):
+        """Тест упрощения при построении таблицы с проверкой на всех наборах"""
+        variables = ["a", "b", "c"]
+        postfix = ["a", "a", "b", "|", "&", "c", "c", "!", "&", "|"]
+        plain = TruthTableGenerator(simplify=False).generate_complete_table(variables, postfix)
+        generator = TruthTableGenerator("rows", verify_simplification=True)
+        self.assertEqual(generator._optimize_expression(postfix, variables), ["a"])
+        self.assertEqual(generator.generate_complete_table(variables, postfix).result_bits, plain.result_bits)
+        with self.assertRaises(ValueError):
+            generator.generate_complete_table(variables, ["a", "x", "x", "!", "&", "|"])
+
+
+class TestBDD(unittest.TestCase):
+    def test_isop_prime_irredundant(self):
+        """Тест покрытия Минато–Морреале: между границами, из простых и без лишних кубов"""
+        generator = random.Random(5)
+        for _ in range(100):
+            num_vars = generator.randint(1, 5)
+            on_bits = generator.getrandbits(1 << num_vars)
+            dc_bits = generator.getrandbits(1 << num_vars) & ~on_bits
+            bdd = BDD(num_vars)
+            lower = bdd.from_bits(on_bits)
+            self.assertEqual(bdd.count(lower), bin(on_bits).count("1"))
+            cubes, _ = bdd.isop(lower, bdd.apply('|', lower, bdd.from_bits(dc_bits)))
+
+            cube_bits = [MinimizationEngine._implicant_cover_bits(value, mask) for value, mask in cubes]
+            covered = 0
+            for index, ((value, mask), bits) in enumerate(zip(cubes, cube_bits)):
+                self.assertEqual(bits & ~(on_bits | dc_bits), 0)
+                for bit in (1 << position for position in range(num_vars) if not mask >> position & 1):
+                    wider = MinimizationEngine._implicant_cover_bits(value & ~bit, mask | bit)
+                    self.assertNotEqual(wider & ~(on_bits | dc_bits), 0)
+                others = 0
+                for other_index, other_bits in enumerate(cube_bits):
+                    if other_index != index:
+                        others |= other_bits
+                self.assertNotEqual(bits & on_bits & ~others, 0)
+                covered |= bits
+            self.assertEqual(on_bits & ~covered, 0)
+
+    def test_minimize_expression_without_table(self):
+        """Тест минимизации по BDD из выражения с 24 переменными"""
+        variables = [f"x{i}" for i in range(24)]
+        postfix = []
+        for i in range(0, 24, 2):
+            postfix += [variables[i], variables[i + 1], "&"] + (["|"] if i else [])
+        results = MinimizationEngine().minimize_expression(postfix, variables)
+
+        self.assertEqual(results["truth_table_info"]["sknf_count"], 3 ** 12)
+        self.assertEqual(len(results["sdnf_results"]["bdd"]["cover"]), 12)
+        self.assertIn("(x0 & x1)", results["sdnf_results"]["bdd"]["expression"])
+        self.assertEqual(len(results["sknf_results"]["bdd"]["cover"]), 2 ** 12)
+
+        table = TruthTableGenerator().generate_complete_table(["a", "b", "c"], ["a", "b", "&", "c", "|"])
+        engine_results = MinimizationEngine().perform_all_minimizations(table, ["a", "b", "c"])
+        self.assertEqual(engine_results["sdnf_results"]["bdd"]["expression"],
+                         MinimizationEngine().minimize_expression(["a", "b", "&", "c", "|"],
+                                                                  ["a", "b", "c"])["sdnf_results"]["bdd"]["expression"])
+        self.assertEqual(sorted(engine_results["sknf_results"]["bdd"]["cover"]), ["-00", "0-0"])
+
+
+class TestCoverSolver(unittest.TestCase):
+    @staticmethod
+    def _bits(*indices):
+        return sum(1 << i for i in indices)
+
+    def test_exact_cover_beats_greedy(self):
+        """Тест точного покрытия там, где жадный выбор дает лишнюю строку"""
+        rows = [self._bits(1, 2, 3, 4), self._bits(1, 2, 5), self._bits(3, 4, 6), self._bits(5), self._bits(6)]
+        target = self._bits(1, 2, 3, 4, 5, 6)
+        solver = CoverSolver()
+
+        self.assertEqual(solver.solve(rows, target), [1, 2])
+        self.assertTrue(solver.last_solution_exact)
+
+    def test_costs_respected(self):
+        """Тест учета стоимости строк"""
+        rows = [self._bits(0, 1), self._bits(0), self._bits(1)]
+        target = self._bits(0, 1)
+
+        self.assertEqual(CoverSolver().solve(rows, target, [5, 1, 1]), [1, 2])
+        self.assertEqual(CoverSolver().solve(rows, target, [1, 1, 1]), [0])
+
+    def test_zero_budget_falls_back_to_greedy(self):
+        """Тест резервного жадного алгоритма при нулевом бюджете времени"""
+        # Циклическое ядро без существенных строк: f = Σ(0, 1, 2, 5, 6, 7)
+        engine = MinimizationEngine()
+        primes = engine._prime_implicant_masks([0, 1, 2, 5, 6, 7], 3)
+        rows = [bits for _, _, bits in primes]
+        target = engine._indices_to_bits([0, 1, 2, 5, 6, 7])
+        solver = CoverSolver(time_budget=0)
+
+        chosen = solver.solve(rows, target)
+        self.assertFalse(solver.last_solution_exact)
+        covered = 0
+        for i in chosen:
+            covered |= rows[i]
+        self.assertEqual(covered, target)
+
+
+class TestEspressoMinimizer(unittest.TestCase):
+    def setUp(self):
+        self.minimizer = EspressoMinimizer()
+
+    def test_cyclic_function(self):
+        """Тест циклической функции Σ(0, 1, 2, 5, 6, 7)"""
+        cover = self.minimizer.minimize([(m, 0) for m in [0, 1, 2, 5, 6, 7]], 3)
+        self.assertEqual(self.minimizer.cost(cover, 3), (3, 6))
+
+    def test_dont_cares_used(self):
+        """Тест использования безразличных наборов"""
+        # f = Σ(1, 3) + d(5, 7) -> c
+        cover = self.minimizer.minimize([(1, 0), (3, 0)], 3, dc_set=[(5, 0), (7, 0)])
+        self.assertEqual(cover, [(1, 0b110)])
+
+    def test_wide_function_from_cubes(self):
+        """Тест функции от 32 переменных, заданной кубами"""
+        num_vars = 32
+        full = (1 << num_vars) - 1
+        base = (0b1011 << 20, full & ~(0b1111 << 20))
+        # Базовый куб, разбитый на 8 частей по трем переменным
+        fragments = []
+        for combo in range(8):
+            value, mask = base
+            for j, bit in enumerate((1, 1 << 7, 1 << 30)):
+                mask &= ~bit
+                if combo >> j & 1:
+                    value |= bit
+            fragments.append((value, mask))
+
+        self.assertEqual(self.minimizer.minimize(fragments, num_vars), [base])
+
+    def test_complement_and_tautology(self):
+        """Тест дополнения и проверки тавтологии"""
+        cover = [(0b10, 0b01), (0b01, 0b00)]  # a | (!a & b)
+        complement = self.minimizer.complement(cover, 2)
+        self.assertEqual(complement, [(0, 0)])  # !a & !b
+        self.assertTrue(self.minimizer.is_tautology(cover + complement, 2))
+        self.assertFalse(self.minimizer.is_tautology(cover, 2))
+
+    def test_complement_supercube(self):
+        """Тест супер-куба дополнения, построенного без самого дополнения"""
+        generator = random.Random(7)
+        full = (1 << 5) - 1
+        for _ in range(300):
+            cover = []
+            for _ in range(generator.randint(0, 6)):
+                mask = generator.getrandbits(5)
+                cover.append((generator.getrandbits(5) & ~mask, mask))
+            complement = self.minimizer._complement(cover, full)
+            expected = self.minimizer._supercube(complement) if complement else None
+            self.assertEqual(self.minimizer._complement_supercube(cover, full), expected)
+
+    def test_wide_random_function_is_fast(self):
+        """Тест: 60 случайных кубов от 30 переменных минимизируются без построения OFF-множества"""
+        generator = random.Random(60)
+        num_vars = 30
+        full = (1 << num_vars) - 1
+        on_set = []
+        for _ in range(60):
+            value, mask = 0, full
+            for bit in generator.sample(range(num_vars), generator.randint(3, 8)):
+                mask &= ~(1 << bit)
+                value |= generator.getrandbits(1) << bit
+            on_set.append((value, mask))
+
+        start = time.perf_counter()
+        cover = self.minimizer.minimize(on_set, num_vars)
+        self.assertLess(time.perf_counter() - start, 20)
+        self.assertLessEqual(len(cover), len(on_set))
+        for cube in cover:
+            self.assertTrue(self.minimizer._covers(on_set, cube, full))
+        for cube in on_set:
+            self.assertTrue(self.minimizer._covers(cover, cube, full))
+
+    def test_engine_passes_time_budget(self):
+        """Тест передачи предела времени Espresso из MinimizationEngine"""
+        engine = MinimizationEngine(espresso_effort=5, espresso_time_budget=0.5)
+        self.assertEqual(engine.espresso_minimizer.effort, 5)
+        self.assertEqual(engine.espresso_minimizer.time_budget, 0.5)
+        self.assertIsNone(MinimizationEngine().espresso_minimizer.time_budget)
+
+
+class TestMinimizationCache(unittest.TestCase):
+    def test_npn_class_count(self):
+        """Тест числа NPN-классов функций трех переменных"""
+        classes = {npn_canonical_form(bits, 3)[0] for bits in range(256)}
+        self.assertEqual(len(classes), 14)
+
+    def test_equivalent_function_hits_cache(self):
+        """Тест попадания в кэш для функции с переставленными и инвертированными входами"""
+        system = LogicMinimizationSystem(cache=MinimizationCache())
+        system.execute_minimization_pipeline("(a & b) | c")
+        system.execute_minimization_pipeline("!((!c) & (!(a & b)))")  # та же функция
+        self.assertEqual(system.cache.memory_hits, 1)
+
+        result = system.execute_minimization_pipeline("((!b) & c) | (!a)")
+        self.assertEqual(system.cache.memory_hits, 2)
+        self.assertEqual(system.cache.misses, 1)
+        sdnf = result["raw_data"]["sdnf_results"]["calculation"]
+        self.assertEqual(sorted(sdnf["cover"]), ["-01", "0--"])
+        sknf = result["raw_data"]["sknf_results"]["calculation"]
+        self.assertEqual(sorted(sknf["cover"]), ["1-0", "11-"])
+
+    def test_inverted_output_swaps_forms(self):
+        """Тест инверсии выхода: покрытия СДНФ и СКНФ меняются местами"""
+        system = LogicMinimizationSystem(cache=MinimizationCache())
+        system.execute_minimization_pipeline("a & b")
+        result = system.execute_minimization_pipeline("!(a & b)")
+        self.assertEqual(system.cache.memory_hits, 1)
+        self.assertEqual(result["raw_data"]["sknf_results"]["tabular"]["expression"], "!a | !b")
+        self.assertEqual(sorted(result["raw_data"]["sdnf_results"]["espresso"]["cover"]), ["-0", "0-"])
+
+    def test_cache_hit_renders_karnaugh_map(self):
+        """Тест: при попадании в кэш карта Карно и ее этапы те же, что и без кэша"""
+        expression, dont_cares = "(!a & c) | (b & !d) | (a & b & c)", [0, 15]
+        system = LogicMinimizationSystem(cache=MinimizationCache())
+        system.execute_minimization_pipeline("(!b & c) | (a & !d) | (a & b & c)", dont_cares)  # a и b переставлены
+        cached = system.execute_minimization_pipeline(expression, dont_cares)
+        self.assertEqual(system.cache.memory_hits, 1)
+        computed = LogicMinimizationSystem().execute_minimization_pipeline(expression, dont_cares)
+
+        def karnaugh_lines(result):
+            lines = result["formatted_output"].split("\n")
+            blocks = [index for index, line in enumerate(lines) if line == "▸ Карта Карно:"]
+            return [[line for line in lines[start:lines.index("", start)] if not line.startswith(("  Этапы:", "  Результат:"))]
+                    for start in blocks]
+
+        self.assertEqual(karnaugh_lines(cached), karnaugh_lines(computed))
+        for form in ("sdnf_results", "sknf_results"):
+            cached_map = cached["raw_data"][form]["karnaugh"]["details"]["karnaugh_map"]
+            computed_map = computed["raw_data"][form]["karnaugh"]["details"]["karnaugh_map"]
+            self.assertEqual(sorted(cached["raw_data"][form]["karnaugh"]["cover"]),
+                             sorted(computed["raw_data"][form]["karnaugh"]["cover"]))
+            self.assertEqual(cached_map["grid"], computed_map["grid"])
+            self.assertEqual(cached_map["groups"], computed_map["groups"])
+            self.assertEqual({cached_map["groups"][i]["pattern"] for i in cached_map["selected"]},
+                             {computed_map["groups"][i]["pattern"] for i in computed_map["selected"]})
+
+    def test_cache_hit_supports_update(self):
+        """Тест пошагового пересчета результата, полученного из кэша"""
+        expression = "!((!c) & (!(a & b)))"
+        system = LogicMinimizationSystem(cache=MinimizationCache())
+        system.analyze_expression("(a & b) | c")
+        cached = system.analyze_expression(expression)
+        self.assertEqual(system.cache.memory_hits, 1)
+        computed = LogicMinimizationSystem().analyze_expression(expression)
+        self.assertEqual(cached["incremental_state"], computed["incremental_state"])
+
+        engine = system.minimization_engine
+        updated = engine.update_minimizations(cached, added=[0], removed=[7])
+        expected = engine.update_minimizations(computed, added=[0], removed=[7])
+        self.assertEqual(updated["truth_table_info"], expected["truth_table_info"])
+        for form_type in ("sdnf", "sknf"):
+            self.assertEqual(updated["incremental_state"][form_type]["primes"],
+                             expected["incremental_state"][form_type]["primes"])
+            self.assertEqual(updated[f"{form_type}_results"]["calculation"]["cover"],
+                             expected[f"{form_type}_results"]["calculation"]["cover"])
+
+    def test_disk_tier(self):
+        """Тест второго уровня кэша на диске"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "covers.sqlite")
+            first = MinimizationCache(path=path)
+            LogicMinimizationSystem(cache=first).execute_minimization_pipeline("a -> b")
+            first.close()
+
+            second = MinimizationCache(path=path)
+            system = LogicMinimizationSystem(cache=second)
+            result = system.execute_minimization_pipeline("b -> a")
+            second.close()
+            self.assertEqual(second.stats["disk_hits"], 1)
+            self.assertEqual(result["raw_data"]["sdnf_results"]["karnaugh"]["expression"], "(a) | (!b)")
+
+    def test_dont_cares_are_part_of_key(self):
+        """Тест: функции с разными безразличными наборами не смешиваются"""
+        system = LogicMinimizationSystem(cache=MinimizationCache())
+        system.execute_minimization_pipeline("(!a) & b", [3])
+        result = system.execute_minimization_pipeline("(!a) & b", [2])  # безразличный набор не соседний
+        self.assertEqual(system.cache.misses, 2)
+        self.assertEqual(result["raw_data"]["sdnf_results"]["calculation"]["expression"], "!a & b")
+
+        result = system.execute_minimization_pipeline("(!a) & b", [0])  # эквивалентна первой паре
+        self.assertEqual(system.cache.memory_hits, 1)
+        self.assertEqual(result["raw_data"]["sdnf_results"]["calculation"]["expression"], "!a")
+
+
+class TestMultiOutputMinimizer(unittest.TestCase):
+    def setUp(self):
+        self.minimizer = MultiOutputMinimizer()
+
+    def test_tagged_prime_implicants(self):
+        """Тест многовыходных простых импликант: общий терм сохраняется"""
+        # f1 = Σ(2, 3), f2 = Σ(3, 7): терм 011 простой для пары выходов
+        primes = self.minimizer.prime_implicants([[2, 3], [3, 7]], 3)
+        self.assertIn((0b011, 0, 0b11), primes)
+        self.assertIn((0b010, 0b001, 0b01), primes)
+        self.assertIn((0b011, 0b100, 0b10), primes)
+
+    def test_shared_products_reduce_cost(self):
+        """Тест уменьшения числа термов при совместной минимизации"""
+        engine = MinimizationEngine()
+        tables = [{"sdnf_numeric": [2, 3, 5, 6]}, {"sdnf_numeric": [5, 6, 7]}]
+        results = engine.minimize_multi_output(tables, ["a", "b", "c"])
+
+        self.assertIn("101", results["shared_terms"])
+        self.assertEqual(results["cost"]["products"], 4)
+        self.assertEqual(results["separate_cost"]["products"], 5)
+        self.assertEqual(results["outputs"][1]["expression"], "(a & !b & c) | (a & b)")
+
+    def test_multi_output_pipeline(self):
+        """Тест пайплайна для нескольких выражений"""
+        system = LogicMinimizationSystem()
+        result = system.execute_multi_output_pipeline(["a & b", "(a & b) | c"], [None, "(!a) & (!b) & (!c)"])
+        self.assertNotIn("error", result)
+        outputs = result["raw_data"]["outputs"]
+        self.assertEqual(outputs[0]["expression"], "a & b")
+        self.assertEqual(result["raw_data"]["variables"], ["a", "b", "c"])
+        self.assertIn("Различных термов", result["formatted_output"])
+
+
+class TestBatchMinimization(unittest.TestCase):
+    LINES = [
+        "# комментарий",
+        "a & b",
+        '{"id": "x", "expression": "a | b", "dont_cares": [0]}',
+        '{"expression": "a & x"}',
+        "{bad"
+    ]
+
+    def test_read_batch(self):
+        """Тест разбора входа: выражения, объекты JSON и ошибки"""
+        items = list(read_batch(self.LINES))
+        self.assertEqual([item[0] for item in items], [2, "x", 4, 5])
+        self.assertEqual(items[1][2], [0])
+        self.assertIsNotNone(items[3][3])
+
+    def test_run_batch(self):
+        """Тест пакетной обработки в процессе и пулом процессов"""
+        records = list(run_batch(read_batch(self.LINES), workers=0))
+        self.assertEqual([record["status"] for record in records], ["ok", "ok", "error", "error"])
+        self.assertEqual(records[0]["sdnf"]["calculation"]["expression"], "a & b")
+        self.assertEqual(records[1]["dont_care_numeric"], [0])
+
+        pooled = list(run_batch(read_batch(self.LINES), workers=2, ordered=False))
+        self.assertEqual(sorted(map(str, (r["id"] for r in pooled))), sorted(map(str, (r["id"] for r in records))))
+
+    def test_item_timeout(self):
+        """Тест ограничения времени на один элемент"""
+        def endless():
+            while True:
+                pass
+
+        with self.assertRaises(ItemTimeout):
+            run_with_timeout(endless, 0.05)
+        self.assertEqual(run_with_timeout(lambda: 1, 0.05), 1)
+
+
+class TestMinimizationBenchmark(unittest.TestCase):
+    def test_small_benchmark(self):
+        """Тест замеров на малых функциях: записи по всем методам и режимам, таблицы отчета"""
+        method_records = run_method_benchmark([3, 4], [0.5], seed=3, timeout=None, track_memory=False)
+        self.assertEqual(len(method_records), 2 * len(MinimizationEngine().minimization_methods["sdnf"]))
+        for record in method_records:
+            self.assertEqual(record["status"], "ok")
+            self.assertGreaterEqual(record["literals"], record["cubes"])
+        calculation = [record for record in method_records if record["method"] == "calculation"]
+        self.assertTrue(all(record["primes"] >= record["cubes"] for record in calculation))
+        self.assertEqual(random_function(4, 0.5, 3), random_function(4, 0.5, 3))
+
+        backend_records = run_backend_benchmark([3, 4], seed=3, timeout=None, track_memory=True)
+        self.assertEqual([record["mode"] for record in backend_records], ["columns", "rows"] * 2)
+        self.assertTrue(all(record["peak_memory_kib"] is not None for record in backend_records))
+        self.assertTrue(all(record["simplify"] is False for record in backend_records))
+        simplified = run_backend_benchmark([4], seed=3, timeout=None, track_memory=False, simplify=True)
+        self.assertEqual([record["simplify"] for record in simplified], [True, True])
+
+        report = format_report(method_records, backend_records)
+        self.assertIn("Наибольшее завершенное n по плотностям:", report)
+        self.assertTrue(any(line.strip().startswith("4 |") for line in report))
+
+
+class TestMinimizationServer(unittest.TestCase):
+    def test_coalescing_and_backpressure(self):
+        """Тест объединения одинаковых запросов и отказа при заполненной очереди"""
+        async def scenario():
+            server = MinimizationServer(max_pending=2, executor=ThreadPoolExecutor(2))
+            responses = await asyncio.gather(*[server.minimize({"expression": "a & !b"}) for _ in range(4)],
+                                             server.minimize({"expression": "a | b"}),
+                                             server.minimize({"expression": "a ~ b"}))
+            await server.close()
+            return server.stats, responses
+
+        stats, responses = asyncio.run(scenario())
+        self.assertEqual([status for status, _ in responses], [200] * 5 + [503])
+        self.assertEqual(responses[0][1]["sdnf_numeric"], [2])
+        self.assertEqual((stats.computations, stats.coalesced, stats.rejected), (2, 3, 1))
+
+    def test_http_roundtrip(self):
+        """Тест HTTP-интерфейса: минимизация и счетчики"""
+        async def request(port, head, body=b""):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(head.encode() + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            response = await reader.read()
+            writer.close()
+            status_line, _, payload = response.partition(b"\r\n\r\n")
+            return int(status_line.split()[1]), json.loads(payload)
+
+        async def scenario():
+            server = MinimizationServer(executor=ThreadPoolExecutor(1))
+            _, port = await server.start(port=0)
+            results = [await request(port, "POST /minimize HTTP/1.1\r\n", b'{"id": 1, "expression": "a | b"}'),
+                       await request(port, "POST /minimize HTTP/1.1\r\n", b"{"),
+                       await request(port, "GET /stats HTTP/1.1\r\n")]
+            await server.close()
+            return results
+
+        (status, record), (bad_status, _), (_, stats) = asyncio.run(scenario())
+        self.assertEqual((status, record["id"], record["status"]), (200, 1, "ok"))
+        self.assertEqual(bad_status, 400)
+        self.assertEqual((stats["requests"], stats["completed"], stats["failed"]), (2, 1, 1))
+        self.assertIsNotNone(stats["latency_ms"]["p50"])
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    def test_nested_stages(self):
+        """Тест вложенных этапов: счетчики, пиковая память и формат Trace Event"""
+        profiler = PipelineProfiler()
+        with profiler.stage("outer"):
+            profiler.count("items", 2)
+            with profiler.stage("inner"):
+                data = [0] * 100000
+                profiler.append("rounds", 3)
+                profiler.append("rounds", 1)
+            del data
+        outer, inner = profiler.summary()["stages"]
+        self.assertEqual((outer["depth"], inner["depth"]), (0, 1))
+        self.assertEqual(outer["counters"], {"items": 2})
+        self.assertEqual(inner["counters"], {"rounds": [3, 1]})
+        self.assertGreater(inner["peak_memory_kib"], 700)
+        self.assertGreaterEqual(outer["peak_memory_kib"], inner["peak_memory_kib"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            profiler.export_trace(path)
+            with open(path, encoding="utf-8") as trace_file:
+                events = json.load(trace_file)["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["outer", "inner"])
+        self.assertEqual(events[1]["ph"], "X")
+
+    def test_pipeline_profile(self):
+        """Тест профилирования пайплайна"""
+        system = LogicMinimizationSystem()
+        result = system.execute_minimization_pipeline("(a | b) & !c", profiler=PipelineProfiler(track_memory=False))
+        stages = {}
+        for stage in result["raw_data"]["profile"]["stages"]:
+            stages.setdefault(stage["name"], stage)
+        for name in ("validation", "truth_table", "minimization", "sdnf.calculation", "presentation"):
+            self.assertIn(name, stages)
+        self.assertEqual(stages["prime_implicants"]["counters"]["implicants_per_round"], [3, 2])
+        self.assertIn("merge_comparisons", stages["prime_implicants"]["counters"])
+        self.assertEqual(stages["sdnf.tabular"]["counters"], {"cover_cache_hits": 1})
+        self.assertIsNone(system.minimization_engine.profiler)
+        self.assertNotIn("profile", system.execute_minimization_pipeline("a & b")["raw_data"])
+
+
 def run_tests():
     """Запуск всех тестов с подсчетом покрытия"""
     # Создаем тестовый набор
@@ -0,0 +1,118 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class TruthTableRows(Sequence):
+    """Строки таблицы в прежнем виде словарей; создаются при обращении"""
+
+    def __init__(self, table: "TruthTable"):
+        self._table = table
+
+    def __len__(self) -> int:
+        return self._table.total_rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер строки вне таблицы")
+        return self._table.row(index)
+
+
+class TruthTable(Mapping):
+    """Таблица истинности в столбцовом виде.
+
+    Значения функции и безразличные наборы хранятся упакованными битовыми
+    множествами (бит i — строка i). Номера наборов СДНФ/СКНФ, строки-словари
+    и текстовое представление вычисляются при первом обращении. Для
+    совместимости объект читается как словарь с прежними ключами.
+    """
+
+    KEYS = ("variables", "truth_table", "sdnf_numeric", "sknf_numeric", "dont_care_numeric", "total_rows")
+
+    def __init__(self, variables: List[str], result_bits: int, dont_care_bits: int = 0):
+        self.variables = list(variables)
+        self.result_bits = result_bits
+        self.dont_care_bits = dont_care_bits
+        self._views: Dict[str, Any] = {}
+        self._builders: Dict[str, Callable[[], Any]] = {
+            "variables": lambda: self.variables,
+            "truth_table": lambda: TruthTableRows(self),
+            "sdnf_numeric": lambda: self._indices(self.minterm_bits),
+            "sknf_numeric": lambda: self._indices(self.maxterm_bits),
+            "dont_care_numeric": lambda: self._indices(self.dont_care_bits),
+            "total_rows": lambda: self.total_rows
+        }
+
+    @property
+    def total_rows(self) -> int:
+        return 1 << len(self.variables)
+
+    @property
+    def minterm_bits(self) -> int:
+        """Наборы, на которых функция истинна (без безразличных)"""
+        return self.result_bits & ~self.dont_care_bits
+
+    @property
+    def maxterm_bits(self) -> int:
+        """Наборы, на которых функция ложна (без безразличных)"""
+        return ((1 << self.total_rows) - 1) & ~self.result_bits & ~self.dont_care_bits
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._views:
+            if key not in self._builders:
+                raise KeyError(key)
+            self._views[key] = self._builders[key]()
+        return self._views[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def value(self, row_index: int) -> bool:
+        return bool((self.result_bits >> row_index) & 1)
+
+    def is_dont_care(self, row_index: int) -> bool:
+        return bool((self.dont_care_bits >> row_index) & 1)
+
+    def iter_values(self) -> Iterator[Optional[bool]]:
+        """Значения функции по строкам; None — безразличный набор"""
+        size = (self.total_rows + 7) // 8
+        results = self.result_bits.to_bytes(size, "little")
+        dont_cares = self.dont_care_bits.to_bytes(size, "little")
+        for row_index in range(self.total_rows):
+            byte, bit = row_index >> 3, row_index & 7
+            yield None if dont_cares[byte] >> bit & 1 else bool(results[byte] >> bit & 1)
+
+    def row(self, row_index: int) -> Dict[str, Any]:
+        """Строка таблицы в виде словаря"""
+        num_vars = len(self.variables)
+        binary = format(row_index, f'0{num_vars}b') if num_vars else ''
+        return {
+            "row_index": row_index,
+            "variable_values": {variable: bit == '1' for variable, bit in zip(self.variables, binary)},
+            "result": self.value(row_index),
+            "binary_representation": binary,
+            "dont_care": self.is_dont_care(row_index)
+        }
+
+    def display_lines(self) -> List[str]:
+        """Текстовое представление таблицы (строится один раз)"""
+        if "display" not in self._views:
+            header_line = " | ".join(f"{name:^3}" for name in self.variables + ["F"])
+            lines = [header_line, "-" * len(header_line)]
+            num_vars = len(self.variables)
+            for row_index in range(self.total_rows):
+                values = list(format(row_index, f'0{num_vars}b')) if num_vars else []
+                values.append("-" if self.is_dont_care(row_index) else str(int(self.value(row_index))))
+                lines.append(" | ".join(f"{value:^3}" for value in values))
+            self._views["display"] = lines
+        return self._views["display"]
+
+    @staticmethod
+    def _indices(bits: int) -> List[int]:
+        return [i for i, digit in enumerate(reversed(format(bits, 'b'))) if digit == '1'] if bits else []
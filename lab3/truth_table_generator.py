@@ -1,8 +1,71 @@
-from typing import List, Dict, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from expression_dag import ExpressionDAG
+from expression_rewriter import ExpressionRewriter
+from truth_table import TruthTable
+
+# Блок таблицы для пула процессов: (граф, переменные, число переменных блока, номер блока)
+BlockJob = Tuple[ExpressionDAG, List[str], int, int]
+
+
+def evaluate_block(job: BlockJob) -> bytes:
+    """Столбец значений одного блока строк [block·2^k, (block + 1)·2^k), k — block_variables.
+
+    Младшие k переменных пробегают в блоке все значения, старшие постоянны и
+    равны разрядам номера блока. Результат — байты столбца (младший бит — первая строка).
+    """
+    expression_dag, variables, block_variables, block = job
+    high = len(variables) - block_variables
+    width = 1 << block_variables
+    full = (1 << width) - 1
+    columns = {variable: full if (block >> (high - 1 - index)) & 1 else 0
+               for index, variable in enumerate(variables[:high])}
+    columns.update(zip(variables[high:], _block_columns(block_variables)))
+    return expression_dag.evaluate_bits(columns, width).to_bytes(width // 8, "little")
+
+
+@lru_cache(maxsize=None)
+def _block_columns(block_variables: int) -> Tuple[int, ...]:
+    """Столбцы младших переменных одинаковы во всех блоках и строятся один раз на процесс"""
+    return tuple(ExpressionDAG.variable_columns(block_variables))
 
 
 class TruthTableGenerator:
-    def __init__(self):
+    EVALUATION_MODES = ("columns", "rows")
+    # С какого размера таблицы упрощение окупается при вычислении по столбцам:
+    # на меньших таблицах операция над столбцом дешевле переписывания узла
+    SIMPLIFY_MIN_COLUMN_ROWS = 1 << 20
+
+    def __init__(self, evaluation_mode: str = "columns", simplify: Optional[bool] = None,
+                 verify_simplification: bool = False, processes: Optional[int] = 1, shard_variables: int = 20):
+        """evaluation_mode: "columns" — выражение вычисляется один раз над битовыми
+        столбцами всей таблицы, "rows" — построчно (для сверки).
+
+        simplify — алгебраическое упрощение выражения перед вычислением; по
+        умолчанию (None) выполняется построчно всегда, а по столбцам — начиная
+        с SIMPLIFY_MIN_COLUMN_ROWS строк. verify_simplification — проверка
+        упрощенного выражения на всех наборах (при расхождении вычисляется исходное).
+
+        Таблица более чем из 2^shard_variables строк вычисляется по столбцам
+        выровненными блоками по 2^shard_variables строк: старшие переменные в
+        блоке — константы, поэтому блоки независимы. processes — число
+        процессов для блоков (None — по числу ядер, 1 — в текущем процессе).
+        """
+        if evaluation_mode not in self.EVALUATION_MODES:
+            raise ValueError(f"Неизвестный режим вычисления: {evaluation_mode}")
+        if shard_variables < 3:
+            raise ValueError("Блок таблицы должен содержать не менее 2^3 строк")
+        if processes is not None and processes < 1:
+            raise ValueError(f"Некорректное число процессов: {processes}")
+        self.evaluation_mode = evaluation_mode
+        self.simplify = simplify
+        self.verify_simplification = verify_simplification
+        self.processes = processes
+        self.shard_variables = shard_variables
+        self.expression_rewriter = ExpressionRewriter()
         self.logical_operations = {
             '!': lambda a: not a,
             '&': lambda a, b: a and b,
@@ -11,43 +74,91 @@ class TruthTableGenerator:
             '~': lambda a, b: a == b
         }
 
-    def generate_complete_table(self, variables: List[str], postfix_tokens: List[str]) -> Dict[str, Any]:
-        """Генерация полной таблицы истинности с дополнительной информацией"""
-        # Убрана оптимизация, т.к. она ломает сложные выражения; evaluate_postfix handles все операторы напрямую
-        optimized_tokens = postfix_tokens
-        truth_table = self._compute_truth_table(variables, optimized_tokens)
+    def generate_complete_table(self, variables: List[str], postfix_tokens: List[str],
+                                dont_care_indices: List[int] = None,
+                                dont_care_postfix: List[str] = None) -> TruthTable:
+        """Генерация полной таблицы истинности с дополнительной информацией.
 
-        return {
-            "variables": variables,
-            "truth_table": truth_table,
-            "sdnf_numeric": self._extract_sdnf_indices(truth_table),
-            "sknf_numeric": self._extract_sknf_indices(truth_table),
-            "total_rows": len(truth_table)
-        }
+        Результат хранит только столбец значений функции и читается как словарь
+        с ключами variables, truth_table, sdnf_numeric, sknf_numeric,
+        dont_care_numeric и total_rows.
+
+        Безразличные наборы задаются номерами (dont_care_indices) или
+        выражением в постфиксной записи (dont_care_postfix); такие строки
+        помечаются и не входят ни в СДНФ, ни в СКНФ.
+        """
+        optimized_tokens = self._optimize_expression(postfix_tokens, variables)
+        result_bits = self._compute_result_bits(variables, optimized_tokens)
+        dont_care_bits = self._collect_dont_cares(variables, dont_care_indices, dont_care_postfix)
+        return TruthTable(variables, result_bits, dont_care_bits)
+
+    def _collect_dont_cares(self, variables: List[str], dont_care_indices: List[int] = None,
+                            dont_care_postfix: List[str] = None) -> int:
+        """Безразличные наборы из списка и/или выражения (бит i — набор i)"""
+        table_size = 2 ** len(variables)
+        dont_care_bits = 0
+        for index in dont_care_indices or []:
+            if not 0 <= index < table_size:
+                raise ValueError(f"Номер безразличного набора вне диапазона: {index}")
+            dont_care_bits |= 1 << index
+        if dont_care_postfix:
+            dont_care_bits |= self._compute_result_bits(variables,
+                                                        self._optimize_expression(dont_care_postfix, variables))
+        return dont_care_bits
+
+    def _optimize_expression(self, postfix_tokens: List[str], variables: List[str]) -> List[str]:
+        """Алгебраическое упрощение выражения перед вычислением (ExpressionRewriter)"""
+        # Неизвестные переменные проверяются до упрощения: оно может их исключить
+        operators = ExpressionDAG.UNARY_OPERATORS | ExpressionDAG.BINARY_OPERATORS | {'0', '1'}
+        unknown_tokens = {token for token in postfix_tokens if token not in operators} - set(variables)
+        if unknown_tokens:
+            raise ValueError(f"Неизвестный токен: {sorted(unknown_tokens)[0]}")
+        simplify = self.simplify
+        if simplify is None:
+            simplify = self.evaluation_mode == "rows" or 2 ** len(variables) >= self.SIMPLIFY_MIN_COLUMN_ROWS
+        if not simplify:
+            return postfix_tokens
 
-    def _optimize_expression(self, postfix_tokens: List[str]) -> List[str]:
-        """Простая оптимизация выражения перед вычислением — отключена, возвращаем как есть"""
-        return postfix_tokens
+        simplified = self.expression_rewriter.simplify(postfix_tokens)
+        if self.verify_simplification and not self.expression_rewriter.verify(
+                postfix_tokens, simplified, variables, exhaustive_limit=len(variables)):
+            return postfix_tokens
+        return simplified
 
-    def _compute_truth_table(self, variables: List[str], postfix_tokens: List[str]) -> List[Dict]:
-        """Вычисление таблицы истинности"""
+    def _compute_result_bits(self, variables: List[str], postfix_tokens: List[str]) -> int:
+        """Столбец значений функции: бит i — результат на строке i"""
         num_variables = len(variables)
-        table_size = 2 ** num_variables
-        truth_table = []
+        expression_dag = self._build_expression_dag(variables, postfix_tokens)
+        if self.evaluation_mode == "columns":
+            if num_variables <= self.shard_variables:
+                return expression_dag.evaluate_columns(variables)
+            return self._evaluate_blocks(expression_dag, variables)
 
-        for row_index in range(table_size):
-            variable_values = self._generate_variable_combination(variables, row_index, num_variables)
-            result = self._evaluate_postfix(postfix_tokens, variable_values)
+        result_bits = 0
+        for row_index in range(2 ** num_variables):
+            if expression_dag.evaluate(self._generate_variable_combination(variables, row_index, num_variables)):
+                result_bits |= 1 << row_index
+        return result_bits
 
-            table_row = {
-                "row_index": row_index,
-                "variable_values": variable_values.copy(),
-                "result": result,
-                "binary_representation": self._get_binary_representation(row_index, num_variables)
-            }
-            truth_table.append(table_row)
+    def _evaluate_blocks(self, expression_dag: ExpressionDAG, variables: List[str]) -> int:
+        """Вычисление по столбцам блоками (см. evaluate_block), при processes != 1 — в пуле процессов"""
+        block_variables = self.shard_variables
+        jobs = [(expression_dag, variables, block_variables, block)
+                for block in range(1 << (len(variables) - block_variables))]
+        processes = min(self.processes or os.cpu_count() or 1, len(jobs))
+        if processes == 1:
+            return int.from_bytes(b"".join(map(evaluate_block, jobs)), "little")
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = pool.map(evaluate_block, jobs, chunksize=max(1, len(jobs) // (processes * 4)))
+            return int.from_bytes(b"".join(chunks), "little")
 
-        return truth_table
+    def _build_expression_dag(self, variables: List[str], postfix_tokens: List[str]) -> ExpressionDAG:
+        """Построение графа выражения: общие подвыражения вычисляются один раз на строку"""
+        expression_dag = ExpressionDAG(postfix_tokens)
+        unknown_tokens = set(expression_dag.variables) - set(variables)
+        if unknown_tokens:
+            raise ValueError(f"Неизвестный токен: {sorted(unknown_tokens)[0]}")
+        return expression_dag
 
     def _generate_variable_combination(self, variables: List[str], row_index: int, num_vars: int) -> Dict[str, bool]:
         """Генерация комбинации значений переменных для строки таблицы"""
@@ -93,16 +204,18 @@ class TruthTableGenerator:
 
     def _extract_sdnf_indices(self, truth_table: List[Dict]) -> List[int]:
         """Извлечение индексов строк где функция истинна (для СДНФ)"""
-        return [row["row_index"] for row in truth_table if row["result"]]
+        return [row["row_index"] for row in truth_table if row["result"] and not row.get("dont_care")]
 
     def _extract_sknf_indices(self, truth_table: List[Dict]) -> List[int]:
         """Извлечение индексов строк где функция ложна (для СКНФ)"""
-        return [row["row_index"] for row in truth_table if not row["result"]]
+        return [row["row_index"] for row in truth_table if not row["result"] and not row.get("dont_care")]
 
     def get_truth_table_display(self, truth_table_data: Dict) -> List[str]:
         """Форматирование таблицы истинности для отображения"""
         if not truth_table_data or "truth_table" not in truth_table_data:
             return ["Таблица истинности недоступна"]
+        if isinstance(truth_table_data, TruthTable):
+            return list(truth_table_data.display_lines())
 
         truth_table = truth_table_data["truth_table"]
         variables = truth_table_data["variables"]
@@ -120,7 +233,7 @@ class TruthTableGenerator:
         # Добавляем строки таблицы
         for row in truth_table:
             var_values = [str(int(row["variable_values"][var])) for var in variables]
-            result_value = str(int(row["result"]))
+            result_value = "-" if row.get("dont_care") else str(int(row["result"]))
             row_line = " | ".join(f"{val:^3}" for val in var_values + [result_value])
             display_lines.append(row_line)
 
@@ -161,6 +274,7 @@ class TruthTableGenerator:
             "sknf_expression": " & ".join([f"({clause})" for clause in sknf_terms]) if sknf_terms else "Истина",
             "sdnf_numeric": sdnf_indices,
             "sknf_numeric": sknf_indices,
+            "dont_care_numeric": truth_table_data.get("dont_care_numeric", []),
             "sdnf_count": len(sdnf_indices),
             "sknf_count": len(sknf_indices)
         }
\ No newline at end of file
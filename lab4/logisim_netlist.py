@@ -0,0 +1,540 @@
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# Направление вывода относительно цепи: вывод читает цепь, задает ее значение или и то и другое
+INPUT, OUTPUT, INOUT = 0, 1, 2
+
+# Вывод компонента: (имя, dx, dy, разрядность, направление); смещения — от точки loc компонента
+PinSpec = Tuple[str, int, int, int, int]
+
+GATE_KINDS = ("AND Gate", "OR Gate", "NAND Gate", "NOR Gate", "XOR Gate", "XNOR Gate")
+# Компоненты библиотеки Base (надписи, инструменты) не участвуют в соединениях
+SKIPPED_LIBRARIES = ("#Base",)
+
+_OPPOSITE = {"east": "west", "west": "east", "north": "south", "south": "north"}
+
+
+class Netlist:
+    """Список соединений одной схемы в компактных массивах.
+
+    Компоненты нумеруются в порядке появления в файле. Выводы всех
+    компонентов хранятся подряд: выводы компонента i занимают позиции с
+    pin_start[i] по pin_start[i + 1], для каждого известны цепь, разрядность
+    и направление. Обратный индекс net_start/net_members перечисляет выводы
+    каждой цепи; разрядность цепи — наибольшая из разрядностей ее выводов.
+    """
+
+    def __init__(self, name: str, kinds: List[str], labels: List[str], locations: array,
+                 attributes: List[Dict[str, str]], pin_start: array, pin_names: List[str], pin_nets: array,
+                 pin_widths: array, pin_directions: array, net_count: int, point_nets: Dict[Tuple[int, int], int]):
+        self.name = name
+        self.kinds = kinds
+        self.labels = labels
+        # Координаты компонентов: x и y компонента i — locations[2i] и locations[2i + 1]
+        self.locations = locations
+        self.attributes = attributes
+        self.pin_start = pin_start
+        self.pin_names = pin_names
+        self.pin_nets = pin_nets
+        self.pin_widths = pin_widths
+        self.pin_directions = pin_directions
+        self.net_count = net_count
+        self._point_nets = point_nets
+
+        self.net_widths = array('H', bytes(2 * net_count))
+        counts = array('i', bytes(4 * (net_count + 1)))
+        for pin, net in enumerate(pin_nets):
+            counts[net + 1] += 1
+            if pin_widths[pin] > self.net_widths[net]:
+                self.net_widths[net] = pin_widths[pin]
+        for net in range(net_count):
+            counts[net + 1] += counts[net]
+        self.net_start = array('i', counts)
+        self.net_members = array('i', bytes(4 * len(pin_nets)))
+        for pin, net in enumerate(pin_nets):
+            self.net_members[counts[net]] = pin
+            counts[net] += 1
+        self._pin_components = array('i', bytes(4 * len(pin_nets)))
+        for component in range(len(kinds)):
+            for pin in range(pin_start[component], pin_start[component + 1]):
+                self._pin_components[pin] = component
+
+    @property
+    def component_count(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def pin_count(self) -> int:
+        return len(self.pin_nets)
+
+    def location(self, component: int) -> Tuple[int, int]:
+        return self.locations[2 * component], self.locations[2 * component + 1]
+
+    def pins(self, component: int) -> List[Tuple[str, int, int, int]]:
+        """Выводы компонента: (имя, цепь, разрядность, направление)"""
+        return [(self.pin_names[pin], self.pin_nets[pin], self.pin_widths[pin], self.pin_directions[pin])
+                for pin in range(self.pin_start[component], self.pin_start[component + 1])]
+
+    def pin_net(self, component: int, pin_name: str) -> int:
+        for pin in range(self.pin_start[component], self.pin_start[component + 1]):
+            if self.pin_names[pin] == pin_name:
+                return self.pin_nets[pin]
+        raise ValueError(f"У компонента {component} ({self.kinds[component]}) нет вывода {pin_name}")
+
+    def net_pins(self, net: int) -> List[Tuple[int, str]]:
+        """Выводы цепи: (номер компонента, имя вывода)"""
+        return [(self._pin_components[pin], self.pin_names[pin])
+                for pin in self.net_members[self.net_start[net]:self.net_start[net + 1]]]
+
+    def net_at(self, x: int, y: int) -> Optional[int]:
+        """Цепь, проходящая через конец провода или вывод в точке (x, y)"""
+        return self._point_nets.get((x, y))
+
+    def find_components(self, kind: str) -> List[int]:
+        return [component for component, component_kind in enumerate(self.kinds) if component_kind == kind]
+
+
+class LogisimNetlistParser:
+    """Потоковый разбор файла Logisim 2.7 (.circ) в списки соединений.
+
+    Файл читается через iterparse, обработанные элементы сразу удаляются из
+    дерева. Концы проводов (<wire from to>) и выводы компонентов — точки
+    сетки; точки, соединенные проводами, объединяются в цепи системой
+    непересекающихся множеств. Положения выводов вычисляются по атрибутам
+    компонента так же, как в Logisim (значения по умолчанию в файл не
+    пишутся): вентили, NOT, Pin, Probe, Clock, Constant, Tunnel, Splitter,
+    Multiplexer, ROM, D и T триггеры, а также подсхемы этого же файла с
+    оформлением по умолчанию. Выводы подсхем известны только после чтения
+    всех схем, поэтому цепи строятся в конце разбора. Компоненты других
+    типов попадают в список без выводов.
+    """
+
+    def __init__(self):
+        # Имя главной схемы (<main name>) последнего разобранного файла
+        self.main_circuit: Optional[str] = None
+
+    def parse(self, source) -> Dict[str, Netlist]:
+        """Списки соединений всех схем файла; source — путь или двоичный поток"""
+        libraries: Dict[str, str] = {}
+        builders: Dict[str, _CircuitBuilder] = {}
+        circuit: Optional[_CircuitBuilder] = None
+        circuit_element = None
+        self.main_circuit = None
+
+        try:
+            for event, element in ET.iterparse(source, events=("start", "end")):
+                tag = element.tag
+                if event == "start":
+                    if tag == "circuit":
+                        circuit = _CircuitBuilder(element.get("name", ""))
+                        builders[circuit.name] = circuit
+                        circuit_element = element
+                    continue
+
+                if circuit is not None and tag == "wire":
+                    circuit.add_wire(_parse_point(element.get("from")), _parse_point(element.get("to")))
+                    circuit_element.clear()
+                elif circuit is not None and tag == "comp":
+                    attributes = {child.get("name"): child.get("val", child.text or "")
+                                  for child in element.findall("a")}
+                    library = element.get("lib")
+                    circuit.add_component(element.get("name", ""), libraries.get(library, "") if library else None,
+                                          _parse_point(element.get("loc")), attributes)
+                    circuit_element.clear()
+                elif tag == "circuit":
+                    circuit = None
+                    element.clear()
+                elif tag == "lib":
+                    libraries[element.get("name")] = element.get("desc", "")
+                    element.clear()
+                elif tag == "main":
+                    self.main_circuit = element.get("name")
+        except ET.ParseError as e:
+            raise ValueError(f"Некорректный файл Logisim: {e}") from e
+
+        ports = {name: builder.subcircuit_ports() for name, builder in builders.items()}
+        return {name: builder.build(ports) for name, builder in builders.items()}
+
+
+class _CircuitBuilder:
+    """Накопление точек, компонентов и объединений точек одной схемы"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.points: Dict[Tuple[int, int], int] = {}
+        self.parent = array('i')
+        self.kinds: List[str] = []
+        self.labels: List[str] = []
+        self.locations = array('i')
+        self.attributes: List[Dict[str, str]] = []
+        # Выводы компонентов: (имя, точка, разрядность, направление)
+        self.pins: List[List[Tuple[str, int, int, int]]] = []
+        # Экземпляры подсхем, выводы которых добавляются в build
+        self.subcircuits: List[int] = []
+
+    def point(self, location: Tuple[int, int]) -> int:
+        index = self.points.get(location)
+        if index is None:
+            index = len(self.parent)
+            self.points[location] = index
+            self.parent.append(index)
+        return index
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # Корень — меньший номер: цепи нумеруются в порядке первого появления точек
+            if first < second:
+                self.parent[second] = first
+            else:
+                self.parent[first] = second
+
+    def add_wire(self, start: Tuple[int, int], end: Tuple[int, int]) -> None:
+        self.union(self.point(start), self.point(end))
+
+    def add_component(self, kind: str, library: Optional[str], location: Tuple[int, int],
+                      attributes: Dict[str, str]) -> None:
+        if library in SKIPPED_LIBRARIES:
+            return
+        component = len(self.kinds)
+        self.kinds.append(kind)
+        self.labels.append(attributes.get("label", ""))
+        self.locations.extend(location)
+        self.attributes.append(attributes)
+        self.pins.append([])
+        if library is None:
+            self.subcircuits.append(component)
+            return
+        builder = _PIN_BUILDERS.get(kind)
+        if builder is not None:
+            self.attach(component, builder(kind, attributes))
+
+    def attach(self, component: int, specs: List[PinSpec]) -> None:
+        x, y = self.locations[2 * component], self.locations[2 * component + 1]
+        self.pins[component] = [(name, self.point((x + dx, y + dy)), width, direction)
+                                for name, dx, dy, width, direction in specs]
+
+    def subcircuit_ports(self) -> List[PinSpec]:
+        """Выводы экземпляра этой схемы при оформлении по умолчанию (Logisim 2.7).
+
+        Входы и выходы (компоненты Pin) раскладываются по сторонам,
+        противоположным их направлению, и упорядочиваются вдоль стороны;
+        точка привязки — первый вывод восточной стороны, если он есть.
+        """
+        edges: Dict[str, List[Tuple[int, int, int]]] = {"north": [], "south": [], "east": [], "west": []}
+        for component, kind in enumerate(self.kinds):
+            if kind == "Pin":
+                x, y = self.locations[2 * component], self.locations[2 * component + 1]
+                edges[_OPPOSITE[self.attributes[component].get("facing", "east")]].append((x, y, component))
+        for edge in ("east", "west"):
+            edges[edge].sort(key=lambda pin: (pin[1], pin[0]))
+        for edge in ("north", "south"):
+            edges[edge].sort()
+
+        counts = {edge: len(members) for edge, members in edges.items()}
+        max_vertical = max(counts["north"], counts["south"])
+        max_horizontal = max(counts["east"], counts["west"])
+        offsets = {edge: _appearance_offset(counts[edge], counts[_OPPOSITE[edge]],
+                                            max_horizontal if edge in ("north", "south") else max_vertical)
+                   for edge in edges}
+        width = _appearance_dimension(max_vertical, max_horizontal)
+        height = _appearance_dimension(max_horizontal, max_vertical)
+        if counts["east"]:
+            anchor = (width, offsets["east"])
+        elif counts["north"]:
+            anchor = (offsets["north"], 0)
+        elif counts["west"]:
+            anchor = (0, offsets["west"])
+        elif counts["south"]:
+            anchor = (offsets["south"], height)
+        else:
+            anchor = (0, 0)
+
+        starts = {"west": (0, offsets["west"], 0, 10), "east": (width, offsets["east"], 0, 10),
+                  "north": (offsets["north"], 0, 10, 0), "south": (offsets["south"], height, 10, 0)}
+        ports = []
+        for edge, (x, y, dx, dy) in starts.items():
+            for position, (_, _, component) in enumerate(edges[edge]):
+                attributes = self.attributes[component]
+                name = attributes.get("label") or f"pin{component}"
+                direction = OUTPUT if attributes.get("output") == "true" else INPUT
+                ports.append((name, x + position * dx - anchor[0], y + position * dy - anchor[1],
+                              _int_attribute(attributes, "width", 1), direction))
+        return ports
+
+    def build(self, ports: Dict[str, List[PinSpec]]) -> Netlist:
+        for component in self.subcircuits:
+            specs = ports.get(self.kinds[component])
+            if specs is not None:
+                facing = self.attributes[component].get("facing", "east")
+                self.attach(component, [(name, *_rotate(dx, dy, facing), width, direction)
+                                        for name, dx, dy, width, direction in specs])
+
+        # Туннели с одинаковой меткой соединены без проводов
+        tunnels: Dict[str, int] = {}
+        for component, kind in enumerate(self.kinds):
+            if kind == "Tunnel" and self.pins[component]:
+                point = self.pins[component][0][1]
+                label = self.labels[component]
+                if label in tunnels:
+                    self.union(tunnels[label], point)
+                else:
+                    tunnels[label] = point
+
+        nets = array('i', bytes(4 * len(self.parent)))
+        net_count = 0
+        for index in range(len(self.parent)):
+            root = self.find(index)
+            if root == index:
+                nets[index] = net_count
+                net_count += 1
+            else:
+                nets[index] = nets[root]
+
+        pin_start = array('i', [0])
+        pin_names: List[str] = []
+        pin_nets, pin_widths, pin_directions = array('i'), array('H'), array('b')
+        for component_pins in self.pins:
+            for name, point, width, direction in component_pins:
+                pin_names.append(name)
+                pin_nets.append(nets[point])
+                pin_widths.append(width)
+                pin_directions.append(direction)
+            pin_start.append(len(pin_names))
+
+        point_nets = {location: nets[index] for location, index in self.points.items()}
+        return Netlist(self.name, self.kinds, self.labels, self.locations, self.attributes, pin_start, pin_names,
+                       pin_nets, pin_widths, pin_directions, net_count, point_nets)
+
+
+def _parse_point(text: Optional[str]) -> Tuple[int, int]:
+    """Координаты вида "(x,y)" """
+    try:
+        x, y = text.strip().strip("()").split(",")
+        return int(x), int(y)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Некорректные координаты: {text}") from None
+
+
+def _int_attribute(attributes: Dict[str, str], name: str, default: int) -> int:
+    value = attributes.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise ValueError(f"Некорректное значение атрибута {name}: {value}") from None
+
+
+def _rotate(dx: int, dy: int, facing: str) -> Tuple[int, int]:
+    """Смещение, заданное для направления east, для компонента, повернутого в facing"""
+    if facing == "north":
+        return dy, -dx
+    if facing == "west":
+        return -dx, -dy
+    if facing == "south":
+        return -dy, dx
+    return dx, dy
+
+
+def _appearance_dimension(count: int, other_count: int) -> int:
+    if count < 3:
+        return 30
+    return 10 * count if other_count == 0 else 10 * count + 10
+
+
+def _appearance_offset(count: int, opposite_count: int, other_count: int) -> int:
+    largest = max(count, opposite_count)
+    if largest <= 1:
+        offset = 15 if other_count == 0 else 10
+    elif largest == 2:
+        offset = 10
+    else:
+        offset = 5 if other_count == 0 else 10
+    return offset + 10 * ((largest - count) // 2)
+
+
+def _gate_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    """Выход в точке компонента, входы — на расстоянии длины вентиля (Logisim 2.7)"""
+    inputs = _int_attribute(attributes, "inputs", 5)
+    size = _int_attribute(attributes, "size", 50)
+    width = _int_attribute(attributes, "width", 1)
+    axis = size + (10 if kind.startswith("X") else 0) + (10 if kind in ("NAND Gate", "NOR Gate", "XNOR Gate") else 0)
+
+    lower_even = 10
+    if inputs <= 3:
+        if size < 40:
+            start, step = -5, 10
+        elif size < 60 or inputs <= 2:
+            start, step, lower_even = -10, 20, 20
+        else:
+            start, step, lower_even = -15, 30 if inputs == 2 else 15, 30
+    elif inputs == 4 and size >= 60:
+        start, step, lower_even = -5, 20, 0
+    else:
+        start, step = -5, 10
+
+    facing = attributes.get("facing", "east")
+    pins = [("out", 0, 0, width, OUTPUT)]
+    for index in range(inputs):
+        if inputs % 2:
+            dy = start * (inputs - 1) + step * index
+        else:
+            dy = start * inputs + step * index + (lower_even if index >= inputs // 2 else 0)
+        dx = -axis - (10 if attributes.get(f"negate{index}") == "true" else 0)
+        pins.append((f"in{index}", *_rotate(dx, dy, facing), width, INPUT))
+    return pins
+
+
+def _inverter_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    size = _int_attribute(attributes, "size", 30) if kind == "NOT Gate" else 20
+    width = _int_attribute(attributes, "width", 1)
+    return [("out", 0, 0, width, OUTPUT),
+            ("in", *_rotate(-size, 0, attributes.get("facing", "east")), width, INPUT)]
+
+
+def _point_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    """Компоненты с единственным выводом в точке компонента"""
+    width = _int_attribute(attributes, "width", 1)
+    if kind == "Pin":
+        # Выход схемы читает цепь, вход схемы задает ее значение
+        return [("pin", 0, 0, width, INPUT if attributes.get("output") == "true" else OUTPUT)]
+    direction = {"Probe": INPUT, "Clock": OUTPUT, "Constant": OUTPUT}.get(kind, INOUT)
+    return [(kind.lower(), 0, 0, width, direction)]
+
+
+def splitter_bit_ends(attributes: Dict[str, str]) -> List[Optional[int]]:
+    """Номер конца разветвителя для каждого бита общей шины (None — бит не выведен)"""
+    fanout = _int_attribute(attributes, "fanout", 2)
+    incoming = _int_attribute(attributes, "incoming", 2)
+    # Распределение по умолчанию: биты поровну, лишние — первым концам
+    ends: List[Optional[int]] = []
+    if fanout >= incoming:
+        ends = list(range(incoming))
+    else:
+        per_end, extra = divmod(incoming, fanout)
+        for end in range(fanout):
+            ends.extend([end] * (per_end + (1 if end < extra else 0)))
+    for bit in range(incoming):
+        value = attributes.get(f"bit{bit}")
+        if value is not None:
+            ends[bit] = None if value == "none" else int(value)
+    return ends
+
+
+def _splitter_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    fanout = _int_attribute(attributes, "fanout", 2)
+    incoming = _int_attribute(attributes, "incoming", 2)
+    facing = attributes.get("facing", "east")
+    appear = attributes.get("appear", "left")
+    justify = 0 if appear in ("center", "legacy") else 1 if appear == "right" else -1
+
+    if facing in ("north", "south"):
+        sign = 1 if facing == "north" else -1
+        dx = 10 * ((fanout + 1) // 2 - 1) if justify == 0 else (-10 if sign * justify < 0 else 10 * fanout)
+        dy, step_x, step_y = -sign * 20, -10, 0
+    else:
+        sign = -1 if facing == "west" else 1
+        dx = sign * 20
+        dy = -10 * (fanout // 2) if justify == 0 else (10 if sign * justify > 0 else -10 * fanout)
+        step_x, step_y = 0, 10
+
+    ends = splitter_bit_ends(attributes)
+    pins = [("combined", 0, 0, incoming, INOUT)]
+    for end in range(fanout):
+        pins.append((f"end{end}", dx + end * step_x, dy + end * step_y, ends.count(end), INOUT))
+    return pins
+
+
+def _multiplexer_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    select = _int_attribute(attributes, "select", 1)
+    width = _int_attribute(attributes, "width", 1)
+    facing = attributes.get("facing", "east")
+    select_sign = 1 if attributes.get("selloc", "bl") == "bl" else -1
+    inputs = 1 << select
+
+    if inputs == 2:
+        offsets = {"west": ((30, -10), (30, 10), (20, select_sign * 20)),
+                   "north": ((-10, 30), (10, 30), (-select_sign * 20, 20)),
+                   "south": ((-10, -30), (10, -30), (-select_sign * 20, -20)),
+                   "east": ((-30, -10), (-30, 10), (-20, select_sign * 20))}[facing]
+        data, select_point = list(offsets[:2]), offsets[2]
+    else:
+        start = -(inputs // 2) * 10
+        if facing == "west":
+            data = [(40, start + 10 * index) for index in range(inputs)]
+            select_point = (20, select_sign * (start + 10 * inputs))
+        elif facing == "north":
+            data = [(start + 10 * index, 40) for index in range(inputs)]
+            select_point = (-select_sign * start, 20)
+        elif facing == "south":
+            data = [(start + 10 * index, -40) for index in range(inputs)]
+            select_point = (-select_sign * start, -20)
+        else:
+            data = [(-40, start + 10 * index) for index in range(inputs)]
+            select_point = (-20, select_sign * (start + 10 * inputs))
+
+    pins = [(f"in{index}", dx, dy, width, INPUT) for index, (dx, dy) in enumerate(data)]
+    pins.append(("select", *select_point, select, INPUT))
+    if attributes.get("enable", "true") == "true":
+        # Вход разрешения сдвинут от входа выбора по направлению компонента
+        step_x, step_y = _rotate(10, 0, facing)
+        pins.append(("enable", select_point[0] + step_x, select_point[1] + step_y, 1, INPUT))
+    pins.append(("out", 0, 0, width, OUTPUT))
+    return pins
+
+
+def _rom_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    return [("address", -140, 0, _int_attribute(attributes, "addrWidth", 8), INPUT),
+            ("data", 0, 0, _int_attribute(attributes, "dataWidth", 8), OUTPUT),
+            ("select", -90, 40, 1, INPUT)]
+
+
+def _flip_flop_pins(kind: str, attributes: Dict[str, str]) -> List[PinSpec]:
+    return [(kind[0].lower(), -40, 20, 1, INPUT), ("clock", -40, 0, 1, INPUT),
+            ("q", 0, 0, 1, OUTPUT), ("nq", 0, 20, 1, OUTPUT),
+            ("reset", -10, 30, 1, INPUT), ("preset", -30, 30, 1, INPUT), ("enable", -20, 30, 1, INPUT)]
+
+
+_PIN_BUILDERS = {
+    **{kind: _gate_pins for kind in GATE_KINDS},
+    "NOT Gate": _inverter_pins,
+    "Buffer": _inverter_pins,
+    "Pin": _point_pins,
+    "Probe": _point_pins,
+    "Clock": _point_pins,
+    "Constant": _point_pins,
+    "Tunnel": _point_pins,
+    "Splitter": _splitter_pins,
+    "Multiplexer": _multiplexer_pins,
+    "ROM": _rom_pins,
+    "D Flip-Flop": _flip_flop_pins,
+    "T Flip-Flop": _flip_flop_pins,
+}
+
+
+def main(argv=None) -> int:
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("Использование: logisim_netlist.py файл.circ ...", file=sys.stderr)
+        return 2
+    parser = LogisimNetlistParser()
+    for path in paths:
+        for name, netlist in parser.parse(path).items():
+            marker = " (главная)" if name == parser.main_circuit else ""
+            print(f"{path}: {name}{marker} — компонентов {netlist.component_count}, "
+                  f"выводов {netlist.pin_count}, цепей {netlist.net_count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
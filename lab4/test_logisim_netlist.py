@@ -0,0 +1,136 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logisim_netlist import INOUT, INPUT, OUTPUT, LogisimNetlistParser, splitter_bit_ends
+
+LAB_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def generated_circuit(chain_length: int) -> bytes:
+    """Схема: вход, цепочка инверторов, туннель к пробнику, мультиплексор и ROM с входами прямо на выводах"""
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="no"?>', '<project source="2.7.1" version="1.0">',
+             '<lib desc="#Wiring" name="0"/>', '<lib desc="#Gates" name="1"/>', '<lib desc="#Plexers" name="2"/>',
+             '<lib desc="#Memory" name="4"/>', '<lib desc="#Base" name="6"/>', '<main name="main"/>',
+             '<circuit name="main">', '<comp lib="0" loc="(40,100)" name="Pin"/>',
+             '<wire from="(40,100)" to="(70,100)"/>']
+    for index in range(chain_length):
+        x = 100 + 50 * index
+        parts.append(f'<comp lib="1" loc="({x},100)" name="NOT Gate"/>')
+        parts.append(f'<wire from="({x},100)" to="({x + 20},100)"/>')
+    end = 100 + 50 * (chain_length - 1) + 20
+    parts += [f'<comp lib="0" loc="({end},100)" name="Tunnel"><a name="label" val="x"/></comp>',
+              '<comp lib="0" loc="(40,300)" name="Tunnel"><a name="label" val="x"/></comp>',
+              '<wire from="(40,300)" to="(80,300)"/>', '<comp lib="0" loc="(80,300)" name="Probe"/>',
+              '<comp lib="6" loc="(500,20)" name="Text"><a name="text" val="comment"/></comp>',
+              '<comp lib="2" loc="(1000,500)" name="Multiplexer"/>',
+              '<comp lib="0" loc="(970,490)" name="Pin"/>', '<comp lib="0" loc="(980,520)" name="Pin"/>',
+              '<comp lib="4" loc="(1000,800)" name="ROM"><a name="contents">addr/data: 8 8\n0\n</a></comp>',
+              '<comp lib="0" loc="(860,800)" name="Pin"><a name="width" val="8"/></comp>',
+              '</circuit>', '</project>']
+    return "\n".join(parts).encode("utf-8")
+
+
+class TestLogisimNetlistParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = LogisimNetlistParser()
+
+    def test_gate_schematic(self):
+        """Тест схемы на вентилях: выводы вентилей и входов попадают в общие цепи"""
+        netlists = self.parser.parse(os.path.join(LAB_DIRECTORY, "task1.circ"))
+        self.assertEqual(self.parser.main_circuit, "main")
+        netlist = netlists["main"]
+        self.assertEqual(len(netlist.find_components("OR Gate")), 10)
+        self.assertEqual(len(netlist.find_components("AND Gate")), 5)
+        self.assertEqual(netlist.find_components("Text"), [])
+
+        inverter = next(c for c in netlist.find_components("NOT Gate") if netlist.location(c) == (220, 40))
+        pin = next(c for c in netlist.find_components("Pin") if netlist.location(c) == (120, 80))
+        self.assertEqual(netlist.pin_net(inverter, "in"), netlist.pin_net(pin, "pin"))
+        self.assertEqual(netlist.net_at(190, 40), netlist.pin_net(inverter, "in"))
+        # Вентиль по умолчанию имеет 5 входов, выход — в точке компонента
+        gate = netlist.find_components("OR Gate")[0]
+        self.assertEqual([name for name, *_ in netlist.pins(gate)], ["out", "in0", "in1", "in2", "in3", "in4"])
+        self.assertEqual(netlist.net_at(*netlist.location(gate)), netlist.pin_net(gate, "out"))
+        for component in range(netlist.component_count):
+            for name, net, _, _ in netlist.pins(component):
+                self.assertIn((component, name), netlist.net_pins(net))
+
+    def test_splitters_and_subcircuits(self):
+        """Тест разветвителей (разрядности концов) и выводов подсхем с оформлением по умолчанию"""
+        netlists = self.parser.parse(os.path.join(LAB_DIRECTORY, "D8421_2.circ"))
+        self.assertEqual(set(netlists), {"main", "main.f"})
+        main = netlists["main"]
+        splitter = next(c for c in main.find_components("Splitter") if main.attributes[c]["facing"] == "south")
+        self.assertEqual(splitter_bit_ends(main.attributes[splitter]), [3, 2, 1, 0])
+        self.assertEqual([(name, width) for name, _, width, _ in main.pins(splitter)],
+                         [("combined", 4), ("end0", 1), ("end1", 1), ("end2", 1), ("end3", 1)])
+        source = next(c for c in main.find_components("Pin") if main.location(c) == (1150, 320))
+        self.assertEqual(main.pin_net(source, "pin"), main.pin_net(splitter, "combined"))
+        self.assertEqual(main.net_widths[main.pin_net(source, "pin")], 4)
+        self.assertEqual(main.pins(source)[0][3], OUTPUT)
+
+        # Экземпляр подсхемы main: вход слева, выход в точке привязки
+        composite = netlists["main.f"]
+        instances = composite.find_components("main")
+        self.assertEqual(len(instances), 8)
+        x, y = composite.location(instances[0])
+        ports = {name: (net, width, direction) for name, net, width, direction in composite.pins(instances[0])}
+        self.assertEqual(sorted((width, direction) for _, width, direction in ports.values()),
+                         [(4, INPUT), (4, OUTPUT)])
+        output = next(net for net, _, direction in ports.values() if direction == OUTPUT)
+        self.assertEqual(composite.net_at(x, y), output)
+        self.assertEqual(composite.net_at(x - 30, y), next(net for net, _, direction in ports.values()
+                                                            if direction == INPUT))
+
+    def test_flip_flops(self):
+        """Тест счетчика на T-триггерах: общий тактовый сигнал, входы T от вентилей И"""
+        netlist = self.parser.parse(os.path.join(LAB_DIRECTORY, "..", "lab5", "lab5.circ"))["main"]
+        flip_flops = netlist.find_components("T Flip-Flop")
+        self.assertEqual(len(flip_flops), 3)
+        clocks = {netlist.pin_net(component, "clock") for component in flip_flops}
+        self.assertEqual(len(clocks), 1)
+        self.assertIn("Clock", {netlist.kinds[component] for component, _ in netlist.net_pins(clocks.pop())})
+        for component in flip_flops:
+            drivers = [netlist.kinds[other] for other, name in netlist.net_pins(netlist.pin_net(component, "t"))
+                       if name == "out"]
+            self.assertEqual(drivers, ["AND Gate"])
+
+    def test_streaming_generated_circuit(self):
+        """Тест большой сгенерированной схемы из потока: цепочка инверторов, туннели, мультиплексор, ROM"""
+        chain_length = 2000
+        netlist = self.parser.parse(io.BytesIO(generated_circuit(chain_length)))["main"]
+        inverters = netlist.find_components("NOT Gate")
+        self.assertEqual(len(inverters), chain_length)
+        self.assertEqual(netlist.pin_net(inverters[0], "in"), netlist.pin_net(0, "pin"))
+        for previous, current in zip(inverters, inverters[1:]):
+            self.assertEqual(netlist.pin_net(previous, "out"), netlist.pin_net(current, "in"))
+
+        probe = netlist.find_components("Probe")[0]
+        self.assertEqual(netlist.pin_net(probe, "probe"), netlist.pin_net(inverters[-1], "out"))
+        self.assertEqual(netlist.find_components("Text"), [])
+
+        multiplexer = netlist.find_components("Multiplexer")[0]
+        self.assertEqual([name for name, *_ in netlist.pins(multiplexer)], ["in0", "in1", "select", "enable", "out"])
+        pins = {netlist.location(c): netlist.pin_net(c, "pin") for c in netlist.find_components("Pin")}
+        self.assertEqual(netlist.pin_net(multiplexer, "in0"), pins[(970, 490)])
+        self.assertEqual(netlist.pin_net(multiplexer, "select"), pins[(980, 520)])
+        rom = netlist.find_components("ROM")[0]
+        self.assertEqual(netlist.pin_net(rom, "address"), pins[(860, 800)])
+        self.assertEqual(netlist.net_widths[pins[(860, 800)]], 8)
+        self.assertEqual(netlist.pins(rom)[1][3], OUTPUT)
+        self.assertEqual(netlist.pins(netlist.find_components("Tunnel")[0])[0][3], INOUT)
+
+    def test_invalid_file(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse(io.BytesIO(b"<project><circuit name='main'><wire from='(1,2)'"))
+        with self.assertRaises(ValueError):
+            self.parser.parse(io.BytesIO(b"<project><circuit name='main'><wire from='(a,2)' to='(3,4)'/>"
+                                         b"</circuit></project>"))
+
+
+if __name__ == '__main__':
+    unittest.main()